@@ -1,9 +1,11 @@
-import ast
+import os
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 
+from src.list_literal import parse_list_literal
+
 st.set_page_config(
     page_title="Recrutement | Forvis Mazars",
     layout="wide",
@@ -222,13 +224,18 @@ def score_color(val: float) -> str:
 
 @st.cache_data
 def load_data(path: str) -> pd.DataFrame:
+    if path.endswith((".parquet", ".feather")):
+        # export colonnaire : score_* déjà en float, vector_score sans literal_eval
+        from src.export import read_scored
+        return read_scored(path)
+
     df = pd.read_csv(path)
 
     # Parse vector_score column into individual sub-score columns if present
     if "vector_score" in df.columns:
         def parse_vec(x):
             try:
-                return ast.literal_eval(str(x))
+                return parse_list_literal(str(x))
             except Exception:
                 return [np.nan] * 5
 
@@ -241,7 +248,8 @@ def load_data(path: str) -> pd.DataFrame:
     return df
 
 
-df = load_data("results/pairs_scored.csv")
+_PARQUET_RESULTS = "results/pairs_scored.parquet"
+df = load_data(_PARQUET_RESULTS if os.path.exists(_PARQUET_RESULTS) else "results/pairs_scored.csv")
 
 # ============================================================
 # HEADER
@@ -364,7 +372,10 @@ job_df = df_scored[df_scored["job_id"] == selected_job].copy()
 if sector_filter != "Tous":
     job_df = job_df[job_df["sector"] == sector_filter]
 
-job_df = job_df[job_df["score_live"] >= min_score].sort_values("score_live", ascending=False).reset_index(drop=True)
+# ex-aequo (scores quantifiés) : ordre stable par candidate_id
+job_df = job_df[job_df["score_live"] >= min_score].sort_values(
+    ["score_live", "candidate_id"], ascending=[False, True], kind="stable"
+).reset_index(drop=True)
 
 # ============================================================
 # KPI ROW
@@ -489,7 +500,9 @@ with tab2:
     all_candidates = sorted(df_scored["candidate_id"].unique().tolist())
     selected_cand  = st.selectbox("Sélectionner un candidat", all_candidates, key="cand_profile")
 
-    cand_df = df_scored[df_scored["candidate_id"] == selected_cand].sort_values("score_live", ascending=False)
+    cand_df = df_scored[df_scored["candidate_id"] == selected_cand].sort_values(
+        ["score_live", "job_id"], ascending=[False, True], kind="stable"
+    )
 
     if len(cand_df) == 0:
         st.warning("Aucune donnée pour ce candidat.")
@@ -0,0 +1,60 @@
+"""Microbenchmark parse_list_literal vs ast.literal_eval sur les cellules liste de data/dev.
+
+Pour chaque colonne liste du CSV : temps de parsing de toutes les cellules
+(sans cache ni dédoublonnage) avec les deux méthodes, et vérification que
+les résultats sont identiques.
+
+    python scripts/benchmark_list_literal.py [--csv data/dev/candidates_dev.csv] [--repeat 3]
+"""
+from __future__ import annotations
+import argparse
+import ast
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Add parent directory to path so src modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.list_literal import parse_list_literal
+
+
+def best_time(fn, cells, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for s in cells:
+            fn(s)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default="data/dev/candidates_dev.csv")
+    parser.add_argument("--columns", nargs="+", default=["candidate_skills", "languages"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    rows = []
+    for col in args.columns:
+        cells = [str(x).strip() for x in df[col].dropna()]
+        assert [parse_list_literal(s) for s in cells] == [ast.literal_eval(s) for s in cells], col
+
+        literal_s = best_time(ast.literal_eval, cells, args.repeat)
+        fast_s = best_time(parse_list_literal, cells, args.repeat)
+        rows.append({
+            "column": col,
+            "cells": len(cells),
+            "literal_eval_s": round(literal_s, 4),
+            "parse_list_literal_s": round(fast_s, 4),
+            "speedup": round(literal_s / fast_s, 1),
+        })
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
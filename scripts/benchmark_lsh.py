@@ -0,0 +1,96 @@
+"""Benchmark MinHash/LSH retrieval vs exact cartesian skills Jaccard on data/dev.
+
+Pour chaque réglage (bands × rows) : temps de construction / requête, part du
+pool examinée et recall@K du top-K par offre (LSH + rescoring exact) par
+rapport au top-K exact du cartésien.
+
+    python scripts/benchmark_lsh.py [--k 10 50] [--out results/benchmark_lsh.csv]
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path so src modules can be imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_layer import load_entities_csv
+from src.lsh import LSHConfig, build_candidate_lsh
+from src.pairing import cartesian_index_pairs
+from src.scoring_engine.components.features import build_features, score_features
+
+SETTINGS = [(16, 8), (32, 4), (64, 2), (42, 3), (128, 1)]
+
+
+def exact_jaccard_matrix(cands: pd.DataFrame, jobs: pd.DataFrame) -> np.ndarray:
+    """(n_candidates, n_jobs) : skills_jaccard exact sur tout le cartésien."""
+    cand_f, job_f = build_features(cands, jobs, normalized=True)
+    ci, ji = cartesian_index_pairs(len(cands), len(jobs))
+    return score_features(cand_f, job_f, ci, ji)["score_skills"].reshape(len(cands), len(jobs))
+
+
+def recall_at_k(exact: np.ndarray, retrieved, k: int) -> float:
+    """Recall@K tie-aware : un candidat retrouvé compte s'il atteint le score du K-ième exact."""
+    recalls = []
+    for j, cands in enumerate(retrieved):
+        col = exact[:, j]
+        relevant = min(k, int((col > 0).sum()))
+        if relevant == 0:
+            continue
+        threshold = np.partition(col, -relevant)[-relevant]
+        top = cands[np.argsort(-col[cands], kind="stable")[:k]]  # rescoring exact du retrouvé
+        hits = int(((col[top] >= threshold) & (col[top] > 0)).sum())
+        recalls.append(min(hits, relevant) / relevant)
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", default="data/dev/candidates_dev.csv")
+    parser.add_argument("--jobs", default="data/dev/jobs_dev.csv")
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    cands, jobs, _, _ = load_entities_csv(args.candidates, args.jobs)
+    t0 = time.perf_counter()
+    exact = exact_jaccard_matrix(cands, jobs)
+    exact_s = time.perf_counter() - t0
+    print(f"exact cartesian: {exact.size} pairs in {exact_s:.2f}s")
+
+    rows = []
+    for bands, r in SETTINGS:
+        config = LSHConfig(bands=bands, rows=r)
+        t0 = time.perf_counter()
+        index = build_candidate_lsh(cands, config)
+        build_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        retrieved = [index.query(skills)[0] for skills in jobs["required_skills"]]
+        query_s = time.perf_counter() - t0
+
+        row = {
+            "bands": bands,
+            "rows": r,
+            "threshold": round(config.threshold, 3),
+            "build_s": round(build_s, 3),
+            "query_s": round(query_s, 3),
+            "examined_ratio": round(sum(len(c) for c in retrieved) / exact.size, 4),
+        }
+        for k in args.k:
+            row[f"recall@{k}"] = round(recall_at_k(exact, retrieved, k), 4)
+        rows.append(row)
+
+    report = pd.DataFrame(rows)
+    print(report.to_string(index=False))
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        report.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
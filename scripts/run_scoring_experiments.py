@@ -10,9 +10,13 @@ import pandas as pd
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.scoring_engine.evaluation import run_experiments, compute_subscores_df
+from src.scoring_engine.components.cache import SubscoreCache
 
+# subscores persistés entre les runs d'expériences (purgés si le code de scoring change)
+CACHE_PATH = os.path.join("results", "cache", "subscores.sqlite")
 
-def generate_synthetic(num_jobs=5, num_candidates=30, seed=42):
+
+def generate_synthetic(num_jobs=5, num_candidates=30, seed=42, cache=None):
     rng = np.random.RandomState(seed)
     jobs = []
     for j in range(num_jobs):
@@ -41,7 +45,7 @@ def generate_synthetic(num_jobs=5, num_candidates=30, seed=42):
     df_cands["_key"] = 1
     df_jobs["_key"] = 1
     pairs = df_cands.merge(df_jobs, on="_key", how="inner").drop(columns=["_key"])
-    pairs = compute_subscores_df(pairs)
+    pairs = compute_subscores_df(pairs, cache=cache)
     # label: weighted sum + noise
     pairs["label"] = (
         0.4 * pairs["score_skills"] +
@@ -55,8 +59,9 @@ def generate_synthetic(num_jobs=5, num_candidates=30, seed=42):
 
 def main():
     os.makedirs("results", exist_ok=True)
-    pairs = generate_synthetic()
-    run_experiments(pairs, output_dir="results")
+    with SubscoreCache(CACHE_PATH) as cache:
+        pairs = generate_synthetic(cache=cache)
+        run_experiments(pairs, output_dir="results", cache=cache)
     print("Experiments finished. Results in results/")
 
 
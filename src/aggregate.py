@@ -1,7 +1,7 @@
 # src/aggregate.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Union
 import numpy as np
 import pandas as pd
 
@@ -16,6 +16,7 @@ class WeightConfig:
     education: float = 0.15
     languages: float = 0.15
     sector: float = 0.15
+    name: str = "default"  # suffixe de colonne en scoring multi-profils (global_score_<name>)
 
     def as_dict(self) -> Dict[str, float]:
         return {
@@ -27,44 +28,232 @@ class WeightConfig:
         }
 
 
+# ============================================================
+# Stockage des scores (score_dtype)
+#
+# float64 (défaut) | float32 | uint8 (pas de 1/255) | uint16 (pas de 1/1000).
+# Les modes quantifiés stockent des entiers. L'échelle se déduit du dtype de
+# la colonne (uint8 -> 255, uint16 -> 1000) : les colonnes restent lisibles
+# après concat, pickle ou Parquet sans métadonnée. Les calculs (score
+# global, profils) se font toujours en float64 sur les valeurs décodées.
+# ============================================================
+
+SCORE_DTYPES = {"float64": np.float64, "float32": np.float32, "uint8": np.uint8, "uint16": np.uint16}
+QUANTIZATION_SCALES = {np.dtype(np.uint8): 255, np.dtype(np.uint16): 1000}
+# décimales suffisantes pour distinguer tous les pas à l'export texte
+_TEXT_DECIMALS = {255: 4, 1000: 3}
+
+
+def resolve_score_dtype(score_dtype: str) -> np.dtype:
+    if score_dtype not in SCORE_DTYPES:
+        raise ValueError(f"Unknown score_dtype: {score_dtype!r}. Use one of {list(SCORE_DTYPES)}")
+    return np.dtype(SCORE_DTYPES[score_dtype])
+
+
+def encode_scores(values, score_dtype: str = "float64") -> np.ndarray:
+    """Scores [0,1] float64 -> tableau au dtype de stockage (arrondi au pas le plus proche si quantifié)."""
+    dtype = resolve_score_dtype(score_dtype)
+    values = np.asarray(values, dtype=np.float64)
+    scale = QUANTIZATION_SCALES.get(dtype)
+    if scale is None:
+        return values.astype(dtype, copy=False)
+    return np.rint(np.clip(values, 0.0, 1.0) * scale).astype(dtype)
+
+
+def decode_scores(values) -> np.ndarray:
+    """Tableau de scores stockés (float ou quantifiés) -> float64."""
+    arr = np.asarray(values)
+    scale = QUANTIZATION_SCALES.get(arr.dtype)
+    if scale is None:
+        return arr.astype(np.float64, copy=False)
+    return arr / scale
+
+
+def score_columns(df: pd.DataFrame) -> List[str]:
+    """Colonnes de scores scalaires présentes : score_*, global_score, global_score_<profil>."""
+    return [c for c in df.columns if c in SUBSCORE_COLS or c == "global_score" or c.startswith("global_score_")]
+
+
+def dequantize_scores(df: pd.DataFrame, text: bool = False) -> pd.DataFrame:
+    """
+    Colonnes quantifiées (uint8 / uint16) -> float64. text=True : valeurs
+    arrondies au nombre de décimales utile (exports CSV / JSON plus courts).
+    """
+    def decode(values: np.ndarray) -> np.ndarray:
+        scale = QUANTIZATION_SCALES.get(values.dtype)
+        out = values / scale
+        return np.round(out, _TEXT_DECIMALS[scale]) if text else out
+
+    updates = {c: decode(df[c].to_numpy()) for c in score_columns(df) if df[c].dtype in QUANTIZATION_SCALES}
+    if "vector_score" in df.columns:
+        mat = vector_matrix(df["vector_score"], decode=False)
+        if mat.dtype in QUANTIZATION_SCALES:
+            updates["vector_score"] = vector_column(decode(mat), df.index)
+    return df.assign(**updates) if updates else df
+
+
 def make_vector_score(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ajoute vector_score, adossé à une matrice (n_paires, 5) contiguë : colonne
+    object de vues numpy (lecture seule) sur les lignes de la matrice, avec ou
+    sans pyarrow. Aucune liste Python par paire ; les
+    listes ne sont créées qu'à l'export texte (CSV / JSON) ou via
+    df.scores.vectors(). La matrice garde le dtype de stockage des score_*.
+    """
     missing = [c for c in SUBSCORE_COLS if c not in df.columns]
     if missing:
         raise KeyError(f"Missing subscores columns: {missing}")
 
     out = df.copy()
-    out["vector_score"] = out[SUBSCORE_COLS].apply(lambda r: r.to_list(), axis=1)
+    mat = np.ascontiguousarray(out[SUBSCORE_COLS].to_numpy())
+    if mat.dtype == object:
+        mat = mat.astype(np.float64)
+    out["vector_score"] = vector_column(mat, out.index)
     return out
 
 
-def weighted_global_score(df: pd.DataFrame, weights: WeightConfig) -> pd.DataFrame:
+def vector_column(mat: np.ndarray, index=None) -> pd.Series:
+    """Matrice (n, d) -> colonne vector_score (vues numpy) sans matérialiser de listes."""
+    mat.setflags(write=False)
+    views = np.empty(len(mat), dtype=object)
+    views[:] = list(mat)
+    return pd.Series(views, index=index, dtype=object)
+
+
+def vector_matrix(values: pd.Series, decode: bool = True) -> np.ndarray:
+    """
+    Colonne vector_score (vues numpy, listes ou colonne Arrow d'un DataFrame
+    relu par l'appelant) -> matrice (n, d).
+    decode=True : float64 (scores quantifiés décodés) ; False : dtype stocké.
+    """
+    if isinstance(values.dtype, pd.ArrowDtype):
+        import pyarrow as pa
+
+        arr = pa.array(values.array)
+        if isinstance(arr, pa.ChunkedArray):
+            arr = arr.combine_chunks()
+        mat = arr.flatten().to_numpy(zero_copy_only=False).reshape(len(values), -1)
+    elif len(values) == 0:
+        mat = np.zeros((0, len(SUBSCORE_COLS)), dtype=np.float64)
+    else:
+        mat = np.asarray(values.tolist()).reshape(len(values), -1)
+        if mat.dtype == object or not np.issubdtype(mat.dtype, np.number):
+            mat = mat.astype(np.float64)
+    return decode_scores(mat) if decode else mat
+
+
+@pd.api.extensions.register_dataframe_accessor("scores")
+class ScoresAccessor:
+    """
+    df.scores.matrix    -> (n, 5) float64 (ordre SUBSCORE_COLS, scores quantifiés décodés)
+    df.scores.vectors() -> listes Python, seulement si on les demande
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if all(c in self._df.columns for c in SUBSCORE_COLS):
+            return np.column_stack([decode_scores(self._df[c].to_numpy()) for c in SUBSCORE_COLS])
+        if "vector_score" in self._df.columns:
+            return vector_matrix(self._df["vector_score"])
+        raise KeyError(f"Missing subscores columns: {SUBSCORE_COLS}")
+
+    def vectors(self) -> List[List[float]]:
+        return self.matrix.tolist()
+
+
+def global_score_array(scores, weights: WeightConfig) -> np.ndarray:
+    """
+    Score global pondéré à partir de colonnes score_* (DataFrame ou dict de
+    tableaux). Même arithmétique que weighted_global_score, pour que le mode
+    top-K par blocs donne exactement les mêmes valeurs que le calcul complet.
+    """
     w = weights.as_dict()
     wsum = float(sum(w.values()))
     if wsum <= 0:
         raise ValueError("Sum of weights must be > 0")
 
-    out = df.copy()
     # Normalisation optionnelle: si l’utilisateur met des poids qui ne somment pas à 1
     for k in w:
         w[k] = w[k] / wsum
 
+    def col(name: str) -> np.ndarray:
+        return decode_scores(scores[name])
+
     # Score = somme pondérée
-    out["global_score"] = (
-        out["score_skills"] * w["score_skills"]
-        + out["score_experience"] * w["score_experience"]
-        + out["score_education"] * w["score_education"]
-        + out["score_languages"] * w["score_languages"]
-        + out["score_sector"] * w["score_sector"]
+    total = (
+        col("score_skills") * w["score_skills"]
+        + col("score_experience") * w["score_experience"]
+        + col("score_education") * w["score_education"]
+        + col("score_languages") * w["score_languages"]
+        + col("score_sector") * w["score_sector"]
     )
 
     # clamp robuste [0,1]
-    out["global_score"] = out["global_score"].clip(0.0, 1.0)
-    return out
+    return np.clip(total, 0.0, 1.0)
+
+
+def profile_weight_matrix(profiles: Union[Sequence[WeightConfig], Mapping[str, WeightConfig]]
+                          ) -> Tuple[List[str], np.ndarray]:
+    """Noms des profils + matrice (5, P) des poids normalisés (ordre SUBSCORE_COLS)."""
+    items = list(profiles.items()) if isinstance(profiles, Mapping) else [(w.name, w) for w in profiles]
+    names = [str(name) for name, _ in items]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate weight profile names: {names}")
+
+    W = np.array([[w.as_dict()[c] for c in SUBSCORE_COLS] for _, w in items], dtype=np.float64).T
+    W = W.reshape(len(SUBSCORE_COLS), len(items))
+    wsum = W.sum(axis=0)
+    if (wsum <= 0).any():
+        bad = [n for n, s in zip(names, wsum) if s <= 0]
+        raise ValueError(f"Sum of weights must be > 0 (profiles: {bad})")
+    return names, W / wsum
+
+
+def global_score_matrix(scores, profiles) -> Tuple[List[str], np.ndarray]:
+    """
+    Scores globaux de P profils en un seul produit (n, 5) · (5, P).
+    Égal à global_score_array profil par profil, à l'arrondi flottant près.
+    """
+    names, W = profile_weight_matrix(profiles)
+    if isinstance(scores, pd.DataFrame):
+        S = scores.scores.matrix
+    else:
+        S = np.column_stack([decode_scores(scores[c]) for c in SUBSCORE_COLS])
+    # calcul en (P, n) : chaque profil est une ligne contiguë, réutilisée telle
+    # quelle comme bloc de colonnes par pandas (pas de transposition copiée)
+    totals = W.T @ S.T
+    np.clip(totals, 0.0, 1.0, out=totals)
+    return names, totals.T
+
+
+def weighted_global_score(df: pd.DataFrame,
+                          weights: Union[WeightConfig, Sequence[WeightConfig], Mapping[str, WeightConfig]],
+                          score_dtype: str = "float64") -> pd.DataFrame:
+    """
+    weights = WeightConfig        -> colonne global_score
+    weights = liste / dict de profils -> une colonne global_score_<profil> par profil
+    score_dtype : dtype de stockage des colonnes produites (voir SCORE_DTYPES)
+    """
+    if isinstance(weights, WeightConfig):
+        out = df.copy()
+        out["global_score"] = encode_scores(global_score_array(out, weights), score_dtype)
+        return out
+
+    names, totals = global_score_matrix(df, weights)
+    if score_dtype != "float64":
+        totals = encode_scores(totals, score_dtype)
+    profile_cols = pd.DataFrame(totals, columns=[f"global_score_{n}" for n in names], index=df.index, copy=False)
+    # une seule copie du frame, quel que soit le nombre de profils
+    return pd.concat([df.drop(columns=profile_cols.columns, errors="ignore"), profile_cols], axis=1)
 
 
 def select_output_columns(df: pd.DataFrame, keep_cols: List[str] | None = None) -> pd.DataFrame:
     keep_cols = keep_cols or []
     base = [c for c in keep_cols if c in df.columns]
-    cols = base + SUBSCORE_COLS + ["global_score", "vector_score"]
+    profiles = [c for c in df.columns if c.startswith("global_score_")]
+    cols = base + SUBSCORE_COLS + ["global_score"] + profiles + ["vector_score"]
     cols = [c for c in cols if c in df.columns]
     return df[cols].copy()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .languages import masks_to_words
+
+
+# ============================================================
+# Contraintes dures par offre (appliquées avant le scoring)
+#
+# Exigences non négociables d'une offre : niveau d'études minimum, langues
+# obligatoires, écart maximal à min_experience. Définies pour toutes les
+# offres dans la config (pipeline.hard_constraints) et surchargeables offre
+# par offre par des colonnes hard_* de la table des offres (vide = config).
+#
+# Évaluées sur des positions (cand_idx, job_idx) : les paires éliminées ne
+# sont jamais matérialisées ni scorées, au lieu de seulement baisser un subscore.
+# ============================================================
+
+HARD_CONSTRAINT_COLUMNS = {
+    "min_education": "hard_min_education",
+    "mandatory_languages": "hard_mandatory_languages",
+    "max_experience_gap": "hard_max_experience_gap",
+}
+
+_TRUE = {"true", "1", "yes", "oui", "y"}
+_FALSE = {"false", "0", "no", "non", "n", ""}
+
+
+@dataclass(frozen=True)
+class HardConstraints:
+    """Valeurs par défaut pour toutes les offres (désactivées par défaut)."""
+    min_education: bool = False  # drapeau : education candidat >= required_education de l'offre (si reconnue)
+    mandatory_languages: bool = False  # le candidat parle toutes les required_languages
+    max_experience_gap: Optional[float] = None  # years_experience >= min_experience - gap
+
+    @staticmethod
+    def from_dict(raw: Dict[str, Any]) -> "HardConstraints":
+        gap = raw.get("max_experience_gap")
+        return HardConstraints(
+            min_education=_to_bool(raw.get("min_education"), False),
+            mandatory_languages=_to_bool(raw.get("mandatory_languages"), False),
+            max_experience_gap=float(gap) if gap is not None else None,
+        )
+
+
+def _to_bool(x, default: bool) -> bool:
+    if x is None or (isinstance(x, float) and np.isnan(x)):
+        return default
+    if isinstance(x, (bool, np.bool_)):
+        return bool(x)
+    s = str(x).strip().lower()
+    if s in _TRUE:
+        return True
+    if s in _FALSE:
+        return default if s == "" else False
+    raise ValueError(f"Invalid boolean for hard constraint: {x!r}")
+
+
+def _job_flags(df_jobs: pd.DataFrame, name: str, default: bool) -> np.ndarray:
+    col = HARD_CONSTRAINT_COLUMNS[name]
+    if col not in df_jobs.columns:
+        return np.full(len(df_jobs), default, dtype=bool)
+    codes, uniques = pd.factorize(df_jobs[col], use_na_sentinel=False)
+    table = np.array([_to_bool(u, default) for u in uniques], dtype=bool)
+    return table[codes]
+
+
+def _job_gaps(df_jobs: pd.DataFrame, default: Optional[float]) -> np.ndarray:
+    fallback = np.nan if default is None else float(default)
+    col = HARD_CONSTRAINT_COLUMNS["max_experience_gap"]
+    if col not in df_jobs.columns:
+        return np.full(len(df_jobs), fallback, dtype=np.float64)
+    gaps = pd.to_numeric(df_jobs[col], errors="coerce").to_numpy(dtype=np.float64)
+    return np.where(np.isnan(gaps), fallback, gaps)
+
+
+def _column_array(df: pd.DataFrame, name: str, dtype) -> np.ndarray:
+    if name in df.columns:
+        return df[name].to_numpy(dtype=dtype)
+    return np.zeros(len(df), dtype=dtype)
+
+
+def _pad(words: np.ndarray, n_words: int) -> np.ndarray:
+    out = np.zeros((words.shape[0], n_words), dtype=np.uint64)
+    out[:, :words.shape[1]] = words
+    return out
+
+
+@dataclass
+class ConstraintFilter:
+    """
+    Filtre vectorisé des paires (cand_idx, job_idx). Une contrainte inactive
+    pour une offre y prend une valeur neutre (niveau minimum, masque vide, -inf).
+    pruned : paires éliminées par contrainte, cumulées sur tous les appels
+    (chaque paire est comptée pour la première contrainte qu'elle viole).
+    """
+    cand_education: Optional[np.ndarray] = None
+    job_min_education: Optional[np.ndarray] = None
+    cand_languages: Optional[np.ndarray] = None
+    job_languages: Optional[np.ndarray] = None
+    cand_experience: Optional[np.ndarray] = None
+    job_min_experience: Optional[np.ndarray] = None
+    pruned: Dict[str, int] = field(default_factory=lambda: {k: 0 for k in HARD_CONSTRAINT_COLUMNS})
+
+    def __call__(self, cand_idx: np.ndarray, job_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        for name, keep_fn in [
+            ("min_education", self._keep_education),
+            ("mandatory_languages", self._keep_languages),
+            ("max_experience_gap", self._keep_experience),
+        ]:
+            if not len(cand_idx):
+                break
+            keep = keep_fn(cand_idx, job_idx)
+            if keep is None:
+                continue
+            self.pruned[name] += int(len(keep) - np.count_nonzero(keep))
+            cand_idx, job_idx = cand_idx[keep], job_idx[keep]
+        return cand_idx, job_idx
+
+    def _keep_education(self, ci, ji):
+        if self.job_min_education is None:
+            return None
+        return self.cand_education[ci] >= self.job_min_education[ji]
+
+    def _keep_languages(self, ci, ji):
+        if self.job_languages is None:
+            return None
+        required = self.job_languages[ji]
+        return ((self.cand_languages[ci] & required) == required).all(axis=1)
+
+    def _keep_experience(self, ci, ji):
+        if self.job_min_experience is None:
+            return None
+        return self.cand_experience[ci] >= self.job_min_experience[ji]
+
+
+def build_constraint_filter(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame,
+                            constraints: HardConstraints | None = None) -> Optional[ConstraintFilter]:
+    """
+    Filtre des contraintes dures pour des tables prétraitées (preprocess_*).
+    None si aucune contrainte n'est active pour aucune offre.
+    """
+    constraints = constraints or HardConstraints()
+    f = ConstraintFilter()
+
+    edu_on = _job_flags(df_jobs, "min_education", constraints.min_education)
+    if edu_on.any():
+        f.cand_education = _column_array(df_candidates, "education_level_code", np.int64)
+        required = _column_array(df_jobs, "required_education_code", np.int64)
+        # code 0 côté offre (vide / non reconnu, ex. "master") : pas d'exigence, rien n'est éliminé
+        f.job_min_education = np.where(edu_on & (required > 0), required, np.iinfo(np.int64).min)
+
+    lang_on = _job_flags(df_jobs, "mandatory_languages", constraints.mandatory_languages)
+    if lang_on.any():
+        cand = masks_to_words(df_candidates["languages_mask"].to_numpy())
+        job = masks_to_words(df_jobs["required_languages_mask"].to_numpy())
+        n_words = max(cand.shape[1], job.shape[1])
+        f.cand_languages = _pad(cand, n_words)
+        f.job_languages = np.where(lang_on[:, None], _pad(job, n_words), np.uint64(0))
+
+    gaps = _job_gaps(df_jobs, constraints.max_experience_gap)
+    exp_on = ~np.isnan(gaps)
+    if exp_on.any():
+        f.cand_experience = _column_array(df_candidates, "years_experience", np.float64)
+        min_exp = _column_array(df_jobs, "min_experience", np.float64)
+        f.job_min_experience = np.where(exp_on, min_exp - np.where(exp_on, gaps, 0.0), -np.inf)
+
+    if f.job_min_education is None and f.job_languages is None and f.job_min_experience is None:
+        return None
+    return f
@@ -1,33 +1,155 @@
 from __future__ import annotations
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator
 import pandas as pd
 
-from .schema import validate_and_coerce, CANDIDATE_SCHEMA, JOB_SCHEMA
+from .schema import (
+    CANDIDATE_SCHEMA,
+    JOB_SCHEMA,
+    SchemaSpec,
+    UniqueIdTracker,
+    csv_dtypes,
+    validate_and_coerce,
+    validate_chunk,
+    validate_required_columns,
+)
+from .languages import LanguageRegistry
 from .preprocessing import preprocess_candidates, preprocess_jobs
-from .pairing import build_pairs_cartesian, build_pairs_filtered_same_sector
+from .sector import SectorRegistry
+from .pairing import index_pairs, pairing_stats, take_pairs
+from .constraints import HardConstraints, build_constraint_filter
+from .instrumentation import StageTimer
 from .data_quality import quality_report_candidates, quality_report_jobs
 
-def prepare_data_layer(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, pairing_mode: str = "cartesian"):
+def prepare_entities(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, timer: StageTimer | None = None):
+    """Validation + prétraitement + rapports qualité, sans pairing.
+
+    Les deux tables restent séparées (index remis à 0..n-1) : c'est l'entrée du
+    mode factorisé, qui travaille sur des positions (cand_idx, job_idx).
+    timer : StageTimer optionnel (étapes validation / preprocessing / quality_report).
+    """
+    timer = timer or StageTimer(enabled=False)
+    n_rows = len(df_candidates) + len(df_jobs)
+
     # 1) validate
-    df_candidates = validate_and_coerce(df_candidates, CANDIDATE_SCHEMA, "candidates")
-    df_jobs = validate_and_coerce(df_jobs, JOB_SCHEMA, "jobs")
+    with timer.stage("validation", rows_in=n_rows) as st:
+        df_candidates = validate_and_coerce(df_candidates, CANDIDATE_SCHEMA, "candidates")
+        df_jobs = validate_and_coerce(df_jobs, JOB_SCHEMA, "jobs")
+        st.rows_out = n_rows
 
-    # 2) preprocess
-    df_candidates = preprocess_candidates(df_candidates)
-    df_jobs = preprocess_jobs(df_jobs)
+    # 2) preprocess (registres langues / secteurs propres au run, communs candidats / offres)
+    with timer.stage("preprocessing", rows_in=n_rows) as st:
+        languages, sectors = LanguageRegistry(), SectorRegistry()
+        df_candidates = preprocess_candidates(df_candidates, languages, sectors).reset_index(drop=True)
+        df_jobs = preprocess_jobs(df_jobs, languages, sectors).reset_index(drop=True)
+        st.rows_out = n_rows
 
     # 3) quality report
-    qc = quality_report_candidates(df_candidates)
-    qj = quality_report_jobs(df_jobs)
+    with timer.stage("quality_report", rows_in=n_rows):
+        qc = quality_report_candidates(df_candidates)
+        qj = quality_report_jobs(df_jobs)
 
-    # 4) pairing
-    if pairing_mode == "same_sector":
-        pairs = build_pairs_filtered_same_sector(df_candidates, df_jobs)
-    else:
-        pairs = build_pairs_cartesian(df_candidates, df_jobs)
+    return df_candidates, df_jobs, qc, qj
+
+
+# ============================================================
+# Ingestion CSV par chunks
+#
+# Lecture de chunksize lignes à la fois (usecols / dtypes issus du schéma),
+# validation en place, unicité des ids vérifiée sur tous les chunks, puis
+# prétraitement immédiat : le texte brut d'un export complet n'est jamais
+# entièrement en mémoire, seules les tables prétraitées le sont.
+# ============================================================
+
+CSV_CHUNK_ROWS = 50_000
+
+
+def iter_entity_chunks(path: str | Path, spec: SchemaSpec, df_name: str,
+                       preprocess: Callable[[pd.DataFrame], pd.DataFrame],
+                       chunksize: int = CSV_CHUNK_ROWS, **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    """Chunks validés puis prétraités d'un CSV candidats / offres."""
+    header = pd.read_csv(path, nrows=0, **read_csv_kwargs)
+    validate_required_columns(header, spec, df_name)
+
+    ids = UniqueIdTracker(spec, df_name)
+    usecols = spec.required_cols + [c for c in spec.optional_cols if c in header.columns]
+    reader = pd.read_csv(path, usecols=usecols, dtype=csv_dtypes(spec), chunksize=chunksize, **read_csv_kwargs)
+    with reader:
+        for chunk in reader:
+            yield preprocess(validate_chunk(chunk, spec, df_name, ids))
+
+
+def _concat_chunks(chunks: list, empty: pd.DataFrame) -> pd.DataFrame:
+    if not chunks:
+        return empty
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_entities_csv(candidates_path: str | Path, jobs_path: str | Path, chunksize: int = CSV_CHUNK_ROWS,
+                      **read_csv_kwargs):
+    """
+    Équivalent de prepare_entities(pd.read_csv(...), pd.read_csv(...)) en
+    lecture par chunks. Seules les colonnes du schéma sont chargées.
+    """
+    tables = []
+    # un registre de chaque type pour tous les chunks des deux tables
+    registries = {"language_registry": LanguageRegistry(), "sector_registry": SectorRegistry()}
+    for path, spec, name, preprocess in [
+        (candidates_path, CANDIDATE_SCHEMA, "candidates", partial(preprocess_candidates, **registries)),
+        (jobs_path, JOB_SCHEMA, "jobs", partial(preprocess_jobs, **registries)),
+    ]:
+        chunks = list(iter_entity_chunks(path, spec, name, preprocess, chunksize, **read_csv_kwargs))
+        empty = preprocess(pd.DataFrame({c: pd.Series(dtype=object) for c in spec.required_cols}))
+        tables.append(_concat_chunks(chunks, empty))
+
+    df_candidates, df_jobs = tables
+    return df_candidates, df_jobs, quality_report_candidates(df_candidates), quality_report_jobs(df_jobs)
+
+
+PAIRS_BLOCK_SIZE = 1_000_000  # positions générées / filtrées par bloc avant take_pairs
+
+
+def prepare_data_layer(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, pairing_mode: str = "cartesian",
+                       min_shared_skills: int = 1, lsh_config=None, hard_constraints: HardConstraints | None = None,
+                       blocking_keys: Dict[str, str] | None = None, timer: StageTimer | None = None):
+    timer = timer or StageTimer(enabled=False)
 
+    # 1-3) validate + preprocess + quality report
+    df_candidates, df_jobs, qc, qj = prepare_entities(df_candidates, df_jobs, timer)
+
+    # 4) pairing
+    pairs = build_pairs_table(df_candidates, df_jobs, pairing_mode, min_shared_skills=min_shared_skills,
+                              lsh_config=lsh_config, hard_constraints=hard_constraints,
+                              blocking_keys=blocking_keys, timer=timer)
     return pairs, qc, qj
 
 
+def build_pairs_table(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, pairing_mode: str = "cartesian",
+                      min_shared_skills: int = 1, lsh_config=None, hard_constraints: HardConstraints | None = None,
+                      blocking_keys: Dict[str, str] | None = None, timer: StageTimer | None = None) -> pd.DataFrame:
+    """
+    Table des paires de tables prétraitées (sortie de prepare_entities) :
+    positions (cand_idx, job_idx) de la stratégie du registre, filtrées par
+    les contraintes dures, puis construction des seules lignes retenues.
+    Stats de pairing dans pairs.attrs["pairing"].
+    """
+    timer = timer or StageTimer(enabled=False)
+    with timer.stage("pairing", rows_in=len(df_candidates) * len(df_jobs)) as st:
+        constraint_filter = build_constraint_filter(df_candidates, df_jobs, hard_constraints)
+        ci, ji = index_pairs(df_candidates, df_jobs, pairing_mode, block_size=PAIRS_BLOCK_SIZE,
+                             min_shared_skills=min_shared_skills, lsh_config=lsh_config,
+                             constraint_filter=constraint_filter, blocking_keys=blocking_keys)
+        pairs = take_pairs(df_candidates, df_jobs, ci, ji)
+        st.rows_out = len(pairs)
+
+    # paires émises / élaguées par rapport au cartésien
+    pairs.attrs["pairing"] = {"mode": pairing_mode, **pairing_stats(len(df_candidates), len(df_jobs), len(pairs))}
+    if constraint_filter is not None:
+        pairs.attrs["pairing"]["hard_constraints"] = dict(constraint_filter.pruned)
+    return pairs
+
+
 def prepare_scoring_layer(pairs_df: pd.DataFrame) -> pd.DataFrame:
     """Compute and attach subscores to pairs_df and return a dataframe ready for ranking.
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
+import math
 import re
 from typing import Union
+import numpy as np
 import pandas as pd
 
 
@@ -36,3 +38,42 @@ def normalize_education(education: Union[str, float, None]) -> int:
 
 def validate_education(level: int) -> bool:
     return isinstance(level, int) and level in (3, 4, 5)
+
+
+# ============================================================
+# Codes entiers du niveau d'études (scoring)
+#
+# education_code reprend la conversion historique du scoring ("bac+N" -> N,
+# nombre -> entier, sinon 0), calculée une fois par valeur distincte au
+# prétraitement au lieu d'être reparsée à chaque paire.
+# ============================================================
+
+def education_code(x) -> int:
+    """
+    Convertit "bac+5" -> 5 ; "Bac+3" -> 3 ; None -> 0
+    """
+    if x is None:
+        return 0
+    if isinstance(x, float) and math.isnan(x):
+        return 0
+
+    s = str(x).lower().replace(" ", "")
+    if "bac+" in s:
+        try:
+            return int(s.split("bac+")[1])
+        except Exception:
+            return 0
+
+    try:
+        return int(float(s))
+    except Exception:
+        return 0
+
+
+def encode_education_column(values: pd.Series) -> pd.Series:
+    """Niveaux d'études -> codes int16 (education_code, borné à la plage int16)."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    info = np.iinfo(np.int16)
+    table = np.array([min(max(education_code(u), info.min), info.max) for u in uniques], dtype=np.int16)
+    out = table[codes] if len(table) else np.zeros(len(values), dtype=np.int16)
+    return pd.Series(out, index=values.index)
@@ -1,23 +1,284 @@
 # src/export.py
 from __future__ import annotations
+import abc
 import json
 from pathlib import Path
+from typing import List, Optional
+import numpy as np
 import pandas as pd
 
+from src.aggregate import dequantize_scores, vector_matrix
+
+
+def with_vector_lists(df: pd.DataFrame) -> pd.DataFrame:
+    """vector_score en listes Python (formats texte), à partir de la matrice."""
+    if "vector_score" not in df.columns:
+        return df
+    lists = pd.Series(vector_matrix(df["vector_score"]).tolist(), index=df.index, dtype=object)
+    return df.assign(vector_score=lists)
+
+
+def _text_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # formats texte : scores quantifiés réécrits en décimales courtes, vector_score en listes
+    return with_vector_lists(dequantize_scores(df, text=True))
+
 
 def export_csv(df: pd.DataFrame, path: str | Path) -> Path:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
+    _text_frame(df).to_csv(path, index=False)
     return path
 
 
-def export_json(df: pd.DataFrame, path: str | Path) -> Path:
+def export_json(df: pd.DataFrame, path: str | Path, indent: int | None = 2) -> Path:
+    """
+    JSON record-oriented (liste de dicts). indent=None -> tableau compact sur
+    une ligne. Écrit par tranches de JSON_CHUNK_ROWS lignes : la liste complète
+    des dicts n'est jamais construite.
+    """
+    with JsonChunkWriter(path, indent=indent) as writer:
+        writer.write(df)
+    return Path(path)
+
+
+def export_ndjson(df: pd.DataFrame, path: str | Path) -> Path:
+    """JSON Lines : un record compact par ligne, écrit par tranches."""
+    with NdjsonChunkWriter(path) as writer:
+        writer.write(df)
+    return Path(path)
+
+
+# ============================================================
+# Formats colonnaires (Parquet / Arrow IPC "Feather")
+#
+# Les score_* gardent leur dtype de stockage (float64 par défaut, voir
+# score_dtype) et vector_score est stocké en fixed_size_list[5] : relecture
+# sans parsing, avec projection de colonnes (read_scored(path, columns=[...])).
+# pyarrow est optionnel : importé seulement si ces formats sont demandés.
+# ============================================================
+
+COLUMNAR_FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Parquet/Feather export requires pyarrow (pip install pyarrow)") from e
+    return pa
+
+
+def to_arrow_table(df: pd.DataFrame):
+    """DataFrame scoré -> pyarrow.Table (vector_score en liste de taille fixe)."""
+    pa = _require_pyarrow()
+    if "vector_score" not in df.columns:
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    table = pa.Table.from_pandas(df.drop(columns=["vector_score"]), preserve_index=False)
+    # dtype de stockage conservé (float64 / float32 / uint8 / uint16)
+    mat = vector_matrix(df["vector_score"], decode=False)
+    width = mat.shape[1] if mat.shape[1] else 5
+    vectors = pa.FixedSizeListArray.from_arrays(pa.array(np.ascontiguousarray(mat).ravel()), width)
+    return table.add_column(list(df.columns).index("vector_score"), "vector_score", vectors)
+
+
+def export_parquet(df: pd.DataFrame, path: str | Path, compression: Optional[str] = "zstd",
+                   row_group_size: Optional[int] = None) -> Path:
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(to_arrow_table(df), path, compression=compression or "none", row_group_size=row_group_size)
+    return path
+
 
-    # record-oriented JSON (liste de dicts)
-    records = df.to_dict(orient="records")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
+def export_feather(df: pd.DataFrame, path: str | Path, compression: Optional[str] = "zstd") -> Path:
+    _require_pyarrow()
+    import pyarrow.feather as feather
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    feather.write_feather(to_arrow_table(df), path, compression=compression or "uncompressed")
     return path
+
+
+def read_scored(path: str | Path, columns: Optional[List[str]] = None, dequantize: bool = True) -> pd.DataFrame:
+    """
+    Relit un export de pipeline. Parquet/Feather : lecture des seules colonnes
+    demandées, vector_score revient en tableaux numpy (aucun literal_eval).
+    dequantize : scores uint8 / uint16 (score_dtype quantifié) relus en float64.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        df = pq.read_table(path, columns=columns).to_pandas()
+        return dequantize_scores(df) if dequantize else df
+    if suffix in (".feather", ".arrow"):
+        _require_pyarrow()
+        import pyarrow.feather as feather
+        df = feather.read_table(path, columns=columns).to_pandas()
+        return dequantize_scores(df) if dequantize else df
+    if suffix in (".json", ".ndjson"):
+        df = pd.read_json(path, orient="records", lines=suffix == ".ndjson")
+        return df[columns] if columns else df
+    return pd.read_csv(path, usecols=columns)
+
+
+# ============================================================
+# Writers par morceaux (pipeline.run_streaming)
+#
+# Chaque bloc scoré est écrit puis libéré : le fichier final est identique à
+# celui de export_csv / export_json sur la table complète.
+# ============================================================
+
+class ChunkWriter(abc.ABC):
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows = 0
+
+    @abc.abstractmethod
+    def write(self, df: pd.DataFrame) -> None:
+        """Ajoute un bloc scoré au fichier."""
+
+    def close(self) -> Path:
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvChunkWriter(ChunkWriter):
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self._fh = open(self.path, "w", encoding="utf-8", newline="")
+
+    def write(self, df: pd.DataFrame) -> None:
+        _text_frame(df).to_csv(self._fh, index=False, header=self.rows == 0)
+        self.rows += len(df)
+
+    def close(self) -> Path:
+        if not self._fh.closed:
+            self._fh.close()
+        return self.path
+
+
+# lignes converties en dicts à la fois par les writers JSON
+JSON_CHUNK_ROWS = 10_000
+
+
+def _iter_records(df: pd.DataFrame, chunk_rows: int | None = None):
+    chunk_rows = chunk_rows or JSON_CHUNK_ROWS
+    for start in range(0, len(df), chunk_rows):
+        yield from _text_frame(df.iloc[start:start + chunk_rows]).to_dict(orient="records")
+
+
+class JsonChunkWriter(ChunkWriter):
+    """
+    Tableau JSON de records, écrit record par record. indent=2 : même rendu
+    que json.dump(records, indent=2) ; indent=None : tableau compact.
+    """
+
+    def __init__(self, path: str | Path, indent: int | None = 2):
+        super().__init__(path)
+        self.indent = indent
+        self._fh = open(self.path, "w", encoding="utf-8")
+        self._fh.write("[")
+
+    def _dump(self, record: dict) -> str:
+        if self.indent is None:
+            return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        text = json.dumps(record, ensure_ascii=False, indent=self.indent)
+        pad = " " * self.indent
+        return "\n".join(pad + line for line in text.split("\n"))
+
+    def write(self, df: pd.DataFrame) -> None:
+        sep = "," if self.indent is None else ",\n"
+        first = "" if self.indent is None else "\n"
+        for record in _iter_records(df):
+            self._fh.write((sep if self.rows else first) + self._dump(record))
+            self.rows += 1
+
+    def close(self) -> Path:
+        if not self._fh.closed:
+            self._fh.write("]" if self.indent is None or self.rows == 0 else "\n]")
+            self._fh.close()
+        return self.path
+
+
+class NdjsonChunkWriter(ChunkWriter):
+    """JSON Lines (un record par ligne), relisible en streaming ligne à ligne."""
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self._fh = open(self.path, "w", encoding="utf-8")
+
+    def write(self, df: pd.DataFrame) -> None:
+        for record in _iter_records(df):
+            self._fh.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            self._fh.write("\n")
+            self.rows += 1
+
+    def close(self) -> Path:
+        if not self._fh.closed:
+            self._fh.close()
+        return self.path
+
+
+class ParquetChunkWriter(ChunkWriter):
+    """Un (ou plusieurs) row group(s) par bloc ; schéma fixé par le premier bloc."""
+
+    def __init__(self, path: str | Path, compression: Optional[str] = "zstd",
+                 row_group_size: Optional[int] = None):
+        super().__init__(path)
+        _require_pyarrow()
+        self.compression = compression or "none"
+        self.row_group_size = row_group_size
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        import pyarrow.parquet as pq
+
+        table = to_arrow_table(df)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+        self._writer.write_table(table.cast(self._writer.schema), row_group_size=self.row_group_size)
+        self.rows += len(df)
+
+    def close(self) -> Path:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return self.path
+
+
+class FeatherChunkWriter(ChunkWriter):
+    """Fichier Arrow IPC écrit record batch par record batch."""
+
+    def __init__(self, path: str | Path, compression: Optional[str] = "zstd"):
+        super().__init__(path)
+        self.compression = None if compression in (None, "uncompressed", "none") else compression
+        self._pa = _require_pyarrow()
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        pa = self._pa
+        table = to_arrow_table(df)
+        if self._writer is None:
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._schema = table.schema
+            self._writer = pa.ipc.new_file(str(self.path), table.schema, options=options)
+        self._writer.write_table(table.cast(self._schema))
+        self.rows += len(df)
+
+    def close(self) -> Path:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return self.path
@@ -0,0 +1,220 @@
+# src/incremental.py
+from __future__ import annotations
+import dataclasses
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.aggregate import select_output_columns
+from src.data_layer import prepare_entities
+from src.instrumentation import StageTimer
+from src.pipeline import PipelineConfig, open_chunk_writers, score_entities
+
+
+# ============================================================
+# Re-scoring incrémental
+#
+# Chaque candidat / offre prétraité reçoit un hash de contenu. Le store
+# (résultat scoré + manifest.json) du run précédent est rechargé et seules
+# les paires touchant une entité nouvelle ou modifiée sont rescorées ; les
+# paires d'entités supprimées sont retirées (tombstones dans le manifest).
+# Le résultat fusionné est identique à un run complet.
+# ============================================================
+
+ID_COLUMNS = ["candidate_id", "job_id"]
+STORE_FRAME = "scored.pkl"
+STORE_MANIFEST = "manifest.json"
+
+# paramètres de config qui changent les paires ou les scores stockés ; les autres
+# (execution_mode, workers, cache, exports, instrumentation, ...) ne forcent pas de rescoring
+_SCORING_FIELDS = ("pairing_mode", "min_shared_skills", "blocking_keys", "lsh", "hard_constraints",
+                   "weights", "profiles", "scoring_mode", "algo_name", "score_dtype", "keep_columns")
+
+
+def entity_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hash de contenu (blake2b 128 bits) de chaque ligne, toutes colonnes comprises."""
+    cols = sorted(df.columns)
+    rows = zip(*(df[c].tolist() for c in cols)) if cols else ([] for _ in range(len(df)))
+    digests = [
+        hashlib.blake2b(repr(tuple(row)).encode("utf-8"), digest_size=16).hexdigest()
+        for row in rows
+    ]
+    return pd.Series(digests, index=df.index, dtype=object)
+
+
+def config_hash(cfg) -> str:
+    fields = {k: v for k, v in dataclasses.asdict(cfg).items() if k in _SCORING_FIELDS}
+    return hashlib.blake2b(json.dumps(fields, sort_keys=True, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ScoreStore:
+    """Résultat scoré du dernier run + manifest (hashes, tombstones, config)."""
+
+    def __init__(self, store_dir: str | Path):
+        self.dir = Path(store_dir)
+
+    def load(self) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+        manifest_path = self.dir / STORE_MANIFEST
+        frame_path = self.dir / STORE_FRAME
+        if not manifest_path.exists() or not frame_path.exists():
+            return None, {}
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return pd.read_pickle(frame_path), manifest
+
+    def save(self, scored: pd.DataFrame, manifest: Dict[str, Any]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        # écriture puis renommage : un run interrompu ne laisse pas un store à moitié écrit
+        tmp = self.dir / (STORE_FRAME + ".tmp")
+        scored.to_pickle(tmp)
+        tmp.replace(self.dir / STORE_FRAME)
+        tmp = self.dir / (STORE_MANIFEST + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        tmp.replace(self.dir / STORE_MANIFEST)
+
+
+def _ids(df: pd.DataFrame, id_col: str) -> pd.Series:
+    ids = df[id_col].astype(str)
+    dup = ids[ids.duplicated()].unique().tolist()
+    if dup:
+        raise ValueError(f"Incremental mode requires unique {id_col} (duplicates: {dup[:5]})")
+    return ids
+
+
+def _changes(ids: pd.Series, hashes: pd.Series, previous: Dict[str, str]) -> Tuple[np.ndarray, list]:
+    """Masque des entités nouvelles / modifiées + ids supprimés depuis le run précédent."""
+    prev = ids.map(previous)
+    changed = (prev.isna() | (prev != hashes)).to_numpy()
+    removed = sorted(set(previous) - set(ids))
+    return changed, removed
+
+
+def _update_tombstones(tombstones: Dict[str, float], removed: list, ids: pd.Series) -> Dict[str, float]:
+    now = time.time()
+    present = set(ids)
+    out = {k: v for k, v in tombstones.items() if k not in present}  # id revenu : plus supprimé
+    out.update({k: now for k in removed})
+    return out
+
+
+def _order_like_full_run(scored: pd.DataFrame, cand_ids: pd.Series, job_ids: pd.Series) -> pd.DataFrame:
+    # un run complet produit les paires dans l'ordre (position candidat, position offre)
+    cand_pos = pd.Series(np.arange(len(cand_ids)), index=cand_ids.to_numpy())
+    job_pos = pd.Series(np.arange(len(job_ids)), index=job_ids.to_numpy())
+    ci = scored["candidate_id"].astype(str).map(cand_pos).to_numpy()
+    ji = scored["job_id"].astype(str).map(job_pos).to_numpy()
+    return scored.iloc[np.lexsort((ji, ci))].reset_index(drop=True)
+
+
+def run_incremental(
+    df_cv: pd.DataFrame,
+    df_jobs: pd.DataFrame,
+    store_dir: str | Path = "results/incremental",
+    config_path: str | Path = "config.yaml",
+    export: bool = True,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Comme pipeline.run(), mais ne rescore que les paires dont le candidat ou
+    l'offre est nouveau / modifié depuis le run précédent stocké dans
+    store_dir. Premier run, ou config de scoring différente : run complet.
+    """
+    cfg = PipelineConfig.from_yaml(config_path)
+    if cfg.top_k_per_job:
+        raise ValueError("Incremental mode does not support top_k_per_job (shortlists depend on all candidates)")
+    if cfg.pairing_mode == "lsh" and cfg.lsh.top_k:
+        raise ValueError("Incremental mode does not support lsh.top_k (per-job LSH shortlists depend on all candidates)")
+
+    timer = StageTimer(trace_memory=cfg.trace_memory).start()
+    try:
+        out, meta = _run_incremental(df_cv, df_jobs, store_dir, cfg, export, timer)
+    finally:
+        timer.stop()
+    meta["timings"] = timer.as_dict()
+    return out, meta
+
+
+def _run_incremental(df_cv: pd.DataFrame, df_jobs: pd.DataFrame, store_dir: str | Path, cfg: PipelineConfig,
+                     export: bool, timer: StageTimer) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    df_candidates, df_jobs_pp, qc_candidates, qc_jobs = prepare_entities(df_cv, df_jobs, timer)
+    cand_ids = _ids(df_candidates, "candidate_id")
+    job_ids = _ids(df_jobs_pp, "job_id")
+    cand_hashes = entity_hashes(df_candidates)
+    job_hashes = entity_hashes(df_jobs_pp)
+
+    # les ids sont toujours conservés dans le store, même hors keep_columns
+    keep = ID_COLUMNS + [c for c in (cfg.keep_columns or []) if c not in ID_COLUMNS]
+    work_cfg = dataclasses.replace(cfg, keep_columns=keep)
+
+    def score(cands: pd.DataFrame, jobs: pd.DataFrame) -> pd.DataFrame:
+        return score_entities(cands.reset_index(drop=True), jobs.reset_index(drop=True), work_cfg, timer)
+
+    store = ScoreStore(store_dir)
+    previous, manifest = store.load()
+    cfg_hash = config_hash(cfg)
+
+    if previous is None or manifest.get("config_hash") != cfg_hash:
+        scored = score(df_candidates, df_jobs_pp)
+        stats = {"mode": "full", "rescored_pairs": len(scored), "reused_pairs": 0}
+        tombstones = {"candidates": {}, "jobs": {}}
+    else:
+        cand_changed, cand_removed = _changes(cand_ids, cand_hashes, manifest["candidates"])
+        job_changed, job_removed = _changes(job_ids, job_hashes, manifest["jobs"])
+
+        stale_cands = set(cand_ids[cand_changed]) | set(cand_removed)
+        stale_jobs = set(job_ids[job_changed]) | set(job_removed)
+        kept = previous[
+            ~previous["candidate_id"].astype(str).isin(stale_cands)
+            & ~previous["job_id"].astype(str).isin(stale_jobs)
+        ]
+
+        # (candidats modifiés × toutes les offres) ∪ (autres candidats × offres modifiées)
+        parts = [kept]
+        if cand_changed.any():
+            parts.append(score(df_candidates[cand_changed], df_jobs_pp))
+        if job_changed.any() and (~cand_changed).any():
+            parts.append(score(df_candidates[~cand_changed], df_jobs_pp[job_changed]))
+        rescored = sum(len(p) for p in parts[1:])
+
+        scored = _order_like_full_run(pd.concat(parts, ignore_index=True), cand_ids, job_ids)
+        stats = {
+            "mode": "incremental",
+            "new_or_changed_candidates": int(cand_changed.sum()),
+            "new_or_changed_jobs": int(job_changed.sum()),
+            "removed_candidates": len(cand_removed),
+            "removed_jobs": len(job_removed),
+            "rescored_pairs": int(rescored),
+            "reused_pairs": len(kept),
+        }
+        old_tombstones = manifest.get("tombstones", {})
+        tombstones = {
+            "candidates": _update_tombstones(old_tombstones.get("candidates", {}), cand_removed, cand_ids),
+            "jobs": _update_tombstones(old_tombstones.get("jobs", {}), job_removed, job_ids),
+        }
+
+    store.save(scored, {
+        "config_hash": cfg_hash,
+        "candidates": dict(zip(cand_ids, cand_hashes)),
+        "jobs": dict(zip(job_ids, job_hashes)),
+        "tombstones": tombstones,
+    })
+
+    out = select_output_columns(scored, cfg.keep_columns)
+    meta: Dict[str, Any] = {
+        "quality_report": {"candidates": qc_candidates, "jobs": qc_jobs},
+        "exports": {},
+        "incremental": stats,
+    }
+    if export:
+        with timer.stage("export", rows_in=len(out)) as st:
+            for fmt, writer in open_chunk_writers(cfg).items():
+                with writer:
+                    writer.write(out)
+                meta["exports"][fmt] = str(writer.path)
+            st.rows_out = len(out)
+    return out, meta
@@ -0,0 +1,224 @@
+from __future__ import annotations
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:  # Unix uniquement
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+# ============================================================
+# Instrumentation par étape (meta["timings"])
+#
+# StageTimer.stage(nom) mesure temps mur, temps CPU (processus courant),
+# lignes en entrée / sortie et mémoire d'une étape : RSS max du processus
+# (toujours, quasi gratuit) et pic tracemalloc propre à l'étape (optionnel,
+# ralentit nettement le code qui alloue beaucoup d'objets Python). Une étape
+# peut être ouverte plusieurs fois (blocs) : les mesures s'additionnent. Les
+# étapes imbriquées sont exclusives : le temps d'une étape interne n'est pas
+# compté dans l'étape qui l'englobe, la somme des étapes reste le temps total.
+# ============================================================
+
+@dataclass
+class StageStats:
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    peak_memory_mb: Optional[float] = None  # None si tracemalloc désactivé
+    max_rss_mb: Optional[float] = None  # RSS max du processus à la fin de l'étape
+    calls: int = 0  # nombre d'ouvertures (blocs)
+
+    @property
+    def throughput_rows_s(self) -> float:
+        rows = self.rows_out or self.rows_in
+        return rows / self.wall_s if self.wall_s > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+            "rows_in": int(self.rows_in),
+            "rows_out": int(self.rows_out),
+            "throughput_rows_s": round(self.throughput_rows_s, 1),
+            "peak_memory_mb": None if self.peak_memory_mb is None else round(self.peak_memory_mb, 3),
+            "max_rss_mb": None if self.max_rss_mb is None else round(self.max_rss_mb, 1),
+            "calls": self.calls,
+        }
+
+
+@dataclass
+class _Frame:
+    stats: StageStats
+    wall0: float
+    cpu0: float
+    mem0: int = 0
+    peak: int = 0
+    child_wall: float = 0.0
+    child_cpu: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+
+
+class StageTimer:
+    """
+    Mesures par étape d'un run. trace_memory : pic mémoire par étape via
+    tracemalloc (démarré / arrêté par le timer s'il ne tourne pas déjà).
+    profiler : StageProfiler optionnel (src/profiling.py), appliqué aux étapes
+    qu'il sélectionne. enabled=False : aucune mesure (contextes vides).
+    """
+
+    def __init__(self, trace_memory: bool = False, enabled: bool = True, profiler=None):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.profiler = profiler if enabled else None
+        self.stages: Dict[str, StageStats] = {}
+        self._stack: List[_Frame] = []
+        self._owns_tracemalloc = False
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    # ---------- cycle de vie ----------
+
+    def start(self) -> "StageTimer":
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        return self
+
+    def stop(self) -> None:
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    # ---------- mesures ----------
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = 0) -> Iterator[_Frame]:
+        """
+        Mesure le bloc `with`. Le frame renvoyé permet de renseigner les lignes :
+            with timer.stage("pairing", rows_in=n) as st: ...; st.rows_out = len(pairs)
+        """
+        stats = self.stages.setdefault(name, StageStats())
+        frame = _Frame(stats, 0.0, 0.0, rows_in=rows_in)
+        if not self.enabled:
+            yield frame
+            return
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # le pic courant appartient aux étapes englobantes, puis repart de zéro
+            self._fold_peak(tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            frame.mem0 = frame.peak = tracemalloc.get_traced_memory()[0]
+        self._stack.append(frame)
+        frame.wall0 = time.perf_counter()
+        frame.cpu0 = time.process_time()
+        try:
+            if self.profiler is None:
+                yield frame
+            else:
+                with self.profiler.profile(name):
+                    yield frame
+        finally:
+            wall = time.perf_counter() - frame.wall0
+            cpu = time.process_time() - frame.cpu0
+            self._stack.pop()
+            if tracing:
+                self._fold_peak(tracemalloc.get_traced_memory()[1], frame)
+                peak_mb = (frame.peak - frame.mem0) / 2**20
+                stats.peak_memory_mb = max(stats.peak_memory_mb or 0.0, peak_mb)
+            stats.max_rss_mb = max_rss_mb()
+            stats.wall_s += wall - frame.child_wall
+            stats.cpu_s += cpu - frame.child_cpu
+            stats.rows_in += frame.rows_in
+            stats.rows_out += frame.rows_out
+            stats.calls += 1
+            if self._stack:
+                self._stack[-1].child_wall += wall
+                self._stack[-1].child_cpu += cpu
+
+    def _fold_peak(self, peak: int, frame: Optional[_Frame] = None) -> None:
+        for f in self._stack + ([frame] if frame is not None else []):
+            f.peak = max(f.peak, peak)
+
+    def timed_iter(self, name: str, items: Iterable, count: Optional[Callable[[Any], int]] = None) -> Iterator:
+        """Itère sur items en comptant le temps de production de chaque élément dans l'étape `name`."""
+        it = iter(items)
+        while True:
+            with self.stage(name) as st:
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+                if count is not None:
+                    st.rows_out = count(item)
+            yield item
+
+    # ---------- sorties ----------
+
+    def as_dict(self) -> Dict[str, Any]:
+        """meta["timings"] : une entrée par étape (ordre de première exécution) + total."""
+        out: Dict[str, Any] = {name: s.as_dict() for name, s in self.stages.items() if s.calls}
+        out["total"] = {
+            "wall_s": round(time.perf_counter() - self._wall0, 6),
+            "cpu_s": round(time.process_time() - self._cpu0, 6),
+        }
+        peaks = [s.peak_memory_mb for s in self.stages.values() if s.peak_memory_mb is not None]
+        if peaks:
+            out["total"]["peak_memory_mb"] = round(max(peaks), 3)
+        rss = max_rss_mb()
+        if rss is not None:
+            out["total"]["max_rss_mb"] = round(rss, 1)
+        return out
+
+
+def max_rss_mb() -> Optional[float]:
+    """RSS maximal du processus depuis son démarrage (Mo), None si indisponible."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : Ko ; macOS : octets
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024
+
+
+# ============================================================
+# Fichier de métriques JSON lines
+#
+# Une ligne par run, directement utilisable comme execution_records de
+# KPICalculator (status, error, latency_ms) ; KPICalculator.load_metrics_jsonl
+# en déduit aussi performance_data.
+# ============================================================
+
+def run_record(timings: Dict[str, Any], n_pairs: int = 0, status: str = "success",
+               error: Optional[str] = None, **extra) -> Dict[str, Any]:
+    total = timings.get("total", {})
+    wall = float(total.get("wall_s", 0.0))
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "status": status,
+        "error": error,
+        "latency_ms": round(wall * 1000, 3),
+        "memory_usage_mb": total.get("peak_memory_mb", total.get("max_rss_mb")),
+        "pairs": int(n_pairs),
+        "throughput_per_second": round(n_pairs / wall, 1) if wall > 0 else 0.0,
+        **extra,
+        "stages": {k: v for k, v in timings.items() if k != "total"},
+    }
+
+
+def append_metrics(path: str | Path, record: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
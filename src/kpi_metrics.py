@@ -7,9 +7,11 @@ Ce module calcule:
 - KPI de performance (speed, memory)
 - KPI de qualité (accuracy, ranking quality)
 """
+import json
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 
@@ -251,6 +253,24 @@ class KPICalculator:
         
         return float(np.clip(overall, 0.0, 1.0))
 
+    @staticmethod
+    def load_metrics_jsonl(path) -> Tuple[List[Dict], Dict]:
+        """
+        Lit un fichier de métriques du pipeline (pipeline.metrics_file, une ligne
+        JSON par run) -> (execution_records, performance_data) pour calculate_all.
+        """
+        with open(Path(path), "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+        ok = [r for r in records if r.get("status") == "success"] or records
+        memory = [r["memory_usage_mb"] for r in ok if r.get("memory_usage_mb") is not None]
+        performance_data = {
+            "avg_latency_ms": float(np.mean([r.get("latency_ms", 0) for r in ok])) if ok else 0.0,
+            "memory_usage_mb": float(max(memory)) if memory else 0.0,
+            "throughput_per_second": float(np.mean([r.get("throughput_per_second", 0) for r in ok])) if ok else 0.0,
+        }
+        return records, performance_data
+
 
 # Thresholds et alertes
 class KPIThresholds:
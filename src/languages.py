@@ -1,9 +1,11 @@
 from __future__ import annotations
 import re
 from typing import List, Union
-import ast
+import numpy as np
 import pandas as pd
 
+from .list_literal import parse_list_literal
+
 _SPLIT_PATTERN = re.compile(r"[;,|/]+")
 
 
@@ -18,7 +20,7 @@ def _to_items(x: Union[str, List[str], None]) -> List[str]:
             return []
         if (s.startswith("[") and s.endswith("]")) or (s.startswith("(") and s.endswith(")")):
             try:
-                parsed = ast.literal_eval(s)
+                parsed = parse_list_literal(s)
                 if isinstance(parsed, list):
                     items = parsed
                 else:
@@ -60,3 +62,80 @@ def languages_overlap_ratio(a: List[str], b: List[str]) -> float:
     if not a_set:
         return 0.0
     return len(a_set & set(b)) / len(a_set)
+
+
+# ============================================================
+# Registre de codes langue -> bits
+#
+# Chaque code reçoit une position de bit stable ; une liste de langues devient
+# un entier (bitmask). Les langues fréquentes sont pré-enregistrées pour occuper
+# les premiers bits : au-delà de 64 codes, on passe à un masque multi-mots.
+# ============================================================
+
+_COMMON_LANGUAGE_CODES = ["fr", "en", "es", "de", "it", "pt", "ar", "nl", "zh", "ja", "ru"]
+
+
+class LanguageRegistry:
+    def __init__(self, codes: List[str] | None = None):
+        self._bits: dict = {}
+        for code in (codes if codes is not None else _COMMON_LANGUAGE_CODES):
+            self.bit(code)
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def bit(self, code: str) -> int:
+        """Position du bit du code (ajouté au registre s'il est nouveau)."""
+        if code not in self._bits:
+            self._bits[code] = len(self._bits)
+        return self._bits[code]
+
+    def encode(self, languages: List[str]) -> int:
+        mask = 0
+        for code in languages:
+            mask |= 1 << self.bit(code)
+        return mask
+
+    def decode(self, mask: int) -> List[str]:
+        return sorted(code for code, b in self._bits.items() if (mask >> b) & 1)
+
+    @property
+    def n_words(self) -> int:
+        return max(1, (len(self._bits) + 63) // 64)
+
+
+# registre par défaut des appels directs à preprocess_candidates / preprocess_jobs
+# (candidats et offres doivent partager les positions de bits). Les runs du
+# pipeline (prepare_entities, load_entities_csv) utilisent un registre propre au
+# run : masques et dtype ne dépendent pas de ce que le processus a déjà vu.
+LANGUAGE_REGISTRY = LanguageRegistry()
+
+
+def encode_languages_column(values: pd.Series, registry: LanguageRegistry | None = None) -> pd.Series:
+    """
+    Listes de codes normalisés -> bitmask par ligne.
+
+    uint64 tant que le registre tient sur 64 bits, sinon entiers Python (masque
+    multi-mots, découpé par masks_to_words au moment du scoring).
+    """
+    registry = registry if registry is not None else LANGUAGE_REGISTRY
+    masks = [registry.encode(v) for v in values]
+    if len(registry) <= 64:
+        return pd.Series(np.array(masks, dtype=np.uint64), index=values.index)
+    return pd.Series(masks, index=values.index, dtype=object)
+
+
+def masks_to_words(values, n_words: int | None = None) -> np.ndarray:
+    """Bitmasks (uint64 ou entiers Python) -> tableau (n, n_words) de uint64."""
+    arr = np.asarray(values)
+    if arr.dtype == np.uint64 and (n_words is None or n_words == 1):
+        return arr.reshape(-1, 1)
+
+    ints = [int(v) for v in arr]
+    if n_words is None:
+        n_words = max(1, (max((v.bit_length() for v in ints), default=0) + 63) // 64)
+    words = np.zeros((len(ints), n_words), dtype=np.uint64)
+    full = (1 << 64) - 1
+    for w in range(n_words):
+        words[:, w] = [(v >> (64 * w)) & full for v in ints]
+    return words
@@ -0,0 +1,95 @@
+from __future__ import annotations
+import ast
+import math
+import re
+from typing import Any, List
+
+
+# ============================================================
+# Parseur rapide de listes stockées en texte
+#
+# Les CSV contiennent des cellules "['python', 'sql']" ou "[0.5, 1.0, ...]".
+# parse_list_literal reconnaît par regex les listes / tuples de chaînes
+# simples (sans échappement) et de nombres décimaux, et renvoie exactement ce
+# que renverrait ast.literal_eval. Toute autre forme (échappements, listes
+# imbriquées, nan, ...) passe par ast.literal_eval, qui lève les mêmes
+# exceptions qu'avant sur une entrée invalide.
+# ============================================================
+
+_STR = r"""'[^'\\\n]*'|"[^"\\\n]*\""""
+_NUM = r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]*)?(?:[eE][-+]?[0-9]+)?|-?\.[0-9]+(?:[eE][-+]?[0-9]+)?"
+_ITEM = rf"(?:{_STR}|{_NUM})"
+_BODY = rf"\s*(?:{_ITEM}\s*,\s*)*(?:{_ITEM}\s*)?"
+_STR_BODY = rf"\s*(?:(?:{_STR})\s*,\s*)*(?:(?:{_STR})\s*)?"
+
+_STR_LIST_RE = re.compile(rf"\[{_STR_BODY}\]")
+_LIST_RE = re.compile(rf"\[{_BODY}\]")
+_TUPLE_RE = re.compile(rf"\({_BODY}\)")
+_TOKEN_RE = re.compile(rf"""'([^'\\\n]*)'|"([^"\\\n]*)"|({_NUM})""")
+_SINGLE_RE = re.compile(r"'([^'\\\n]*)'")
+_DOUBLE_RE = re.compile(r'"([^"\\\n]*)"')
+_INT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)")
+
+
+def _items(s: str) -> list:
+    out = []
+    for single, double, num in _TOKEN_RE.findall(s):
+        if num:
+            out.append(int(num) if _INT_RE.fullmatch(num) else float(num))
+        else:
+            out.append(single or double)
+    return out
+
+
+def parse_list_literal(s: str) -> Any:
+    """
+    ast.literal_eval(s), avec un chemin rapide pour les listes / tuples de
+    chaînes et de nombres : "['a', 'b']" -> ['a', 'b'], "('a',)" -> ('a',).
+    """
+    if _STR_LIST_RE.fullmatch(s):
+        # cas courant : une seule sorte de guillemets, extraction directe
+        if '"' not in s:
+            return _SINGLE_RE.findall(s)
+        if "'" not in s:
+            return _DOUBLE_RE.findall(s)
+        return _items(s)
+    if _LIST_RE.fullmatch(s):
+        return _items(s)
+    if _TUPLE_RE.fullmatch(s):
+        items = _items(s)
+        # "('a')" est une expression parenthésée, pas un tuple
+        if len(items) == 1 and not s[1:-1].rstrip().endswith(","):
+            return items[0]
+        return tuple(items)
+    return ast.literal_eval(s)
+
+
+def parse_list_cell(x) -> List[str]:
+    """
+    Cellule liste brute (sans normalisation) pour le scoring :
+      - "['a','b']" -> ['a','b']
+      - ['a','b']   -> ['a','b']
+      - None/NaN    -> []
+      - "a"         -> ['a']
+    """
+    if x is None:
+        return []
+    if isinstance(x, float) and math.isnan(x):
+        return []
+    if isinstance(x, list):
+        return [str(i).strip() for i in x if i]
+
+    s = str(x).strip()
+    if not s:
+        return []
+
+    # Si c'est une liste stockée en string
+    if s.startswith("[") and s.endswith("]"):
+        try:
+            parsed = parse_list_literal(s)
+            if isinstance(parsed, list):
+                return [str(i).strip() for i in parsed if i]
+        except Exception:
+            pass
+
+    return [s]
@@ -0,0 +1,194 @@
+# src/lsh.py
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .preprocessing import skill_tokens
+
+
+# ============================================================
+# MinHash + LSH (banding) sur les ensembles de compétences
+#
+# Recherche approximative des candidats proches d'une offre au sens de la
+# similarité de Jaccard : signature MinHash de num_perm = bands × rows
+# valeurs par candidat, indexée par bandes. Une offre ne compare que les
+# candidats qui partagent au moins une bande complète avec elle.
+#   - plus de bandes (rows petit) -> meilleur rappel, plus de candidats examinés
+#   - moins de bandes (rows grand) -> plus rapide, rappel plus faible
+# Seuil approximatif de la courbe en S : (1 / bands) ** (1 / rows).
+# Les paires retenues sont ensuite rescorées exactement (skills_jaccard et
+# autres subscores) avant agrégation.
+# ============================================================
+
+_PRIME = np.uint64((1 << 31) - 1)  # a·h + b < 2^62 : pas de débordement en uint64
+_EMPTY = _PRIME                     # valeur sentinelle des ensembles vides
+MINHASH_CHUNK_TOKENS = 16_384       # tokens hachés par lot (16 Mo de travail à 128 permutations)
+
+
+@dataclass(frozen=True)
+class LSHConfig:
+    bands: int = 32
+    rows: int = 4
+    top_k: Optional[int] = None  # par offre, selon le Jaccard estimé (None = tous les candidats retrouvés)
+    seed: int = 0
+
+    @property
+    def num_perm(self) -> int:
+        return self.bands * self.rows
+
+    @property
+    def threshold(self) -> float:
+        return (1.0 / self.bands) ** (1.0 / self.rows)
+
+
+def _token_hash(token: str) -> int:
+    # stable entre processus (contrairement à hash())
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little") % int(_PRIME)
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.num_perm = int(num_perm)
+        self.a = rng.integers(1, int(_PRIME), size=self.num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_PRIME), size=self.num_perm, dtype=np.uint64)
+        self._token_cache: Dict[str, int] = {}
+
+    def _hashes(self, tokens) -> List[int]:
+        cache = self._token_cache
+        out = []
+        for t in set(tokens):
+            h = cache.get(t)
+            if h is None:
+                h = cache[t] = _token_hash(t)
+            out.append(h)
+        return out
+
+    def signatures(self, sets, chunk_tokens: int = MINHASH_CHUNK_TOKENS) -> np.ndarray:
+        """
+        (n, num_perm) uint64 : min_t (a·h(t) + b) mod p pour chaque ensemble.
+        Les ensembles sont traités par lots d'environ chunk_tokens tokens, réduits
+        aussitôt : mémoire de travail O(chunk_tokens × num_perm), pas O(corpus).
+        """
+        hashes = [self._hashes(s) for s in sets]
+        lengths = np.fromiter((len(h) for h in hashes), dtype=np.int64, count=len(hashes))
+        sig = np.full((len(hashes), self.num_perm), _EMPTY, dtype=np.uint64)
+        ends = np.cumsum(lengths)
+        if not len(hashes) or ends[-1] == 0:
+            return sig
+
+        flat = np.fromiter((x for h in hashes for x in h), dtype=np.uint64, count=int(ends[-1]))
+        start = 0
+        while start < len(hashes):
+            # ensembles [start, stop) : au plus chunk_tokens tokens (au moins un ensemble)
+            offset = int(ends[start] - lengths[start])
+            stop = max(int(np.searchsorted(ends, offset + chunk_tokens, side="right")), start + 1)
+            lens = lengths[start:stop]
+            nonempty = lens > 0
+            if nonempty.any():
+                values = flat[offset:int(ends[stop - 1]), None] * self.a[None, :]
+                values += self.b[None, :]
+                values %= _PRIME
+                local_starts = (np.cumsum(lens) - lens)[nonempty]
+                sig[start:stop][nonempty] = np.minimum.reduceat(values, local_starts, axis=0)
+            start = stop
+        return sig
+
+
+def estimated_jaccard(sig: np.ndarray, query_sig: np.ndarray) -> np.ndarray:
+    """Fraction de valeurs MinHash égales (estimateur non biaisé du Jaccard)."""
+    est = (sig == query_sig[None, :]).mean(axis=1)
+    # deux ensembles vides ont des signatures identiques mais Jaccard 0 (skills_jaccard)
+    empty = (sig[:, 0] == _EMPTY) | (query_sig[0] == _EMPTY)
+    est[empty] = 0.0
+    return est
+
+
+def _band_keys(sig: np.ndarray, band: int, rows: int) -> np.ndarray:
+    block = np.ascontiguousarray(sig[:, band * rows:(band + 1) * rows])
+    return block.view(np.dtype((np.void, block.dtype.itemsize * rows))).reshape(-1)
+
+
+@dataclass
+class LSHIndex:
+    """Index LSH des signatures candidats : une table de buckets par bande."""
+    config: LSHConfig
+    hasher: MinHasher
+    signatures: np.ndarray
+    buckets: List[Dict[bytes, np.ndarray]] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def build(cls, candidate_sets, config: LSHConfig = LSHConfig()) -> "LSHIndex":
+        hasher = MinHasher(config.num_perm, config.seed)
+        sig = hasher.signatures(candidate_sets)
+        non_empty = np.flatnonzero(sig[:, 0] != _EMPTY)
+        buckets = []
+        for band in range(config.bands):
+            keys = _band_keys(sig[non_empty], band, config.rows)
+            uniq, inverse = np.unique(keys, return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.searchsorted(inverse[order], np.arange(len(uniq) + 1))
+            buckets.append({
+                uniq[k].tobytes(): non_empty[order[bounds[k]:bounds[k + 1]]] for k in range(len(uniq))
+            })
+        return cls(config=config, hasher=hasher, signatures=sig, buckets=buckets)
+
+    def candidates(self, query_sig: np.ndarray) -> np.ndarray:
+        """Positions (triées) des candidats partageant au moins une bande avec la requête."""
+        if query_sig[0] == _EMPTY:
+            return np.zeros(0, dtype=np.int64)
+        rows = self.config.rows
+        found = []
+        for band, table in enumerate(self.buckets):
+            key = query_sig[band * rows:(band + 1) * rows].tobytes()
+            hit = table.get(key)
+            if hit is not None:
+                found.append(hit)
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found)).astype(np.int64)
+
+    def query(self, skills, top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-K candidats par Jaccard estimé : (positions, Jaccard estimé), triés
+        par estimation décroissante puis position. top_k=None : tous les retrouvés.
+        """
+        query_sig = self.hasher.signatures([skill_tokens(skills)])[0]
+        cands = self.candidates(query_sig)
+        est = estimated_jaccard(self.signatures[cands], query_sig)
+        order = np.lexsort((cands, -est))
+        if top_k is not None:
+            order = order[:top_k]
+        return cands[order], est[order]
+
+
+def build_candidate_lsh(df_candidates: pd.DataFrame, config: LSHConfig = LSHConfig(),
+                        column: str = "candidate_skills") -> LSHIndex:
+    cells = df_candidates[column].tolist() if column in df_candidates.columns else [None] * len(df_candidates)
+    return LSHIndex.build([skill_tokens(c) for c in cells], config)
+
+
+def lsh_index_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, config: LSHConfig = LSHConfig(),
+                    index: LSHIndex | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Paires (candidat, offre) retrouvées par LSH, top_k par offre si demandé,
+    dans l'ordre cartésien (candidat puis offre) : les subscores exacts sont
+    calculés ensuite sur ces paires seulement.
+    """
+    index = index or build_candidate_lsh(df_candidates, config)
+    required = df_jobs["required_skills"].tolist() if "required_skills" in df_jobs.columns else [None] * len(df_jobs)
+    ci_parts, ji_parts = [], []
+    for j, skills in enumerate(required):
+        cands, _ = index.query(skills, config.top_k)
+        if len(cands):
+            ci_parts.append(cands)
+            ji_parts.append(np.full(len(cands), j, dtype=np.int64))
+    if not ci_parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    ci, ji = np.concatenate(ci_parts), np.concatenate(ji_parts)
+    order = np.lexsort((ji, ci))
+    return ci[order], ji[order]
@@ -1,6 +1,11 @@
 from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+from .preprocessing import skill_tokens
+
 def build_pairs_cartesian(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame) -> pd.DataFrame:
     c = df_candidates.copy()
     j = df_jobs.copy()
@@ -11,5 +16,372 @@ def build_pairs_cartesian(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame) ->
 
 
 def build_pairs_filtered_same_sector(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame) -> pd.DataFrame:
-    return df_candidates.merge(df_jobs, left_on="sector", right_on="required_sector", how="inner")
+    """Paires de même secteur (mêmes lignes et même ordre qu'un merge inner sector = required_sector)."""
+    ci, ji = same_sector_index_pairs(df_candidates, df_jobs)
+    return take_pairs(df_candidates, df_jobs, ci, ji)
+
+
+# ============================================================
+# Pairing par indices (mode factorisé)
+#
+# Au lieu de copier les lignes candidat/offre N×M fois, on ne produit que des
+# couples de positions (cand_idx, job_idx) ; les lignes de sortie sont
+# construites à la fin avec take_pairs, uniquement pour ce qui est exporté.
+# ============================================================
+
+def cartesian_index_pairs(n_candidates: int, n_jobs: int, start: int = 0, stop: int | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions des paires [start, stop) dans l'ordre de build_pairs_cartesian."""
+    total = n_candidates * n_jobs
+    stop = total if stop is None else min(stop, total)
+    flat = np.arange(start, stop, dtype=np.int64)
+    return flat // n_jobs, flat % n_jobs
+
+
+# ============================================================
+# Blocking par clés (pairing_mode: same_sector / blocking)
+#
+# Jointure par hachage sur des codes entiers : les offres sont partitionnées
+# par clé (tri stable), puis chaque candidat est associé à la partition de sa
+# clé. Aucun DataFrame intermédiaire ; l'ordre est celui d'un merge inner
+# (candidats dans l'ordre, puis offres dans l'ordre).
+# ============================================================
+
+def _empty_pairs() -> Tuple[np.ndarray, np.ndarray]:
+    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+
+def _shared_codes(cand_values, job_values) -> Tuple[np.ndarray, np.ndarray]:
+    # codes 0..K-1 communs aux deux côtés (NaN == NaN, comme merge)
+    cand_values, job_values = np.asarray(cand_values), np.asarray(job_values)
+    if not (cand_values.dtype.kind in "iu" and job_values.dtype.kind in "iu"):
+        cand_values, job_values = cand_values.astype(object), job_values.astype(object)
+    values = np.concatenate([cand_values, job_values])
+    codes, _ = pd.factorize(values, use_na_sentinel=False)
+    codes = codes.astype(np.int64, copy=False)
+    return codes[:len(cand_values)], codes[len(cand_values):]
+
+
+def _key_partitions(cand_keys: np.ndarray, job_keys: np.ndarray):
+    cand_keys, job_keys = _shared_codes(cand_keys, job_keys)
+    n_keys = int(max(cand_keys.max(initial=-1), job_keys.max(initial=-1))) + 1
+    counts = np.bincount(job_keys, minlength=n_keys)
+    return cand_keys, job_keys, counts
+
+
+def hash_join_index_pairs(cand_keys, job_keys) -> Tuple[np.ndarray, np.ndarray]:
+    """Paires (c, j) telles que cand_keys[c] == job_keys[j], triées par candidat puis par offre."""
+    cand_keys, job_keys, counts = _key_partitions(cand_keys, job_keys)
+    if not len(cand_keys) or not len(job_keys):
+        return _empty_pairs()
+    order = np.argsort(job_keys, kind="stable")
+    starts = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+
+    per_cand = counts[cand_keys]
+    total = int(per_cand.sum())
+    ci = np.repeat(np.arange(len(cand_keys), dtype=np.int64), per_cand)
+    # rang de chaque paire dans la partition de son candidat
+    first = np.repeat(np.cumsum(per_cand) - per_cand, per_cand)
+    ji = order[starts[cand_keys[ci]] + np.arange(total, dtype=np.int64) - first]
+    return ci, ji
+
+
+def hash_join_size(cand_keys, job_keys) -> int:
+    """Nombre exact de paires de hash_join_index_pairs, en O(N + M)."""
+    cand_keys, _, counts = _key_partitions(cand_keys, job_keys)
+    return int(counts[cand_keys].sum()) if len(cand_keys) else 0
+
+
+def _sector_keys(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame):
+    # codes secteur du prétraitement (registre du run) si disponibles, sinon les chaînes
+    if "sector_code" in df_candidates.columns and "required_sector_code" in df_jobs.columns:
+        return df_candidates["sector_code"].to_numpy(), df_jobs["required_sector_code"].to_numpy()
+    return df_candidates["sector"].to_numpy(dtype=object), df_jobs["required_sector"].to_numpy(dtype=object)
+
+
+def same_sector_index_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, **_) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions des paires de même secteur, dans l'ordre de build_pairs_filtered_same_sector."""
+    return hash_join_index_pairs(*_sector_keys(df_candidates, df_jobs))
+
+
+def _blocking_keys(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, blocking_keys: Dict[str, str] | None):
+    if not blocking_keys:
+        raise ValueError("pairing_mode 'blocking' needs blocking_keys (candidate column -> job column)")
+    n_c = len(df_candidates)
+    combined = np.zeros(n_c + len(df_jobs), dtype=np.int64)
+    for cand_col, job_col in blocking_keys.items():
+        cand_codes, job_codes = _shared_codes(df_candidates[cand_col].to_numpy(dtype=object),
+                                              df_jobs[job_col].to_numpy(dtype=object))
+        codes = np.concatenate([cand_codes, job_codes])
+        # clé composite recompactée à chaque colonne : pas de dépassement d'entier
+        combined, _ = pd.factorize(combined * (int(codes.max(initial=0)) + 1) + codes)
+    return combined[:n_c], combined[n_c:]
+
+
+def blocking_index_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame,
+                         blocking_keys: Dict[str, str] | None = None, **_) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Paires dont toutes les clés coïncident, ex: {"sector": "required_sector",
+    "education_level": "required_education"} (colonnes scalaires).
+    """
+    return hash_join_index_pairs(*_blocking_keys(df_candidates, df_jobs, blocking_keys))
+
+
+# ============================================================
+# Blocking par compétences (pairing_mode: skill_blocking)
+#
+# Index inversé compétence -> positions des candidats : pour chaque offre on
+# ne génère que les candidats partageant au moins min_shared_skills
+# compétences requises, au lieu des N candidats du cartésien.
+# ============================================================
+
+@dataclass
+class SkillIndex:
+    """Index inversé au format CSR : postings[indptr[s]:indptr[s+1]] = candidats ayant la compétence s."""
+    vocab: Dict[str, int]
+    indptr: np.ndarray
+    postings: np.ndarray
+    n_candidates: int
+
+    def skill_ids(self, skills) -> np.ndarray:
+        ids = {self.vocab[t] for t in skill_tokens(skills) if t in self.vocab}
+        return np.fromiter(ids, dtype=np.int64, count=len(ids))
+
+    def candidates_sharing(self, skills, min_shared: int = 1) -> np.ndarray:
+        """Positions triées des candidats partageant >= min_shared compétences avec `skills`."""
+        ids = self.skill_ids(skills)
+        if len(ids) < min_shared:
+            return np.zeros(0, dtype=np.int64)
+        hits = np.concatenate([self.postings[self.indptr[s]:self.indptr[s + 1]] for s in ids])
+        if min_shared <= 1:
+            return np.unique(hits)
+        cands, counts = np.unique(hits, return_counts=True)
+        return cands[counts >= min_shared]
+
+
+def build_skill_index(df_candidates: pd.DataFrame, column: str = "candidate_skills") -> SkillIndex:
+    vocab: Dict[str, int] = {}
+    skill_ids, cand_pos = [], []
+    for pos, cell in enumerate(df_candidates[column].tolist() if column in df_candidates.columns else []):
+        for t in set(skill_tokens(cell)):
+            skill_ids.append(vocab.setdefault(t, len(vocab)))
+            cand_pos.append(pos)
+
+    skill_ids = np.asarray(skill_ids, dtype=np.int64)
+    cand_pos = np.asarray(cand_pos, dtype=np.int64)
+    # tri stable par compétence : chaque posting list reste triée par candidat
+    order = np.argsort(skill_ids, kind="stable")
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(skill_ids, minlength=len(vocab)), out=indptr[1:])
+    return SkillIndex(vocab=vocab, indptr=indptr, postings=cand_pos[order], n_candidates=len(df_candidates))
+
+
+def skill_blocking_index_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, min_shared_skills: int = 1,
+                               index: SkillIndex | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Paires partageant >= min_shared_skills compétences, dans l'ordre cartésien (candidat puis offre)."""
+    if min_shared_skills < 1:
+        raise ValueError("min_shared_skills must be >= 1 (use pairing_mode: cartesian otherwise)")
+    index = index or build_skill_index(df_candidates)
+
+    ci_parts, ji_parts = [], []
+    required = df_jobs["required_skills"].tolist() if "required_skills" in df_jobs.columns else [None] * len(df_jobs)
+    for j, skills in enumerate(required):
+        cands = index.candidates_sharing(skills, min_shared_skills)
+        if len(cands):
+            ci_parts.append(cands)
+            ji_parts.append(np.full(len(cands), j, dtype=np.int64))
+    if not ci_parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    ci, ji = np.concatenate(ci_parts), np.concatenate(ji_parts)
+    order = np.lexsort((ji, ci))
+    return ci[order], ji[order]
+
+
+def build_pairs_skill_blocking(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame,
+                               min_shared_skills: int = 1) -> pd.DataFrame:
+    """Table des paires restreinte au blocking par compétences (mêmes colonnes que build_pairs_cartesian)."""
+    ci, ji = skill_blocking_index_pairs(df_candidates, df_jobs, min_shared_skills)
+    return take_pairs(df_candidates, df_jobs, ci, ji)
+
+
+def pairing_stats(n_candidates: int, n_jobs: int, n_pairs: int) -> Dict[str, float]:
+    """Paires émises vs cartésien complet."""
+    total = n_candidates * n_jobs
+    return {
+        "cartesian_pairs": int(total),
+        "pairs": int(n_pairs),
+        "pruned_pairs": int(total - n_pairs),
+        "pruned_ratio": float((total - n_pairs) / total) if total else 0.0,
+    }
+
+
+def build_pairs_lsh(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, lsh_config=None) -> pd.DataFrame:
+    """Table des paires retrouvées par MinHash/LSH (voir src/lsh.py)."""
+    ci, ji = _lsh_pairs(df_candidates, df_jobs, lsh_config)
+    return take_pairs(df_candidates, df_jobs, ci, ji)
+
+
+def _lsh_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, lsh_config=None, **_):
+    from .lsh import LSHConfig, lsh_index_pairs
+
+    return lsh_index_pairs(df_candidates, df_jobs, lsh_config or LSHConfig())
+
+
+# ============================================================
+# Registre des stratégies de pairing (pairing_mode)
+#
+# Une stratégie renvoie des positions (cand_idx, job_idx), jamais de lignes
+# copiées, et sait estimer son nombre de paires avant de les générer.
+# Options passées en mots-clés à toutes les stratégies (chacune ignore celles
+# qui ne la concernent pas) : min_shared_skills, lsh_config, blocking_keys.
+# ============================================================
+
+IndexPairsFn = Callable[..., Tuple[np.ndarray, np.ndarray]]
+
+
+@dataclass(frozen=True)
+class PairingStrategy:
+    name: str
+    index_pairs: IndexPairsFn  # (df_candidates, df_jobs, **options) -> (cand_idx, job_idx)
+    estimate: Optional[Callable[..., int]] = None  # idem -> nb de paires (borne sup. si non exact) ; None = N·M
+    iter_blocks: Optional[Callable[..., Iterator[Tuple[np.ndarray, np.ndarray]]]] = None  # génération paresseuse
+
+    def blocks(self, df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, block_size: int,
+               **options) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        if self.iter_blocks is not None:
+            yield from self.iter_blocks(df_candidates, df_jobs, block_size, **options)
+            return
+        ci, ji = self.index_pairs(df_candidates, df_jobs, **options)
+        for start in range(0, len(ci), block_size):
+            yield ci[start:start + block_size], ji[start:start + block_size]
+
+    def estimate_pairs(self, df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, **options) -> int:
+        if self.estimate is None:
+            return len(df_candidates) * len(df_jobs)
+        return int(self.estimate(df_candidates, df_jobs, **options))
+
+
+PAIRING_STRATEGIES: Dict[str, PairingStrategy] = {}
+PAIRING_ALIASES = {"filtered_same_sector": "same_sector"}
+
+
+def register_pairing_strategy(name: str, index_pairs: IndexPairsFn, estimate: Optional[Callable[..., int]] = None,
+                              iter_blocks=None, replace: bool = False) -> PairingStrategy:
+    """Déclare un pairing_mode utilisable dans la config (replace=True pour redéfinir un mode existant)."""
+    if not replace and (name in PAIRING_STRATEGIES or name in PAIRING_ALIASES):
+        raise ValueError(f"pairing_mode '{name}' is already registered")
+    strategy = PairingStrategy(name, index_pairs, estimate, iter_blocks)
+    PAIRING_STRATEGIES[name] = strategy
+    return strategy
+
+
+def get_pairing_strategy(pairing_mode: str) -> PairingStrategy:
+    name = PAIRING_ALIASES.get(pairing_mode, pairing_mode)
+    if name not in PAIRING_STRATEGIES:
+        raise ValueError(f"Unknown pairing_mode: {pairing_mode!r}. Use one of {sorted(PAIRING_STRATEGIES)}")
+    return PAIRING_STRATEGIES[name]
+
+
+def estimate_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, pairing_mode: str = "cartesian",
+                   **options) -> int:
+    """Nombre de paires que générera pairing_mode (exact ou borne supérieure selon la stratégie)."""
+    return get_pairing_strategy(pairing_mode).estimate_pairs(df_candidates, df_jobs, **options)
+
+
+def iter_index_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, pairing_mode: str = "cartesian",
+                     block_size: int = 200000, min_shared_skills: int = 1,
+                     lsh_config=None, constraint_filter=None,
+                     blocking_keys: Dict[str, str] | None = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Génère les paires par blocs de block_size couples (cand_idx, job_idx).
+
+    constraint_filter : ConstraintFilter (src/constraints.py) optionnel, appliqué
+    à chaque bloc ; les blocs vides après filtrage ne sont pas émis.
+    """
+    strategy = get_pairing_strategy(pairing_mode)
+    blocks = strategy.blocks(df_candidates, df_jobs, block_size, min_shared_skills=min_shared_skills,
+                             lsh_config=lsh_config, blocking_keys=blocking_keys)
+    for ci, ji in blocks:
+        if constraint_filter is not None:
+            ci, ji = constraint_filter(ci, ji)
+            if not len(ci):
+                continue
+        yield ci, ji
+
+
+def index_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, pairing_mode: str = "cartesian",
+                **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+    """Toutes les paires de iter_index_pairs (mêmes arguments), concaténées."""
+    blocks = list(iter_index_pairs(df_candidates, df_jobs, pairing_mode, **kwargs))
+    if not blocks:
+        return _empty_pairs()
+    return np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks])
+
+
+def _cartesian_blocks(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, block_size: int, **_):
+    n_c, n_j = len(df_candidates), len(df_jobs)
+    for start in range(0, n_c * n_j, block_size):
+        yield cartesian_index_pairs(n_c, n_j, start, start + block_size)
+
+
+def _skill_blocking_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, min_shared_skills: int = 1, **_):
+    return skill_blocking_index_pairs(df_candidates, df_jobs, min_shared_skills)
+
+
+def _skill_blocking_estimate(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, min_shared_skills: int = 1, **_):
+    # borne sup. : somme des posting lists des compétences requises, plafonnée à N par offre
+    index = build_skill_index(df_candidates)
+    lengths = np.diff(index.indptr)
+    required = df_jobs["required_skills"].tolist() if "required_skills" in df_jobs.columns else []
+    total = 0
+    for skills in required:
+        ids = index.skill_ids(skills)
+        if len(ids) >= max(min_shared_skills, 1):
+            total += min(int(lengths[ids].sum()), len(df_candidates))
+    return total
+
+
+def _lsh_estimate(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, lsh_config=None, **_):
+    # borne sup. : top_k candidats par offre au plus
+    top_k = getattr(lsh_config, "top_k", None)
+    per_job = min(top_k, len(df_candidates)) if top_k else len(df_candidates)
+    return per_job * len(df_jobs)
+
+
+register_pairing_strategy(
+    "cartesian",
+    lambda df_candidates, df_jobs, **_: cartesian_index_pairs(len(df_candidates), len(df_jobs)),
+    iter_blocks=_cartesian_blocks,
+)
+register_pairing_strategy(
+    "same_sector", same_sector_index_pairs,
+    estimate=lambda df_candidates, df_jobs, **_: hash_join_size(*_sector_keys(df_candidates, df_jobs)),
+)
+register_pairing_strategy(
+    "blocking", blocking_index_pairs,
+    estimate=lambda df_candidates, df_jobs, blocking_keys=None, **_: hash_join_size(
+        *_blocking_keys(df_candidates, df_jobs, blocking_keys)
+    ),
+)
+register_pairing_strategy("skill_blocking", _skill_blocking_pairs, estimate=_skill_blocking_estimate)
+register_pairing_strategy("lsh", _lsh_pairs, estimate=_lsh_estimate)
+
+
+def take_pairs(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, cand_idx: np.ndarray, job_idx: np.ndarray,
+               columns: List[str] | None = None) -> pd.DataFrame:
+    """
+    Construit les lignes de paires demandées (et seulement elles).
 
+    columns : colonnes à garder (None = toutes). Les colonnes présentes des deux
+    côtés sont suffixées _x / _y comme avec merge.
+    """
+    c_cols = [c for c in df_candidates.columns if columns is None or c in columns]
+    j_cols = [c for c in df_jobs.columns if columns is None or c in columns]
+    c = df_candidates[c_cols].iloc[cand_idx].reset_index(drop=True)
+    j = df_jobs[j_cols].iloc[job_idx].reset_index(drop=True)
+    common = set(c.columns) & set(j.columns)
+    if common:
+        c = c.rename(columns={k: f"{k}_x" for k in common})
+        j = j.rename(columns={k: f"{k}_y" for k in common})
+    return pd.concat([c, j], axis=1)
@@ -0,0 +1,98 @@
+# src/parallel.py
+from __future__ import annotations
+import atexit
+import os
+import pickle
+import tempfile
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+# Pool de processus partagé entre les appels à pipeline.run() : le coût de
+# démarrage des workers n'est payé qu'une fois par processus.
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        shutdown_pool()
+        _POOL = ProcessPoolExecutor(max_workers=workers)
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None:
+        _POOL.shutdown(wait=True, cancel_futures=True)
+    _POOL = None
+    _POOL_WORKERS = 0
+
+
+atexit.register(shutdown_pool)
+
+
+# ============================================================
+# État partagé d'un run (features, cache, ...)
+#
+# Sérialisé une seule fois par run dans un fichier temporaire, chargé une
+# fois par worker sous un jeton de run puis gardé jusqu'au run suivant :
+# les tâches n'envoient que leurs propres arguments (positions, lot). Le
+# pool reste celui de get_pool (pas de redémarrage par run).
+# ============================================================
+
+_SHARED: Dict[str, Any] = {}
+
+
+def _shared_state(token: str, path: str) -> Any:
+    if token not in _SHARED:
+        _SHARED.clear()  # état du run précédent
+        with open(path, "rb") as f:
+            _SHARED[token] = pickle.load(f)
+    return _SHARED[token]
+
+
+def _call_shared(fn: Callable, token: str, path: str, item):
+    return fn(_shared_state(token, path), item)
+
+
+def map_ordered(fn: Callable, items: Iterable, workers: int = 1, shared: Any = None) -> Iterator:
+    """
+    Équivalent de map(fn, items), réparti sur le pool si workers > 1.
+    shared non None : fn(shared, item), shared étant chargé une fois par
+    worker au lieu d'être sérialisé avec chaque item.
+
+    Les résultats sortent dans l'ordre des items. Au plus 2 × workers tâches
+    sont en vol, pour ne pas matérialiser tous les lots d'un coup.
+    """
+    if workers <= 1:
+        if shared is None:
+            yield from map(fn, items)
+        else:
+            yield from (fn(shared, item) for item in items)
+        return
+
+    pool = get_pool(workers)
+    task, prefix, path = fn, (), None
+    if shared is not None:
+        fd, path = tempfile.mkstemp(prefix="matching_shared_", suffix=".pkl")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(shared, f, protocol=pickle.HIGHEST_PROTOCOL)
+        task, prefix = _call_shared, (fn, uuid.uuid4().hex, path)
+
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(task, *prefix, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        if path is not None:
+            os.unlink(path)
@@ -1,32 +1,77 @@
 # src/pipeline.py
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import partial
+from itertools import count
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 import yaml
 
-from src.data_layer import prepare_data_layer
-from src.aggregate import WeightConfig, make_vector_score, select_output_columns, weighted_global_score
-from src.export import export_csv, export_json
+from src.data_layer import build_pairs_table, prepare_entities
+from src.pairing import iter_index_pairs, pairing_stats, take_pairs
+from src.lsh import LSHConfig
+from src.constraints import HardConstraints, build_constraint_filter
+from src.instrumentation import StageTimer, append_metrics, run_record
+from src.profiling import ProfileConfig, StageProfiler
+from src.aggregate import (
+    SUBSCORE_COLS,
+    WeightConfig,
+    decode_scores,
+    encode_scores,
+    global_score_array,
+    make_vector_score,
+    resolve_score_dtype,
+    select_output_columns,
+    weighted_global_score,
+)
+from src.export import (
+    CsvChunkWriter,
+    FeatherChunkWriter,
+    JsonChunkWriter,
+    NdjsonChunkWriter,
+    ParquetChunkWriter,
+)
+from src.parallel import map_ordered
+from src.shortlist import TopKPerJob
 
 # IMPORTANT:
 # adapte l'import suivant selon ton fichier réel (le README dit: src/scoring_engine/components/subscores.py)
 from src.scoring_engine.components.subscores import compute_subscores  # doit retourner df avec score_* colonnes
+from src.scoring_engine.components.subscores import compute_subscores_grid
+from src.scoring_engine.components.features import build_features, score_features
+from src.scoring_engine.components.cache import SubscoreCache
 
 
 @dataclass
 class PipelineConfig:
     pairing_mode: str = "cartesian"
+    min_shared_skills: int = 1  # pairing_mode "skill_blocking" : compétences communes minimum
+    blocking_keys: Optional[Dict[str, str]] = None  # pairing_mode "blocking" : colonne candidat -> colonne offre
+    lsh: LSHConfig = LSHConfig()  # pairing_mode "lsh" : MinHash / banding (voir src/lsh.py)
+    hard_constraints: HardConstraints = HardConstraints()  # filtres par offre avant scoring (src/constraints.py)
+    execution_mode: str = "pairs"  # "pairs" (table des paires) | "factorized" (grilles d'indices)
     batch_size: int = 200000
+    workers: int = 1  # > 1 : lots scorés en parallèle sur un pool de processus
+    top_k_per_job: Optional[int] = None  # shortlist bornée par offre (None = toutes les paires)
     export_dir: str = "results"
     export_format: List[str] = None
     keep_columns: List[str] = None
+    export_compression: Optional[str] = "zstd"  # parquet / feather
+    export_row_group_size: Optional[int] = None  # parquet (None = défaut pyarrow)
+    score_dtype: str = "float64"  # "float64" | "float32" | "uint8" (pas 1/255) | "uint16" (pas 1/1000)
+    metrics_file: Optional[str] = None  # JSON lines : une ligne de métriques par run (KPICalculator)
+    trace_memory: bool = False  # pic mémoire par étape via tracemalloc (coûteux : x2-x4 sur l'agrégation)
+    profile: ProfileConfig = ProfileConfig()  # cProfile + tracemalloc par étape, fichiers dans export_dir/profile
 
     scoring_mode: str = "weighted_subscores"  # ou "algo"
     algo_name: str = "TOPSIS"
+    skills_kernel: str = "auto"  # "auto" | "bitmap" | "sparse"
+    subscore_cache: Optional[str] = None  # fichier SQLite du cache de subscores (mode "pairs"), None = désactivé
+    subscore_cache_max_entries: int = 5_000_000
     weights: WeightConfig = WeightConfig()
+    profiles: Optional[List[WeightConfig]] = None  # profils "what-if" -> colonnes global_score_<nom>
 
     @staticmethod
     def from_yaml(path: str | Path) -> "PipelineConfig":
@@ -37,39 +82,187 @@ class PipelineConfig:
         p = raw.get("pipeline", {})
         s = raw.get("scoring", {})
 
-        weights_raw = s.get("weights", {}) or {}
-        w = WeightConfig(
-            skills=float(weights_raw.get("skills", 0.35)),
-            experience=float(weights_raw.get("experience", 0.20)),
-            education=float(weights_raw.get("education", 0.15)),
-            languages=float(weights_raw.get("languages", 0.15)),
-            sector=float(weights_raw.get("sector", 0.15)),
-        )
+        w = _weights_from_dict(s.get("weights", {}) or {})
+        profiles = [
+            _weights_from_dict(raw_w or {}, name=str(name)) for name, raw_w in (s.get("profiles") or {}).items()
+        ]
+
+        score_dtype = str(p.get("score_dtype", "float64"))
+        resolve_score_dtype(score_dtype)
 
         return PipelineConfig(
             pairing_mode=str(p.get("pairing_mode", "cartesian")),
+            min_shared_skills=int(p.get("min_shared_skills", 1)),
+            blocking_keys={str(k): str(v) for k, v in p["blocking_keys"].items()} if p.get("blocking_keys") else None,
+            lsh=_lsh_from_dict(p.get("lsh") or {}),
+            hard_constraints=HardConstraints.from_dict(p.get("hard_constraints") or {}),
+            execution_mode=str(p.get("execution_mode", "pairs")),
             batch_size=int(p.get("batch_size", 200000)),
+            workers=int(p.get("workers", 1) or 1),
+            top_k_per_job=int(p["top_k_per_job"]) if p.get("top_k_per_job") else None,
             export_dir=str(p.get("export_dir", "results")),
             export_format=list(p.get("export_format", ["csv"])),
             keep_columns=list(p.get("keep_columns", [])),
+            export_compression=p.get("export_compression", "zstd"),
+            export_row_group_size=int(p["export_row_group_size"]) if p.get("export_row_group_size") else None,
+            score_dtype=score_dtype,
+            metrics_file=p.get("metrics_file") or None,
+            trace_memory=bool(p.get("trace_memory", False)),
+            profile=ProfileConfig.from_dict(p.get("profile") or {}),
             scoring_mode=str(s.get("mode", "weighted_subscores")),
             algo_name=str(s.get("algo_name", "TOPSIS")),
+            skills_kernel=str(s.get("skills_kernel", "auto")),
+            subscore_cache=s.get("subscore_cache") or None,
+            subscore_cache_max_entries=int(s.get("subscore_cache_max_entries", 5_000_000)),
             weights=w,
+            profiles=profiles or None,
         )
 
 
-def _score_in_batches(pairs: pd.DataFrame, batch_size: int) -> pd.DataFrame:
+def _lsh_from_dict(raw: Dict[str, Any]) -> LSHConfig:
+    return LSHConfig(
+        bands=int(raw.get("bands", 32)),
+        rows=int(raw.get("rows", 4)),
+        top_k=int(raw["top_k"]) if raw.get("top_k") else None,
+        seed=int(raw.get("seed", 0)),
+    )
+
+
+def _weights_from_dict(weights_raw: Dict[str, Any], name: str = "default") -> WeightConfig:
+    return WeightConfig(
+        skills=float(weights_raw.get("skills", 0.35)),
+        experience=float(weights_raw.get("experience", 0.20)),
+        education=float(weights_raw.get("education", 0.15)),
+        languages=float(weights_raw.get("languages", 0.15)),
+        sector=float(weights_raw.get("sector", 0.15)),
+        name=name,
+    )
+
+
+def _score_in_batches(pairs: pd.DataFrame, batch_size: int, skills_kernel: str = "auto",
+                      workers: int = 1, cache: Optional[SubscoreCache] = None,
+                      score_dtype: str = "float64", profiler: Optional[StageProfiler] = None) -> pd.DataFrame:
+    score = partial(compute_subscores, skills_kernel=skills_kernel, cache=cache, score_dtype=score_dtype)
+    if profiler is not None and workers <= 1 and profiler.wants("subscoring_batch"):
+        score = _profiled_batches(score, profiler)
     if len(pairs) <= batch_size:
-        return compute_subscores(pairs)
+        return score(pairs)
+
+    chunks = (pairs.iloc[start:start + batch_size].copy() for start in range(0, len(pairs), batch_size))
+    if cache is not None and workers > 1:
+        # cache installé une fois par worker (une connexion SQLite), pas à chaque lot ;
+        # hits / misses des workers cumulés sur le cache du processus principal
+        score = partial(_score_cached_batch, skills_kernel=skills_kernel, score_dtype=score_dtype)
+        scored = []
+        for batch, hits, misses in map_ordered(score, chunks, workers, shared=cache):
+            scored.append(batch)
+            cache.hits += hits
+            cache.misses += misses
+    else:
+        scored = map_ordered(score, chunks, workers)
+    return pd.concat(list(scored), ignore_index=True)
+
+
+def _score_cached_batch(cache: SubscoreCache, batch: pd.DataFrame, **kwargs) -> Tuple[pd.DataFrame, int, int]:
+    hits, misses = cache.hits, cache.misses
+    scored = compute_subscores(batch, cache=cache, **kwargs)
+    return scored, cache.hits - hits, cache.misses - misses
+
+
+def _profiled_batches(score, profiler: StageProfiler):
+    # un profil par lot (subscoring_batch_0000, ...) ; en série uniquement
+    batch_ids = count()
+
+    def score_batch(batch: pd.DataFrame) -> pd.DataFrame:
+        with profiler.profile("subscoring_batch", f"subscoring_batch_{next(batch_ids):04d}"):
+            return score(batch)
+    return score_batch
+
+
+def _score_block(features, block, skills_kernel: str = "auto") -> Tuple[Any, Any, Dict[str, Any]]:
+    # exécuté dans un worker : features installées une fois par worker, seules les positions voyagent
+    (cand_features, job_features), (cand_idx, job_idx) = features, block
+    return cand_idx, job_idx, score_features(cand_features, job_features, cand_idx, job_idx, skills_kernel)
+
 
+def _iter_scored_blocks(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, cfg: PipelineConfig, features,
+                        counts: Optional[Dict[str, Any]] = None, timer: Optional[StageTimer] = None):
+    """
+    (cand_idx, job_idx, scores) par bloc, dans l'ordre des blocs, éventuellement en parallèle.
+    counts : dict optionnel, rempli avec les stats de pairing (paires émises vs cartésien).
+    timer : génération des blocs comptée dans l'étape "pairing", scoring dans "subscoring".
+    """
+    timer = timer or StageTimer(enabled=False)
+    with timer.stage("pairing", rows_in=len(df_candidates) * len(df_jobs)):
+        constraint_filter = build_constraint_filter(df_candidates, df_jobs, cfg.hard_constraints)
+    blocks = iter_index_pairs(
+        df_candidates, df_jobs, cfg.pairing_mode, cfg.batch_size,
+        min_shared_skills=cfg.min_shared_skills, lsh_config=cfg.lsh, constraint_filter=constraint_filter,
+        blocking_keys=cfg.blocking_keys,
+    )
+    blocks = timer.timed_iter("pairing", blocks, count=lambda b: len(b[0]))
+    score = partial(_score_block, skills_kernel=cfg.skills_kernel)
+    scored = (
+        (cand_idx, job_idx, pd.DataFrame({c: encode_scores(v, cfg.score_dtype) for c, v in scores.items()}))
+        for cand_idx, job_idx, scores in map_ordered(score, blocks, cfg.workers, shared=features)
+    )
+    n_pairs = 0
+    for cand_idx, job_idx, scores in timer.timed_iter("subscoring", scored, count=lambda b: len(b[0])):
+        n_pairs += len(cand_idx)
+        yield cand_idx, job_idx, scores
+    if counts is not None:
+        counts.update(mode=cfg.pairing_mode, **pairing_stats(len(df_candidates), len(df_jobs), n_pairs))
+        if constraint_filter is not None:
+            counts["hard_constraints"] = dict(constraint_filter.pruned)
+
+
+def _score_factorized(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, cfg: PipelineConfig,
+                      counts: Optional[Dict[str, Any]] = None, timer: Optional[StageTimer] = None) -> pd.DataFrame:
+    """
+    Mode factorisé : candidats et offres restent deux tables séparées, les
+    subscores sont calculés sur des blocs de positions (cand_idx, job_idx) et
+    seules les colonnes de sortie (keep_columns) sont matérialisées par paire.
+    Mémoire O(N + M + sortie) au lieu de O(N·M·largeur de ligne).
+    """
+    timer = timer or StageTimer(enabled=False)
+    # features parsées une seule fois par candidat / par offre (sortie de preprocess_*)
+    with timer.stage("features", rows_in=len(df_candidates) + len(df_jobs)):
+        features = build_features(df_candidates, df_jobs, normalized=True)
     chunks = []
-    for start in range(0, len(pairs), batch_size):
-        end = min(start + batch_size, len(pairs))
-        chunk = pairs.iloc[start:end].copy()
-        chunks.append(compute_subscores(chunk))
+    for cand_idx, job_idx, scores in _iter_scored_blocks(df_candidates, df_jobs, cfg, features, counts, timer):
+        rows = take_pairs(df_candidates, df_jobs, cand_idx, job_idx, columns=cfg.keep_columns or [])
+        chunks.append(pd.concat([rows, scores], axis=1))
+    if not chunks:
+        return take_pairs(df_candidates, df_jobs, [], [], columns=cfg.keep_columns or []).assign(
+            **{c: pd.Series(dtype=resolve_score_dtype(cfg.score_dtype)) for c in SUBSCORE_COLS}
+        )
     return pd.concat(chunks, ignore_index=True)
 
 
+def _score_top_k(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, cfg: PipelineConfig,
+                 counts: Optional[Dict[str, Any]] = None, timer: Optional[StageTimer] = None) -> pd.DataFrame:
+    """
+    Shortlist top-K par offre : les paires sont scorées par blocs et seul un
+    buffer de K meilleurs candidats par offre est conservé (mémoire O(offres × K)).
+    Les paires retenues sont rescorées à la fin pour construire la sortie.
+    """
+    timer = timer or StageTimer(enabled=False)
+    with timer.stage("features", rows_in=len(df_candidates) + len(df_jobs)):
+        features = build_features(df_candidates, df_jobs, normalized=True)
+    buffer = TopKPerJob(cfg.top_k_per_job, TopKPerJob.rank_ids(df_candidates["candidate_id"]))
+    for cand_idx, job_idx, scores in _iter_scored_blocks(df_candidates, df_jobs, cfg, features, counts, timer):
+        # classement sur le score global tel qu'il sera stocké (score_dtype) : les
+        # ex-aequo créés par la quantification sont départagés par candidate_id
+        stored = decode_scores(encode_scores(global_score_array(scores, cfg.weights), cfg.score_dtype))
+        buffer.update(cand_idx, job_idx, stored)
+
+    cand_idx, job_idx = buffer.result()
+    scores = compute_subscores_grid(df_candidates, df_jobs, cand_idx, job_idx, cfg.skills_kernel, features,
+                                    cfg.score_dtype)
+    rows = take_pairs(df_candidates, df_jobs, cand_idx, job_idx, columns=cfg.keep_columns or [])
+    return pd.concat([rows, scores], axis=1)
+
+
 def run(
     df_cv: pd.DataFrame,
     df_jobs: pd.DataFrame,
@@ -80,38 +273,222 @@ def run(
     API simple demandée: run(df_cv, df_jobs)
     Retour:
       - result_df : paires + subscores + global_score + vector_score
-      - meta      : quality_report + chemins exports éventuels
+      - meta      : quality_report + chemins exports éventuels + timings par étape
     """
     cfg = PipelineConfig.from_yaml(config_path)
+    profiler = _make_profiler(cfg)
+    timer = StageTimer(trace_memory=cfg.trace_memory, profiler=profiler).start()
+    try:
+        out, meta = _run(df_cv, df_jobs, cfg, export, timer)
+    except Exception as e:
+        if cfg.metrics_file:
+            append_metrics(cfg.metrics_file, run_record(timer.as_dict(), status="error", error=repr(e),
+                                                        mode=cfg.execution_mode, pairing_mode=cfg.pairing_mode))
+        raise
+    finally:
+        timer.stop()
+        profile_paths = profiler.close() if profiler is not None else None
 
-    # 1) data layer (validation + preprocess + pairing + quality)
-    pairs, qc_candidates, qc_jobs = prepare_data_layer(
-        df_cv,
-        df_jobs,
-        pairing_mode=cfg.pairing_mode,
-    )
+    if profile_paths is not None:
+        meta["profile"] = profile_paths
 
-    quality_report = {
-        "candidates": qc_candidates,
-        "jobs": qc_jobs
-    }
+    if cfg.metrics_file:
+        append_metrics(cfg.metrics_file, run_record(meta["timings"], meta["pairing"].get("pairs", len(out)),
+                                                    mode=cfg.execution_mode, pairing_mode=cfg.pairing_mode))
+    return out, meta
 
 
-    # 2) subscores (skills/exp/edu/lang/sector)
-    scored = _score_in_batches(pairs, cfg.batch_size)
+def _run(df_cv: pd.DataFrame, df_jobs: pd.DataFrame, cfg: PipelineConfig, export: bool,
+         timer: StageTimer) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    # 1) data layer (validation + preprocess + quality)
+    df_candidates, df_jobs_pp, qc_candidates, qc_jobs = prepare_entities(df_cv, df_jobs, timer)
 
-    # 3) aggregate
-    scored = make_vector_score(scored)
-    scored = weighted_global_score(scored, cfg.weights)
-    out = select_output_columns(scored, cfg.keep_columns)
+    # 2) pairing + subscores + 3) aggregate
+    meta: Dict[str, Any] = {"quality_report": {"candidates": qc_candidates, "jobs": qc_jobs}, "exports": {}}
+    out = score_entities(df_candidates, df_jobs_pp, cfg, timer, meta)
 
     # 4) export
-    meta: Dict[str, Any] = {"quality_report": quality_report, "exports": {}}
     if export:
-        export_dir = Path(cfg.export_dir)
-        if "csv" in (cfg.export_format or []):
-            meta["exports"]["csv"] = str(export_csv(out, export_dir / "pairs_scored.csv"))
-        if "json" in (cfg.export_format or []):
-            meta["exports"]["json"] = str(export_json(out, export_dir / "pairs_scored.json"))
+        with timer.stage("export", rows_in=len(out)) as st:
+            for fmt, writer in open_chunk_writers(cfg).items():
+                with writer:
+                    writer.write(out)
+                meta["exports"][fmt] = str(writer.path)
+            st.rows_out = len(out)
 
+    meta["timings"] = timer.as_dict()
     return out, meta
+
+
+def score_entities(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame, cfg: PipelineConfig,
+                   timer: Optional[StageTimer] = None, meta: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Pairing + subscores + agrégation de tables prétraitées (sortie de
+    prepare_entities), selon cfg : shortlist top_k_per_job, mode "factorized"
+    (grilles d'indices) ou "pairs" (table des paires, cache de subscores).
+    Point d'entrée commun de run() et run_incremental().
+
+    meta : dict optionnel, rempli avec "pairing" (et "subscore_cache" si configuré).
+    """
+    _check_subscore_cache(cfg)
+    timer = timer or StageTimer(enabled=False)
+    meta = meta if meta is not None else {}
+    pairing: Dict[str, Any] = {}
+    if cfg.top_k_per_job:
+        # shortlist par offre : toujours en mode factorisé, par blocs
+        with timer.stage("subscoring"):
+            scored = _score_top_k(df_candidates, df_jobs, cfg, pairing, timer)
+    elif cfg.execution_mode == "factorized":
+        with timer.stage("subscoring"):
+            scored = _score_factorized(df_candidates, df_jobs, cfg, pairing, timer)
+    else:
+        pairs = build_pairs_table(
+            df_candidates,
+            df_jobs,
+            pairing_mode=cfg.pairing_mode,
+            min_shared_skills=cfg.min_shared_skills,
+            lsh_config=cfg.lsh,
+            hard_constraints=cfg.hard_constraints,
+            blocking_keys=cfg.blocking_keys,
+            timer=timer,
+        )
+        pairing = pairs.attrs.get("pairing", {})
+
+        # subscores (skills/exp/edu/lang/sector), via le cache disque si configuré
+        cache = SubscoreCache(cfg.subscore_cache, cfg.subscore_cache_max_entries) if cfg.subscore_cache else None
+        try:
+            with timer.stage("subscoring", rows_in=len(pairs)) as st:
+                scored = _score_in_batches(pairs, cfg.batch_size, cfg.skills_kernel, cfg.workers, cache,
+                                           cfg.score_dtype, timer.profiler)
+                st.rows_out = len(scored)
+        finally:
+            if cache is not None:
+                cache.close()
+        if cache is not None:
+            meta["subscore_cache"] = {"hits": cache.hits, "misses": cache.misses}
+    meta["pairing"] = pairing
+
+    with timer.stage("aggregation", rows_in=len(scored)) as st:
+        out = _aggregate(scored, cfg)
+        st.rows_out = len(out)
+    return out
+
+
+def _check_subscore_cache(cfg: PipelineConfig) -> None:
+    # le cache n'est consulté que par compute_subscores (table des paires)
+    if cfg.subscore_cache and (cfg.execution_mode != "pairs" or cfg.top_k_per_job):
+        raise ValueError("subscore_cache is only supported with execution_mode 'pairs' and no top_k_per_job "
+                         f"(got execution_mode={cfg.execution_mode!r}, top_k_per_job={cfg.top_k_per_job!r})")
+
+
+def _make_profiler(cfg: PipelineConfig) -> Optional[StageProfiler]:
+    if not cfg.profile.enabled:
+        return None
+    return StageProfiler(cfg.profile, cfg.profile.output_dir or Path(cfg.export_dir) / "profile")
+
+
+def _aggregate(scored: pd.DataFrame, cfg: PipelineConfig) -> pd.DataFrame:
+    scored = make_vector_score(scored)
+    scored = weighted_global_score(scored, cfg.weights, cfg.score_dtype)
+    if cfg.profiles:
+        scored = weighted_global_score(scored, cfg.profiles, cfg.score_dtype)
+    return select_output_columns(scored, cfg.keep_columns)
+
+
+def open_chunk_writers(cfg: PipelineConfig) -> Dict[str, Any]:
+    """Un writer par format de export_format (fichiers results/pairs_scored.*)."""
+    export_dir = Path(cfg.export_dir)
+    factories = {
+        "csv": lambda: CsvChunkWriter(export_dir / "pairs_scored.csv"),
+        "json": lambda: JsonChunkWriter(export_dir / "pairs_scored.json", indent=2),
+        "json_compact": lambda: JsonChunkWriter(export_dir / "pairs_scored.min.json", indent=None),
+        "ndjson": lambda: NdjsonChunkWriter(export_dir / "pairs_scored.ndjson"),
+        "parquet": lambda: ParquetChunkWriter(
+            export_dir / "pairs_scored.parquet", cfg.export_compression, cfg.export_row_group_size
+        ),
+        "feather": lambda: FeatherChunkWriter(export_dir / "pairs_scored.feather", cfg.export_compression),
+    }
+    unknown = [f for f in (cfg.export_format or []) if f not in factories]
+    if unknown:
+        raise ValueError(f"Unknown export_format: {unknown}. Use one of {list(factories)}")
+    return {fmt: factories[fmt]() for fmt in factories if fmt in (cfg.export_format or [])}
+
+
+def run_streaming(
+    df_cv: pd.DataFrame,
+    df_jobs: pd.DataFrame,
+    config_path: str | Path = "config.yaml",
+    export: bool = True,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Variante de run() à mémoire bornée : génère les résultats par blocs de
+    batch_size paires. Chaque bloc est pairé, scoré, agrégé et écrit dans les
+    exports avant de passer au suivant ; seules les tables candidats / offres
+    prétraitées restent en mémoire.
+
+    La concaténation des blocs est identique au DataFrame de run() (même ordre
+    de paires). Toujours exécuté en mode factorisé ; avec top_k_per_job, la
+    shortlist (déjà bornée) est produite en un seul bloc.
+
+    meta : dict optionnel rempli avec quality_report et les chemins d'export
+    (les fichiers sont complets une fois le générateur épuisé).
+    """
+    cfg = PipelineConfig.from_yaml(config_path)
+    if cfg.subscore_cache:
+        raise ValueError("run_streaming does not support subscore_cache (always factorized, see execution_mode 'pairs')")
+    meta = meta if meta is not None else {}
+    profiler = _make_profiler(cfg)
+    timer = StageTimer(trace_memory=cfg.trace_memory, profiler=profiler).start()
+
+    df_candidates, df_jobs_pp, qc_candidates, qc_jobs = prepare_entities(df_cv, df_jobs, timer)
+    meta["quality_report"] = {"candidates": qc_candidates, "jobs": qc_jobs}
+    meta["exports"] = {}
+    meta["pairing"] = {}  # complété quand tous les blocs ont été générés
+
+    if cfg.top_k_per_job:
+        blocks = (_score_top_k(df_candidates, df_jobs_pp, cfg, meta["pairing"], timer) for _ in range(1))
+    else:
+        with timer.stage("features", rows_in=len(df_candidates) + len(df_jobs_pp)):
+            features = build_features(df_candidates, df_jobs_pp, normalized=True)
+        blocks = (
+            pd.concat([take_pairs(df_candidates, df_jobs_pp, ci, ji, columns=cfg.keep_columns or []), scores], axis=1)
+            for ci, ji, scores in _iter_scored_blocks(df_candidates, df_jobs_pp, cfg, features, meta["pairing"], timer)
+        )
+    blocks = timer.timed_iter("subscoring", blocks)
+
+    writers = open_chunk_writers(cfg) if export else {}
+    n_pairs = 0
+    try:
+        for scored in blocks:
+            with timer.stage("aggregation", rows_in=len(scored)) as st:
+                out = _aggregate(scored, cfg)
+                st.rows_out = len(out)
+            if writers:
+                with timer.stage("export", rows_in=len(out)) as st:
+                    for writer in writers.values():
+                        writer.write(out)
+                    st.rows_out = len(out)
+            n_pairs += len(out)
+            yield out
+    except Exception as e:
+        if cfg.metrics_file:
+            append_metrics(cfg.metrics_file, run_record(timer.as_dict(), status="error", error=repr(e),
+                                                        mode="streaming", pairing_mode=cfg.pairing_mode))
+        raise
+    else:
+        with timer.stage("export"):
+            for fmt, writer in writers.items():
+                meta["exports"][fmt] = str(writer.close())
+        writers = {}
+        # total : inclut le temps passé par l'appelant entre deux blocs
+        meta["timings"] = timer.as_dict()
+        if cfg.metrics_file:
+            append_metrics(cfg.metrics_file, run_record(meta["timings"], meta["pairing"].get("pairs", n_pairs),
+                                                        mode="streaming", pairing_mode=cfg.pairing_mode))
+    finally:
+        for fmt, writer in writers.items():
+            meta["exports"][fmt] = str(writer.close())
+        timer.stop()
+        if profiler is not None:
+            meta["profile"] = profiler.close()
@@ -1,16 +1,21 @@
 from __future__ import annotations
 import re
 import unicodedata
-from typing import Any, List
+from functools import lru_cache
+from typing import Any, Callable, List
+import numpy as np
 import pandas as pd
-import ast
-from .education import normalize_education
-from .languages import normalize_languages
-from .skills import normalize_skills
-from .sector import normalize_sector
+from .education import encode_education_column, normalize_education
+from .languages import LanguageRegistry, encode_languages_column, normalize_languages
+from .list_literal import parse_list_literal
+from .skills import normalize_single_skill
+from .sector import SectorRegistry, encode_sector_column, normalize_sector
 
 _SPLIT_PATTERN = re.compile(r"[;,|/]+")
 
+# taille max des caches LRU de normalisation des tokens
+NORMALIZE_CACHE_SIZE = 100_000
+
 def strip_accents(s: str) -> str:
     s = unicodedata.normalize("NFKD", s)
     return "".join(ch for ch in s if not unicodedata.combining(ch))
@@ -29,7 +34,7 @@ def to_list(x: Any) -> List[str]:
     Robust list parser:
     - list[str] -> normalize items
     - "a,b;c|d" -> split
-    - "['a','b']" -> parsed via ast.literal_eval
+    - "['a','b']" -> parsed via parse_list_literal
     - None/NaN -> []
     """
     if x is None or (isinstance(x, float) and pd.isna(x)):
@@ -47,7 +52,7 @@ def to_list(x: Any) -> List[str]:
         # try python-list-like string
         if (s.startswith("[") and s.endswith("]")) or (s.startswith("(") and s.endswith(")")):
             try:
-                parsed = ast.literal_eval(s)
+                parsed = parse_list_literal(s)
                 if isinstance(parsed, list):
                     items = parsed
                 else:
@@ -60,7 +65,7 @@ def to_list(x: Any) -> List[str]:
 
     normed = []
     for it in items:
-        t = normalize_text(it)
+        t = _normalize_token(it) if isinstance(it, str) else normalize_text(it)
         if t:
             normed.append(t)
 
@@ -73,38 +78,104 @@ def to_list(x: Any) -> List[str]:
     return out
 
 
-def preprocess_candidates(df: pd.DataFrame) -> pd.DataFrame:
+def skill_tokens(cell: Any) -> List[str]:
+    """Tokens d'une cellule compétences (pairing, LSH) : liste prétraitée telle quelle, sinon to_list."""
+    return cell if isinstance(cell, list) else to_list(cell)
+
+
+# ============================================================
+# Normalisation par valeurs distinctes
+#
+# Chaque colonne est factorisée : la normalisation tourne une fois par valeur
+# distincte (et une fois par token via des caches LRU bornés), puis le
+# résultat est diffusé aux lignes. Les cellules identiques partagent le même
+# objet liste en sortie.
+# ============================================================
+
+_normalize_token = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(normalize_text)
+_normalize_skill_token = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(normalize_single_skill)
+
+
+def _normalize_skill_list(items: List[str]) -> List[str]:
+    # même résultat que skills.normalize_skills sur une liste, tokens mis en cache
+    uniq, seen = [], set()
+    for it in items:
+        v = _normalize_skill_token(it) if isinstance(it, str) else normalize_single_skill(it)
+        if v and v not in seen:
+            seen.add(v)
+            uniq.append(v)
+    return uniq
+
+
+def _factorize(values: pd.Series):
+    try:
+        return pd.factorize(values, use_na_sentinel=False)
+    except TypeError:
+        # cellules non hashables (listes) : clé tuple, valeur de la première occurrence
+        keys = pd.Series([tuple(v) if isinstance(v, list) else v for v in values], dtype=object)
+        codes, _ = pd.factorize(keys, use_na_sentinel=False)
+        _, first = np.unique(codes, return_index=True)
+        return codes, values.iloc[first].tolist()
+
+
+def map_unique(values: pd.Series, fn: Callable[[Any], Any]):
+    """fn appliqué une fois par valeur distincte de `values`, diffusé à toutes les lignes."""
+    codes, uniques = _factorize(values)
+    results = np.empty(len(uniques), dtype=object)
+    results[:] = [fn(u) for u in uniques]
+    out = pd.Series(results[codes], index=values.index, dtype=object)
+    return out if len(results) and isinstance(results[0], list) else out.infer_objects()
+
+
+def _parse_skills(x: Any) -> List[str]:
+    return _normalize_skill_list(to_list(x))
+
+
+def _parse_languages(x: Any) -> List[str]:
+    return normalize_languages(to_list(x))
+
+
+def preprocess_candidates(df: pd.DataFrame, language_registry: LanguageRegistry | None = None,
+                          sector_registry: SectorRegistry | None = None) -> pd.DataFrame:
     out = df.copy()
     out["candidate_id"] = out["candidate_id"].astype(str)
 
     # skills -> parse list then normalize canonical skill ids
-    out["candidate_skills"] = out["candidate_skills"].apply(to_list).apply(normalize_skills)
+    out["candidate_skills"] = map_unique(out["candidate_skills"], _parse_skills)
 
     # languages -> parse list then normalize codes
-    out["languages"] = out["languages"].apply(to_list).apply(normalize_languages)
+    out["languages"] = map_unique(out["languages"], _parse_languages)
+    out["languages_mask"] = encode_languages_column(out["languages"], language_registry)
 
-    # education: keep normalized text and add numeric column
-    out["education_level"] = out["education_level"].apply(normalize_text)
-    out["education_level_num"] = out["education_level"].apply(normalize_education)
+    # education: keep normalized text, numeric column + code int16 du scoring
+    education = map_unique(out["education_level"], normalize_text)
+    out["education_level_num"] = map_unique(education, normalize_education)
+    out["education_level"] = education
+    out["education_level_code"] = encode_education_column(out["education_level"])
 
-    # sector -> canonical representation
-    out["sector"] = out["sector"].apply(normalize_sector)
+    # sector -> canonical representation + code du registre partagé
+    out["sector"] = map_unique(out["sector"], normalize_sector)
+    out["sector_code"] = encode_sector_column(out["sector"], sector_registry)
 
     out["years_experience"] = pd.to_numeric(out["years_experience"], errors="coerce").fillna(0.0)
     return out
 
-def preprocess_jobs(df: pd.DataFrame) -> pd.DataFrame:
+def preprocess_jobs(df: pd.DataFrame, language_registry: LanguageRegistry | None = None,
+                    sector_registry: SectorRegistry | None = None) -> pd.DataFrame:
     out = df.copy()
     out["job_id"] = out["job_id"].astype(str)
 
-    out["required_skills"] = out["required_skills"].apply(to_list).apply(normalize_skills)
-    out["required_languages"] = out["required_languages"].apply(to_list).apply(normalize_languages)
+    out["required_skills"] = map_unique(out["required_skills"], _parse_skills)
+    out["required_languages"] = map_unique(out["required_languages"], _parse_languages)
+    out["required_languages_mask"] = encode_languages_column(out["required_languages"], language_registry)
 
-    out["required_education"] = out["required_education"].apply(normalize_text)
-    out["required_education_num"] = out["required_education"].apply(normalize_education)
+    education = map_unique(out["required_education"], normalize_text)
+    out["required_education_num"] = map_unique(education, normalize_education)
+    out["required_education"] = education
+    out["required_education_code"] = encode_education_column(out["required_education"])
 
-    out["required_sector"] = out["required_sector"].apply(normalize_sector)
+    out["required_sector"] = map_unique(out["required_sector"], normalize_sector)
+    out["required_sector_code"] = encode_sector_column(out["required_sector"], sector_registry)
 
     out["min_experience"] = pd.to_numeric(out["min_experience"], errors="coerce").fillna(0.0)
     return out
-
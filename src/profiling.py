@@ -0,0 +1,195 @@
+from __future__ import annotations
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# ============================================================
+# Profilage à la demande (pipeline.profile)
+#
+# Les étapes sélectionnées (noms de meta["timings"], ou "subscoring_batch"
+# pour chaque lot de _score_in_batches) tournent sous cProfile + tracemalloc.
+# Par étape, dans <export_dir>/profile/<run_id>/ :
+#   <étape>.pstats      stats cProfile (snakeviz, pstats, gprof2dot, ...)
+#   <étape>.folded      piles "a;b;c poids_µs" pour flamegraph.pl / speedscope
+#   <étape>.txt         top_n fonctions (temps cumulé) + top_n sites d'allocation
+# Désactivé (défaut) : aucun profiler n'est créé, rien n'est ajouté au run.
+# ============================================================
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    enabled: bool = False
+    stages: Tuple[str, ...] = ()  # vide = toutes les étapes
+    top_n: int = 30
+    output_dir: Optional[str] = None  # None = <export_dir>/profile
+
+    @staticmethod
+    def from_dict(raw: Dict[str, Any]) -> "ProfileConfig":
+        stages = raw.get("stages") or ()
+        if isinstance(stages, str):
+            stages = (stages,)
+        return ProfileConfig(
+            enabled=bool(raw.get("enabled", False)),
+            stages=tuple(str(s) for s in stages),
+            top_n=int(raw.get("top_n", 30)),
+            output_dir=raw.get("output_dir") or None,
+        )
+
+
+@dataclass
+class _StageProfile:
+    profile: cProfile.Profile = field(default_factory=cProfile.Profile)
+    allocations: Dict[Tuple[str, int], List[int]] = field(default_factory=lambda: defaultdict(lambda: [0, 0]))
+    calls: int = 0
+
+
+class StageProfiler:
+    """
+    Profils cumulés par étape : une étape ouverte plusieurs fois (blocs) garde
+    un seul profil. Une étape imbriquée dans une étape déjà profilée n'est pas
+    profilée à part (elle figure dans le profil englobant).
+    """
+
+    def __init__(self, config: ProfileConfig, output_dir: str | Path, run_id: Optional[str] = None):
+        self.config = config
+        self.output_dir = Path(output_dir) / (run_id or time.strftime("%Y%m%d-%H%M%S"))
+        self._profiles: Dict[str, _StageProfile] = {}
+        self._active: Optional[str] = None
+
+    def wants(self, stage: str) -> bool:
+        return not self.config.stages or stage in self.config.stages
+
+    @contextmanager
+    def profile(self, stage: str, label: Optional[str] = None) -> Iterator[None]:
+        """Profile le bloc `with` si `stage` est sélectionnée ; label = nom des fichiers (défaut : stage)."""
+        if self._active is not None or not self.wants(stage):
+            yield
+            return
+
+        entry = self._profiles.setdefault(label or stage, _StageProfile())
+        owns_tracing = not tracemalloc.is_tracing()
+        if owns_tracing:
+            tracemalloc.start()
+        before = None if owns_tracing else tracemalloc.take_snapshot()
+        self._active = stage
+        entry.profile.enable()
+        try:
+            yield
+        finally:
+            entry.profile.disable()
+            self._active = None
+            after = tracemalloc.take_snapshot()
+            if owns_tracing:
+                tracemalloc.stop()
+            _add_allocations(entry.allocations, after, before)
+            entry.calls += 1
+
+    def close(self) -> Dict[str, Dict[str, str]]:
+        """Écrit les fichiers de chaque étape profilée -> {étape: {type: chemin}}."""
+        if not self._profiles:
+            return {}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for name, entry in self._profiles.items():
+            paths[name] = self._write(name, entry)
+        self._profiles = {}
+        return paths
+
+    def _write(self, name: str, entry: _StageProfile) -> Dict[str, str]:
+        base = self.output_dir / name
+        stats = pstats.Stats(entry.profile)
+        stats.dump_stats(f"{base}.pstats")
+        Path(f"{base}.folded").write_text(
+            "".join(f"{stack} {weight}\n" for stack, weight in folded_stacks(stats).items()), encoding="utf-8"
+        )
+        Path(f"{base}.txt").write_text(self._summary(name, entry), encoding="utf-8")
+        return {"pstats": f"{base}.pstats", "folded": f"{base}.folded", "summary": f"{base}.txt"}
+
+    def _summary(self, name: str, entry: _StageProfile) -> str:
+        top_n = self.config.top_n
+        buf = io.StringIO()
+        buf.write(f"# {name} ({entry.calls} appel(s))\n\n## Top {top_n} fonctions (temps cumulé)\n")
+        pstats.Stats(entry.profile, stream=buf).sort_stats("cumulative").print_stats(top_n)
+        buf.write(f"\n## Top {top_n} sites d'allocation (mémoire encore allouée en fin d'étape)\n")
+        sites = sorted(entry.allocations.items(), key=lambda kv: kv[1][0], reverse=True)[:top_n]
+        for (filename, lineno), (size, count) in sites:
+            buf.write(f"{size / 2**20:10.3f} MiB {count:10d} blocs  {filename}:{lineno}\n")
+        return buf.getvalue()
+
+
+def _add_allocations(out: Dict[Tuple[str, int], List[int]], after: tracemalloc.Snapshot,
+                     before: Optional[tracemalloc.Snapshot]) -> None:
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    after = after.filter_traces(filters)
+    if before is None:
+        stats = [(s.traceback[0], s.size, s.count) for s in after.statistics("lineno")]
+    else:
+        diff = after.compare_to(before.filter_traces(filters), "lineno")
+        stats = [(s.traceback[0], s.size_diff, s.count_diff) for s in diff if s.size_diff > 0]
+    for frame, size, count in stats:
+        acc = out[(frame.filename, frame.lineno)]
+        acc[0] += size
+        acc[1] += count
+
+
+# ============================================================
+# Piles "folded" à partir des stats cProfile
+#
+# cProfile ne garde que les arêtes appelant -> appelé. Les piles sont
+# reconstruites depuis les racines en répartissant le temps d'un appelé
+# entre ses appelants au prorata du temps cumulé de chaque arête :
+# approximation standard (comme flameprof), exacte quand chaque fonction
+# n'a qu'un appelant.
+# ============================================================
+
+_MAX_DEPTH = 64
+_MIN_WEIGHT_US = 1.0
+
+
+def _func_label(func) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        return name  # fonctions C : "<built-in method ...>"
+    return f"{Path(filename).name}:{lineno}({name})"
+
+
+def folded_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """{"racine;...;fonction": temps propre en µs} pour flamegraph.pl / speedscope."""
+    raw = stats.stats
+    children = defaultdict(list)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            if caller in raw:
+                children[caller].append((func, edge[3]))
+    roots = [f for f, v in raw.items() if not any(c in raw for c in v[4])]
+
+    out: Dict[str, float] = defaultdict(float)
+
+    def walk(func, path: List[str], on_path: set, share: float) -> None:
+        _, _, tt, ct, _ = raw[func]
+        own = tt * share * 1e6
+        if own >= _MIN_WEIGHT_US:
+            out[";".join(path)] += own
+        if len(path) >= _MAX_DEPTH:
+            return
+        for child, edge_ct in children[func]:
+            child_ct = raw[child][3]
+            if child in on_path or child_ct <= 0:
+                continue
+            child_share = share * edge_ct / child_ct
+            if child_ct * child_share * 1e6 < _MIN_WEIGHT_US:
+                continue
+            on_path.add(child)
+            walk(child, path + [_func_label(child)], on_path, child_share)
+            on_path.discard(child)
+
+    for root in roots:
+        walk(root, [_func_label(root)], {root}, 1.0)
+    return {stack: int(round(w)) for stack, w in out.items() if round(w) > 0}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Tuple
 import pandas as pd
 
 @dataclass(frozen=True)
@@ -10,6 +10,7 @@ class SchemaSpec:
     numeric_cols: List[str]
     text_cols: List[str]
     id_cols: List[str]
+    optional_cols: Tuple[str, ...] = ()  # lues si présentes (ex: contraintes dures par offre)
 
 CANDIDATE_SCHEMA = SchemaSpec(
     required_cols=[
@@ -39,6 +40,7 @@ JOB_SCHEMA = SchemaSpec(
     numeric_cols=["min_experience"],
     text_cols=["required_education", "required_sector"],
     id_cols=["job_id"],
+    optional_cols=("hard_min_education", "hard_mandatory_languages", "hard_max_experience_gap"),
 )
 
 class SchemaError(ValueError):
@@ -49,8 +51,8 @@ def validate_required_columns(df: pd.DataFrame, spec: SchemaSpec, df_name: str)
     if missing:
         raise SchemaError(f"{df_name}: missing required columns: {missing}")
 
-def coerce_numeric(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
-    out = df.copy()
+def coerce_numeric(df: pd.DataFrame, cols: List[str], inplace: bool = False) -> pd.DataFrame:
+    out = df if inplace else df.copy()
     for c in cols:
         out[c] = pd.to_numeric(out[c], errors="coerce")
     return out
@@ -61,10 +63,48 @@ def ensure_unique_ids(df: pd.DataFrame, id_col: str, df_name: str) -> None:
     if df[id_col].duplicated().any():
         raise SchemaError(f"{df_name}: id column '{id_col}' contains duplicates")
 
-def validate_and_coerce(df: pd.DataFrame, spec: SchemaSpec, df_name: str) -> pd.DataFrame:
+def validate_and_coerce(df: pd.DataFrame, spec: SchemaSpec, df_name: str, inplace: bool = False) -> pd.DataFrame:
     validate_required_columns(df, spec, df_name)
-    out = coerce_numeric(df, spec.numeric_cols)
+    out = coerce_numeric(df, spec.numeric_cols, inplace=inplace)
     for idc in spec.id_cols:
         ensure_unique_ids(out, idc, df_name)
     return out
 
+
+# ============================================================
+# Validation par chunks (lecture CSV en flux)
+# ============================================================
+
+def csv_dtypes(spec: SchemaSpec) -> Dict[str, str]:
+    """
+    dtypes explicites pour read_csv : seules les colonnes listes / texte sont
+    forcées en str. Ids et colonnes numériques restent inférés comme par
+    pd.read_csv (id "01" -> 1) ; une valeur numérique invalide donne une colonne
+    texte, convertie ensuite par coerce_numeric (-> NaN, comme validate_and_coerce).
+    """
+    return {c: "str" for c in [*spec.list_cols, *spec.text_cols]}
+
+
+class UniqueIdTracker:
+    """Unicité des ids vérifiée chunk par chunk (ids déjà vus gardés en mémoire)."""
+
+    def __init__(self, spec: SchemaSpec, df_name: str):
+        self.df_name = df_name
+        self._seen: Dict[str, set] = {c: set() for c in spec.id_cols}
+
+    def update(self, df: pd.DataFrame) -> None:
+        for idc, seen in self._seen.items():
+            ensure_unique_ids(df, idc, self.df_name)
+            ids = df[idc].tolist()
+            if not seen.isdisjoint(ids):
+                raise SchemaError(f"{self.df_name}: id column '{idc}' contains duplicates")
+            seen.update(ids)
+
+
+def validate_chunk(chunk: pd.DataFrame, spec: SchemaSpec, df_name: str, ids: UniqueIdTracker) -> pd.DataFrame:
+    """validate_and_coerce d'un chunk, en place, avec unicité des ids sur tous les chunks lus."""
+    validate_required_columns(chunk, spec, df_name)
+    coerce_numeric(chunk, spec.numeric_cols, inplace=True)
+    ids.update(chunk)
+    return chunk
+
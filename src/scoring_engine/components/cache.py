@@ -0,0 +1,211 @@
+from __future__ import annotations
+import hashlib
+import inspect
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from .columnar import factorize_cells
+
+
+# ============================================================
+# Cache disque des subscores (SQLite)
+#
+# Clé : (namespace, hash contenu candidat, hash contenu offre). Chaque
+# namespace (compute_subscores, evaluation.compute_subscores_df, ...) porte
+# une version = hash du code de scoring : si le code change, ses entrées
+# sont purgées à l'ouverture. Taille bornée, éviction LRU.
+# ============================================================
+
+SCORE_COLUMNS = ["score_skills", "score_experience", "score_education", "score_languages", "score_sector"]
+DEFAULT_MAX_ENTRIES = 5_000_000
+
+# code dont dépendent tous les subscores (fonctions scalaires + batch, normalisation / encodage)
+_SCORING_FILES = [
+    Path(__file__).with_name("subscores.py"),
+    Path(__file__).with_name("columnar.py"),
+    Path(__file__).with_name("features.py"),
+    Path(__file__).parents[2] / "education.py",
+    Path(__file__).parents[2] / "languages.py",
+    Path(__file__).parents[2] / "sector.py",
+    Path(__file__).parents[2] / "list_literal.py",
+]
+
+
+def code_version(fn: Callable) -> str:
+    """Hash du code de scoring + du module qui définit fn."""
+    h = hashlib.blake2b(digest_size=16)
+    files = list(_SCORING_FILES)
+    source = inspect.getsourcefile(fn)
+    if source and Path(source) not in files:
+        files.append(Path(source))
+    for path in files:
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def row_hashes(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """
+    Hash de contenu des colonnes `columns` pour chaque ligne. Les combinaisons
+    de valeurs sont factorisées d'abord : une table de paires N×M ne hache que
+    ses ~N + M lignes distinctes.
+    """
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=object)
+    codes, uniques = [], []
+    for c in columns:
+        values = df[c].to_numpy(dtype=object) if c in df.columns else np.full(n, None, dtype=object)
+        col_codes, col_uniques = factorize_cells(values)
+        codes.append(col_codes)
+        uniques.append(col_uniques)
+
+    combos, inverse = np.unique(np.column_stack(codes), axis=0, return_inverse=True)
+    digests = np.array([
+        hashlib.blake2b(repr(tuple(u[k] for u, k in zip(uniques, combo))).encode("utf-8"), digest_size=16).hexdigest()
+        for combo in combos
+    ], dtype=object)
+    return digests[inverse.reshape(-1)]
+
+
+class SubscoreCache:
+    def __init__(self, path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = int(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._checked: set = set()
+        # majorant du nombre d'entrées : COUNT(*) seulement quand il dépasse max_entries
+        self._rows: int | None = None
+        # BEGIN IMMEDIATE : verrou d'écriture pris d'emblée, sinon deux workers qui lisent
+        # puis écrivent se bloquent mutuellement (SQLITE_BUSY immédiat, sans attendre timeout)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level="IMMEDIATE")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS versions (ns TEXT PRIMARY KEY, version TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS subscores (
+                ns TEXT NOT NULL, c TEXT NOT NULL, j TEXT NOT NULL,
+                s0 REAL, s1 REAL, s2 REAL, s3 REAL, s4 REAL,
+                used INTEGER NOT NULL,
+                UNIQUE (ns, c, j)
+            );
+            CREATE INDEX IF NOT EXISTS subscores_used ON subscores (used);
+            """
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # picklable (pool de processus) : chaque worker rouvre sa propre connexion
+    def __getstate__(self):
+        return {"path": self.path, "max_entries": self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["max_entries"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _clock(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(MAX(used), 0) + 1 FROM subscores").fetchone()
+        return int(row[0])
+
+    def ensure_version(self, ns: str, version: str) -> None:
+        """Purge les entrées de ns si le code de scoring a changé."""
+        if (ns, version) in self._checked:
+            return
+        row = self._conn.execute("SELECT version FROM versions WHERE ns = ?", (ns,)).fetchone()
+        if row is None or row[0] != version:
+            with self._conn:
+                self._conn.execute("DELETE FROM subscores WHERE ns = ?", (ns,))
+                self._conn.execute("INSERT OR REPLACE INTO versions (ns, version) VALUES (?, ?)", (ns, version))
+            self._rows = None
+        self._checked.add((ns, version))
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM subscores").fetchone()[0])
+
+    def get_many(self, ns: str, cand_hashes: np.ndarray, job_hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(masque des hits, scores (n, 5)) ; les hits sont marqués récemment utilisés."""
+        n = len(cand_hashes)
+        found = np.zeros(n, dtype=bool)
+        values = np.zeros((n, len(SCORE_COLUMNS)), dtype=np.float64)
+        if n == 0:
+            return found, values
+
+        with self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS _keys (pos INTEGER, c TEXT, j TEXT)")
+            self._conn.execute("DELETE FROM _keys")
+            self._conn.executemany("INSERT INTO _keys VALUES (?, ?, ?)", zip(range(n), cand_hashes, job_hashes))
+            rows = self._conn.execute(
+                "SELECT k.pos, s.s0, s.s1, s.s2, s.s3, s.s4 FROM _keys k "
+                "JOIN subscores s ON s.ns = ? AND s.c = k.c AND s.j = k.j",
+                (ns,),
+            ).fetchall()
+            if rows:
+                self._conn.execute(
+                    "UPDATE subscores SET used = ? WHERE rowid IN ("
+                    " SELECT s.rowid FROM _keys k JOIN subscores s ON s.ns = ? AND s.c = k.c AND s.j = k.j)",
+                    (self._clock(), ns),
+                )
+            self._conn.execute("DELETE FROM _keys")
+
+        if rows:
+            arr = np.array(rows, dtype=np.float64)
+            pos = arr[:, 0].astype(np.int64)
+            found[pos] = True
+            values[pos] = arr[:, 1:]
+        return found, values
+
+    def put_many(self, ns: str, cand_hashes: np.ndarray, job_hashes: np.ndarray, values: np.ndarray) -> None:
+        if len(cand_hashes) == 0:
+            return
+        with self._conn:
+            if self._rows is None:
+                self._rows = len(self)
+            clock = self._clock()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO subscores (ns, c, j, s0, s1, s2, s3, s4, used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((ns, c, j, *map(float, v), clock) for c, j, v in zip(cand_hashes, job_hashes, values)),
+            )
+            # majorant (les REPLACE le surestiment) ; les écritures des autres processus sont vues au recomptage
+            self._rows += len(cand_hashes)
+            if self._rows <= self.max_entries:
+                return
+            self._rows = len(self)
+            excess = self._rows - self.max_entries
+            if excess > 0:
+                # LRU : les entrées utilisées le moins récemment partent en premier
+                self._conn.execute(
+                    "DELETE FROM subscores WHERE rowid IN (SELECT rowid FROM subscores ORDER BY used LIMIT ?)",
+                    (excess,),
+                )
+                self._rows = self.max_entries
+
+    def cached_scores(self, df: pd.DataFrame, cand_columns: List[str], job_columns: List[str],
+                      compute: Callable[[pd.DataFrame], Dict[str, np.ndarray]], ns: str,
+                      version: str) -> Dict[str, np.ndarray]:
+        """
+        Scores des lignes de df : lus en bloc dans le cache, compute() appelé
+        uniquement sur les lignes manquantes, puis écrites dans le cache.
+        """
+        self.ensure_version(ns, version)
+        cand_h = row_hashes(df, cand_columns)
+        job_h = row_hashes(df, job_columns)
+        found, values = self.get_many(ns, cand_h, job_h)
+
+        miss = np.flatnonzero(~found)
+        self.hits += len(df) - len(miss)
+        self.misses += len(miss)
+        if len(miss):
+            computed = compute(df.iloc[miss])
+            block = np.column_stack([np.asarray(computed[c], dtype=np.float64) for c in SCORE_COLUMNS])
+            values[miss] = block
+            self.put_many(ns, cand_h[miss], job_h[miss], block)
+        return {c: values[:, i] for i, c in enumerate(SCORE_COLUMNS)}
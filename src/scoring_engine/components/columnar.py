@@ -0,0 +1,344 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# Moteur colonnaire des subscores
+#
+# Les fonctions scalaires de subscores.py (skills_jaccard, experience_score, ...)
+# restent la référence. Ici on calcule les mêmes valeurs sur des tableaux NumPy
+# entiers : chaque cellule distincte n'est parsée qu'une fois, puis les scores
+# sont obtenus par gather sur des codes entiers.
+# ============================================================
+
+# ------------------------------------------------------------
+# Factorisation des cellules
+# ------------------------------------------------------------
+
+def factorize_cells(values) -> Tuple[np.ndarray, List]:
+    """
+    Retourne (codes, uniques) tels que values[i] "équivaut" à uniques[codes[i]].
+
+    - valeurs hashables : pd.factorize (None et NaN restent distincts car les
+      fonctions scalaires ne les traitent pas de la même façon)
+    - valeurs non hashables (listes) : dédoublonnage par identité d'objet, ce qui
+      suffit après un merge cartésien où chaque liste est partagée N ou M fois
+    """
+    arr = np.asarray(values, dtype=object) if not isinstance(values, np.ndarray) else values
+    n = len(arr)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), []
+
+    try:
+        codes, uniques = pd.factorize(arr, use_na_sentinel=True)
+    except TypeError:
+        ids = np.fromiter((id(v) for v in arr), dtype=np.uint64, count=n)
+        _, first, codes = np.unique(ids, return_index=True, return_inverse=True)
+        return codes.astype(np.int64, copy=False).reshape(-1), [arr[i] for i in first]
+
+    codes = np.asarray(codes, dtype=np.int64)
+    uniques = list(uniques)
+    missing = np.flatnonzero(codes < 0)
+    if missing.size:
+        slots: Dict[str, int] = {}
+        for i in missing:
+            v = arr[i]
+            key = type(v).__name__
+            if key not in slots:
+                slots[key] = len(uniques)
+                uniques.append(v)
+            codes[i] = slots[key]
+    return codes, uniques
+
+
+def map_cells(values, fn: Callable, dtype=np.float64) -> np.ndarray:
+    """Applique fn une seule fois par valeur distincte puis diffuse le résultat."""
+    codes, uniques = factorize_cells(values)
+    table = np.array([fn(u) for u in uniques], dtype=dtype)
+    if table.size == 0:
+        return np.zeros(len(codes), dtype=dtype)
+    return table[codes]
+
+
+def _py_float(x, default: float) -> float:
+    # même coercition que experience_score
+    if x is None:
+        return default
+    try:
+        return float(x)
+    except Exception:
+        return default
+
+
+def to_float_array(values, default: float = 0.0) -> np.ndarray:
+    """Coercition float identique au scalaire : None/erreur -> default, NaN conservé."""
+    if isinstance(values, pd.Series):
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            return values.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values.to_numpy(dtype=object)
+    return map_cells(values, lambda v: _py_float(v, default), dtype=np.float64)
+
+
+# ------------------------------------------------------------
+# Interning des listes de tokens
+# ------------------------------------------------------------
+
+def intern_token_lists(*groups: Sequence[Sequence[str]]) -> Tuple[Dict[str, int], List[List[np.ndarray]]]:
+    """
+    Construit un vocabulaire partagé et convertit chaque liste en tableau d'ids
+    uniques (les doublons disparaissent, comme avec set()).
+    """
+    vocab: Dict[str, int] = {}
+    out: List[List[np.ndarray]] = []
+    for group in groups:
+        converted = []
+        for items in group:
+            ids = {vocab.setdefault(t, len(vocab)) for t in items}
+            converted.append(np.fromiter(ids, dtype=np.int64, count=len(ids)))
+        out.append(converted)
+    return vocab, out
+
+
+def flatten_id_lists(id_lists: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Listes d'ids -> (indptr, ids) au format CSR."""
+    lengths = np.fromiter((len(x) for x in id_lists), dtype=np.int64, count=len(id_lists))
+    indptr = np.zeros(len(id_lists) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    ids = np.concatenate(id_lists).astype(np.int64, copy=False) if lengths.sum() else np.zeros(0, dtype=np.int64)
+    return indptr, ids
+
+
+def pack_bitsets_flat(indptr: np.ndarray, ids: np.ndarray, vocab_size: int) -> np.ndarray:
+    """Encode des ensembles (indptr, ids) en bitmaps denses (n_sets, n_words) de uint64."""
+    n_words = max(1, (vocab_size + 63) // 64)
+    bits = np.zeros((len(indptr) - 1, n_words), dtype=np.uint64)
+    if len(ids) == 0:
+        return bits
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    ids = np.asarray(ids, dtype=np.int64)
+    np.bitwise_or.at(bits, (rows, ids // 64), np.left_shift(np.uint64(1), (ids % 64).astype(np.uint64)))
+    return bits
+
+
+def pack_bitsets(id_lists: Sequence[np.ndarray], vocab_size: int) -> np.ndarray:
+    """Encode chaque ensemble d'ids en bitmap dense (n_sets, n_words) de uint64."""
+    return pack_bitsets_flat(*flatten_id_lists(id_lists), vocab_size)
+
+
+if hasattr(np, "bitwise_count"):
+    def popcount(a: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(a)
+else:  # numpy < 2.0
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(a: np.ndarray) -> np.ndarray:
+        a = np.ascontiguousarray(a)
+        return _POPCOUNT_TABLE[a.view(np.uint8)].reshape(a.shape + (a.itemsize,)).sum(axis=-1, dtype=np.uint8)
+
+
+def bitset_intersections(bits_a: np.ndarray, codes_a: np.ndarray, bits_b: np.ndarray, codes_b: np.ndarray) -> np.ndarray:
+    """|A ∩ B| pour chaque paire (codes_a[i], codes_b[i])."""
+    inter = np.zeros(len(codes_a), dtype=np.int64)
+    for w in range(bits_a.shape[1]):
+        inter += popcount(bits_a[codes_a, w] & bits_b[codes_b, w])
+    return inter
+
+
+# ------------------------------------------------------------
+# Matrices d'incidence creuses (CSR)
+# ------------------------------------------------------------
+
+SET_KERNELS = ("auto", "bitmap", "sparse")
+
+# Au-delà de ce vocabulaire, un bitmap dense coûte plus d'octets par ensemble
+# que la liste d'indices CSR et le popcount parcourt surtout des mots vides.
+BITMAP_MAX_VOCAB = 512
+
+# Nombre maximal de cellules (lignes A × lignes B) matérialisées par bloc
+SPARSE_BLOCK_CELLS = 4_000_000
+
+
+def _sparse_available() -> bool:
+    try:
+        import scipy.sparse  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_set_kernel(kernel: str, vocab_size: int) -> str:
+    if kernel not in SET_KERNELS:
+        raise ValueError(f"Unknown skills kernel: {kernel!r} (expected one of {SET_KERNELS})")
+    if kernel == "auto":
+        if vocab_size > BITMAP_MAX_VOCAB and _sparse_available():
+            return "sparse"
+        return "bitmap"
+    return kernel
+
+
+def incidence_csr_flat(indptr: np.ndarray, ids: np.ndarray, vocab_size: int):
+    """Matrice d'incidence (n_sets, vocab_size) au format CSR, valeurs à 1."""
+    from scipy import sparse
+
+    data = np.ones(len(ids), dtype=np.int32)
+    return sparse.csr_matrix((data, ids, indptr), shape=(len(indptr) - 1, max(vocab_size, 1)))
+
+
+def incidence_csr(id_lists: Sequence[np.ndarray], vocab_size: int):
+    """Matrice d'incidence (n_sets, vocab_size) au format CSR, valeurs à 1."""
+    return incidence_csr_flat(*flatten_id_lists(id_lists), vocab_size)
+
+
+def sparse_intersections(mat_a, codes_a: np.ndarray, mat_b, codes_b: np.ndarray,
+                         block_cells: int = SPARSE_BLOCK_CELLS) -> np.ndarray:
+    """
+    |A ∩ B| pour chaque paire : les intersections d'un bloc de lignes de A avec
+    toutes les lignes de B sortent d'un seul produit creux A_bloc · Bᵀ.
+    """
+    inter = np.zeros(len(codes_a), dtype=np.int64)
+    n_a, n_b = mat_a.shape[0], mat_b.shape[0]
+    if n_a == 0 or n_b == 0 or len(codes_a) == 0:
+        return inter
+
+    mat_bt = mat_b.T.tocsc()
+    order = np.argsort(codes_a, kind="stable")
+    sorted_a = codes_a[order]
+    block_rows = max(1, block_cells // n_b)
+    for r0 in range(0, n_a, block_rows):
+        r1 = min(r0 + block_rows, n_a)
+        lo, hi = np.searchsorted(sorted_a, [r0, r1])
+        if lo == hi:
+            continue
+        counts = (mat_a[r0:r1] @ mat_bt).toarray()
+        idx = order[lo:hi]
+        inter[idx] = counts[codes_a[idx] - r0, codes_b[idx]]
+    return inter
+
+
+# ------------------------------------------------------------
+# Noyaux vectorisés (mêmes formules que les fonctions scalaires)
+# ------------------------------------------------------------
+
+def _py_clamp01(x: np.ndarray) -> np.ndarray:
+    # max(0.0, min(1.0, x)) en Python renvoie 1.0 quand x est NaN
+    return np.where(np.isnan(x), 1.0, np.clip(x, 0.0, 1.0))
+
+
+def jaccard_from_counts(inter: np.ndarray, size_a: np.ndarray, size_b: np.ndarray) -> np.ndarray:
+    union = size_a + size_b - inter
+    out = np.zeros(len(inter), dtype=np.float64)
+    ok = (size_a > 0) & (size_b > 0)
+    out[ok] = inter[ok] / union[ok]
+    return out
+
+
+def languages_from_counts(inter: np.ndarray, size_a: np.ndarray, size_b: np.ndarray) -> np.ndarray:
+    out = np.where(size_b == 0, 1.0, 0.0)
+    ok = (size_b > 0) & (size_a > 0)
+    out[ok] = inter[ok] / size_b[ok]
+    return out
+
+
+def _pow_exact(x: np.ndarray, exponent: float) -> np.ndarray:
+    # np.power (SIMD) peut différer d'1 ulp de pow() de la libm utilisé par Python :
+    # on évalue la puissance une seule fois par valeur distincte avec Python.
+    uniq, inverse = np.unique(x, return_inverse=True)
+    table = np.array([u ** exponent for u in uniq.tolist()], dtype=np.float64)
+    return table[inverse.reshape(-1)]
+
+
+def experience_score_batch(cand: np.ndarray, job: np.ndarray) -> np.ndarray:
+    cand = np.asarray(cand, dtype=np.float64)
+    job = np.asarray(job, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        no_req = job <= 0.0
+        above = cand >= job
+        ratio = np.where(job > 0, cand / job, 0.0)
+        raw = np.where(no_req, cand / 2.0, np.where(above, cand / (job + 2.0), _pow_exact(ratio, 1.5)))
+    return _py_clamp01(raw)
+
+
+def education_score_batch(cand: np.ndarray, job: np.ndarray) -> np.ndarray:
+    cand = np.asarray(cand, dtype=np.int64)
+    job = np.asarray(job, dtype=np.int64)
+    job = np.where(job <= 0, 1, job)
+    ratio = cand / job
+    out = np.where(cand >= job, 1.0, np.clip(ratio * ratio, 0.0, 1.0))
+    return np.where(cand <= 0, 0.0, out)
+
+
+def sector_score_batch(cand_codes: np.ndarray, cand_present: np.ndarray,
+                       job_codes: np.ndarray, job_present: np.ndarray) -> np.ndarray:
+    out = np.where(cand_codes == job_codes, 1.0, 0.5)
+    return np.where(cand_present & job_present, out, 0.0)
+
+
+# ------------------------------------------------------------
+# Helpers de colonnes
+# ------------------------------------------------------------
+
+def list_column_features(values, parse: Callable) -> Tuple[np.ndarray, List[List[str]]]:
+    """Parse chaque cellule distincte une seule fois -> (codes, listes nettoyées)."""
+    codes, uniques = factorize_cells(values)
+    # même filtrage que _safe_list : éléments non vides convertis en str
+    lists = [[str(i) for i in parse(u) if i] for u in uniques]
+    return codes, lists
+
+
+def set_overlap_counts(values_a, values_b, parse: Callable, kernel: str = "bitmap",
+                       idx_a: np.ndarray | None = None,
+                       idx_b: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Retourne (|A ∩ B|, |A|, |B|) paire par paire pour deux colonnes de listes.
+
+    kernel : "bitmap" (popcount sur bitmaps denses), "sparse" (produit de
+    matrices CSR) ou "auto" (choix selon la taille du vocabulaire).
+    idx_a / idx_b : positions des paires dans values_a / values_b (mode factorisé).
+    Sans index, values_a[i] et values_b[i] forment la paire i.
+    """
+    codes_a, lists_a = list_column_features(values_a, parse)
+    codes_b, lists_b = list_column_features(values_b, parse)
+    if idx_a is not None:
+        codes_a = codes_a[idx_a]
+    if idx_b is not None:
+        codes_b = codes_b[idx_b]
+    vocab, (ids_a, ids_b) = intern_token_lists(lists_a, lists_b)
+
+    size_a = np.fromiter((len(x) for x in ids_a), dtype=np.int64, count=len(ids_a))
+    size_b = np.fromiter((len(x) for x in ids_b), dtype=np.int64, count=len(ids_b))
+    if len(codes_a) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    if resolve_set_kernel(kernel, len(vocab)) == "sparse":
+        mat_a = incidence_csr(ids_a, len(vocab))
+        mat_b = incidence_csr(ids_b, len(vocab))
+        inter = sparse_intersections(mat_a, codes_a, mat_b, codes_b)
+    else:
+        bits_a = pack_bitsets(ids_a, len(vocab))
+        bits_b = pack_bitsets(ids_b, len(vocab))
+        inter = bitset_intersections(bits_a, codes_a, bits_b, codes_b)
+    return inter, size_a[codes_a], size_b[codes_b]
+
+
+def sector_codes(values_a, values_b,
+                 idx_a: np.ndarray | None = None,
+                 idx_b: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Codes entiers partagés (sur str(x)) + masque "valeur truthy" comme sector_score."""
+    codes_a, uniq_a = factorize_cells(values_a)
+    codes_b, uniq_b = factorize_cells(values_b)
+    if idx_a is not None:
+        codes_a = codes_a[idx_a]
+    if idx_b is not None:
+        codes_b = codes_b[idx_b]
+    table: Dict[str, int] = {}
+    map_a = np.array([table.setdefault(str(u), len(table)) for u in uniq_a], dtype=np.int64)
+    map_b = np.array([table.setdefault(str(u), len(table)) for u in uniq_b], dtype=np.int64)
+    truthy_a = np.array([bool(u) for u in uniq_a], dtype=bool)
+    truthy_b = np.array([bool(u) for u in uniq_b], dtype=bool)
+    if len(codes_a) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, np.zeros(0, dtype=bool), empty, np.zeros(0, dtype=bool)
+    return map_a[codes_a], truthy_a[codes_a], map_b[codes_b], truthy_b[codes_b]
@@ -0,0 +1,268 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+
+from .columnar import (
+    bitset_intersections,
+    education_score_batch,
+    experience_score_batch,
+    factorize_cells,
+    popcount,
+    incidence_csr_flat,
+    jaccard_from_counts,
+    languages_from_counts,
+    map_cells,
+    pack_bitsets_flat,
+    resolve_set_kernel,
+    sector_score_batch,
+    sparse_intersections,
+    to_float_array,
+)
+from .subscores import SUBSCORE_COLUMNS
+from src.education import education_code
+from src.languages import LanguageRegistry, masks_to_words
+from src.list_literal import parse_list_cell
+
+
+# ============================================================
+# Features d'entités pré-parsées
+#
+# Construites une fois par candidat et une fois par offre, puis passées au
+# scoring : plus aucun parsing de chaîne au niveau des paires.
+# ============================================================
+
+CANDIDATE_FEATURE_COLUMNS = {
+    "skills": "candidate_skills",
+    "languages": "languages",
+    "languages_mask": "languages_mask",
+    "experience": "years_experience",
+    "education": "education_level",
+    "education_code": "education_level_code",
+    "sector": "sector",
+    "sector_code": "sector_code",
+}
+
+JOB_FEATURE_COLUMNS = {
+    "skills": "required_skills",
+    "languages": "required_languages",
+    "languages_mask": "required_languages_mask",
+    "experience": "min_experience",
+    "education": "required_education",
+    "education_code": "required_education_code",
+    "sector": "required_sector",
+    "sector_code": "required_sector_code",
+}
+
+
+@dataclass
+class FeatureVocabulary:
+    """Dictionnaires partagés candidats/offres : token -> id entier."""
+    skills: Dict[str, int] = field(default_factory=dict)
+    # utilisé seulement si les tables n'ont pas de colonne *_languages_mask
+    languages: LanguageRegistry = field(default_factory=lambda: LanguageRegistry(codes=[]))
+    # utilisé seulement sans colonnes *_sector_code (sinon codes du registre secteur du run)
+    sectors: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class TokenSets:
+    """Ensembles de tokens internés, au format CSR (indptr, ids)."""
+    indptr: np.ndarray
+    ids: np.ndarray
+    _cache: Dict[Tuple[str, int], object] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def bitsets(self, vocab_size: int) -> np.ndarray:
+        key = ("bitmap", vocab_size)
+        if key not in self._cache:
+            self._cache[key] = pack_bitsets_flat(self.indptr, self.ids, vocab_size)
+        return self._cache[key]
+
+    def csr(self, vocab_size: int):
+        key = ("sparse", vocab_size)
+        if key not in self._cache:
+            self._cache[key] = incidence_csr_flat(self.indptr, self.ids, vocab_size)
+        return self._cache[key]
+
+
+@dataclass
+class EntityFeatures:
+    """Features typées d'une table de candidats ou d'offres (une ligne par entité)."""
+    skills: TokenSets
+    languages: np.ndarray       # (n, n_words) uint64, bitmask des codes langue
+    experience: np.ndarray      # float64
+    education: np.ndarray       # entiers, même conversion que education_code
+    sector: np.ndarray          # entiers, code du registre secteur ou vocab.sectors
+    sector_present: np.ndarray  # bool, valeur "truthy" comme dans sector_score
+    vocab: FeatureVocabulary
+
+    def __len__(self) -> int:
+        return len(self.experience)
+
+
+def _is_normalized_list_column(values: pd.Series) -> bool:
+    # sortie de preprocess_* : listes Python de tokens str non vides et sans espaces de bord
+    return all(
+        type(v) is list and all(type(t) is str and t and t == t.strip() for t in v)
+        for v in values
+    )
+
+
+def _intern_sets(values: pd.Series, vocab: Dict[str, int], normalized: bool) -> TokenSets:
+    if normalized:
+        # chemin rapide : aucune conversion de chaîne, uniquement l'interning
+        cells = values.tolist()
+        codes = np.arange(len(cells))
+    else:
+        codes, uniques = factorize_cells(values.to_numpy(dtype=object))
+        cells = [[str(i) for i in parse_list_cell(u) if i] for u in uniques]
+
+    per_cell = []
+    for items in cells:
+        ids = {vocab.setdefault(t, len(vocab)) for t in items if t}
+        per_cell.append(sorted(ids))
+
+    lengths = np.fromiter((len(per_cell[c]) for c in codes), dtype=np.int64, count=len(codes))
+    indptr = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    flat = [i for c in codes for i in per_cell[c]]
+    ids = np.array(flat, dtype=np.int64) if flat else np.zeros(0, dtype=np.int64)
+    return TokenSets(indptr=indptr, ids=ids)
+
+
+def _language_masks(df: pd.DataFrame, columns: Dict[str, str], vocab: FeatureVocabulary,
+                    normalized: bool) -> np.ndarray:
+    mask_col = columns["languages_mask"]
+    if normalized and mask_col in df.columns:
+        # bitmask calculé au prétraitement (registre de langues du run)
+        return masks_to_words(df[mask_col].to_numpy())
+    codes, uniques = factorize_cells(_column(df, columns["languages"]).to_numpy(dtype=object))
+    if normalized:
+        table = [vocab.languages.encode(u) for u in uniques]
+    else:
+        table = [vocab.languages.encode([str(i) for i in parse_list_cell(u) if i]) for u in uniques]
+    masks = np.array([table[c] for c in codes], dtype=object)
+    return masks_to_words(masks)
+
+
+def _pad_words(words: np.ndarray, n_words: int) -> np.ndarray:
+    if words.shape[1] == n_words:
+        return words
+    out = np.zeros((words.shape[0], n_words), dtype=np.uint64)
+    out[:, :words.shape[1]] = words
+    return out
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _sector_features(df: pd.DataFrame, columns: Dict[str, str], vocab: FeatureVocabulary,
+                     use_codes: bool) -> Tuple[np.ndarray, np.ndarray]:
+    if use_codes:
+        codes = df[columns["sector_code"]].to_numpy()
+        return codes, codes != 0
+    sector_codes_, sector_uniques = factorize_cells(_column(df, columns["sector"]).to_numpy(dtype=object))
+    if not len(sector_uniques):
+        return np.zeros(len(df), dtype=np.int64), np.zeros(len(df), dtype=bool)
+    sector_table = np.array([vocab.sectors.setdefault(str(u), len(vocab.sectors)) for u in sector_uniques], dtype=np.int64)
+    sector_truthy = np.array([bool(u) for u in sector_uniques], dtype=bool)
+    return sector_table[sector_codes_], sector_truthy[sector_codes_]
+
+
+def build_entity_features(df: pd.DataFrame, columns: Dict[str, str], vocab: FeatureVocabulary,
+                          normalized: bool | None = None, sector_codes: bool | None = None) -> EntityFeatures:
+    """
+    Construit les features d'une table d'entités.
+
+    normalized : True si les colonnes listes sortent de preprocess_* (listes de
+    tokens normalisés) -> chemin rapide sans parsing. None = détection auto.
+    sector_codes : utiliser la colonne de codes secteur du prétraitement (doit
+    valoir la même chose pour les deux tables). None = si la colonne existe.
+    """
+    skills = _column(df, columns["skills"])
+    languages = _column(df, columns["languages"])
+    if normalized is None:
+        normalized = _is_normalized_list_column(skills) and _is_normalized_list_column(languages)
+    if sector_codes is None:
+        sector_codes = columns["sector_code"] in df.columns
+
+    if columns["education_code"] in df.columns:
+        education = df[columns["education_code"]].to_numpy()
+    else:
+        education = map_cells(_column(df, columns["education"]).to_numpy(dtype=object), education_code, dtype=np.int64)
+    sector, sector_present = _sector_features(df, columns, vocab, sector_codes)
+
+    return EntityFeatures(
+        skills=_intern_sets(skills, vocab.skills, normalized),
+        languages=_language_masks(df, columns, vocab, normalized),
+        experience=to_float_array(_column(df, columns["experience"])),
+        education=education,
+        sector=sector,
+        sector_present=sector_present,
+        vocab=vocab,
+    )
+
+
+def build_features(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame,
+                   normalized: bool | None = None) -> Tuple[EntityFeatures, EntityFeatures]:
+    """Features candidats + offres sur un vocabulaire partagé (une seule fois par run)."""
+    vocab = FeatureVocabulary()
+    sector_codes = (CANDIDATE_FEATURE_COLUMNS["sector_code"] in df_candidates.columns
+                    and JOB_FEATURE_COLUMNS["sector_code"] in df_jobs.columns)
+    cand = build_entity_features(df_candidates, CANDIDATE_FEATURE_COLUMNS, vocab, normalized, sector_codes)
+    job = build_entity_features(df_jobs, JOB_FEATURE_COLUMNS, vocab, normalized, sector_codes)
+    # masques de langues sur le même nombre de mots des deux côtés
+    n_words = max(cand.languages.shape[1], job.languages.shape[1])
+    cand.languages = _pad_words(cand.languages, n_words)
+    job.languages = _pad_words(job.languages, n_words)
+    return cand, job
+
+
+def _overlap(a: TokenSets, b: TokenSets, vocab_size: int, cand_idx: np.ndarray, job_idx: np.ndarray,
+             kernel: str) -> np.ndarray:
+    if resolve_set_kernel(kernel, vocab_size) == "sparse":
+        return sparse_intersections(a.csr(vocab_size), cand_idx, b.csr(vocab_size), job_idx)
+    return bitset_intersections(a.bitsets(vocab_size), cand_idx, b.bitsets(vocab_size), job_idx)
+
+
+def score_features(cand: EntityFeatures, job: EntityFeatures, cand_idx: np.ndarray, job_idx: np.ndarray,
+                   skills_kernel: str = "auto") -> Dict[str, np.ndarray]:
+    """Les 5 subscores des paires (cand_idx[i], job_idx[i]) à partir des features."""
+    cand_idx = np.asarray(cand_idx, dtype=np.int64)
+    job_idx = np.asarray(job_idx, dtype=np.int64)
+    vocab = cand.vocab
+
+    scores = {}
+    inter = _overlap(cand.skills, job.skills, len(vocab.skills), cand_idx, job_idx, skills_kernel)
+    scores["score_skills"] = jaccard_from_counts(inter, cand.skills.sizes[cand_idx], job.skills.sizes[job_idx])
+
+    scores["score_experience"] = experience_score_batch(cand.experience[cand_idx], job.experience[job_idx])
+    scores["score_education"] = education_score_batch(cand.education[cand_idx], job.education[job_idx])
+
+    # popcount(cand & job) / popcount(job), mot par mot
+    cand_lang = cand.languages[cand_idx]
+    job_lang = job.languages[job_idx]
+    inter = popcount(cand_lang & job_lang).sum(axis=1, dtype=np.int64)
+    scores["score_languages"] = languages_from_counts(
+        inter, popcount(cand_lang).sum(axis=1, dtype=np.int64), popcount(job_lang).sum(axis=1, dtype=np.int64)
+    )
+
+    scores["score_sector"] = sector_score_batch(
+        cand.sector[cand_idx], cand.sector_present[cand_idx], job.sector[job_idx], job.sector_present[job_idx]
+    )
+
+    # Clamp sécurité [0,1]
+    for c in SUBSCORE_COLUMNS:
+        scores[c] = np.clip(np.nan_to_num(scores[c], nan=0.0), 0.0, 1.0)
+    return scores
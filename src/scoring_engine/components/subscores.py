@@ -1,9 +1,25 @@
 from __future__ import annotations
 from typing import List, Iterable
-import math
-import ast
+import numpy as np
 import pandas as pd
 
+from .columnar import (
+    education_score_batch,
+    experience_score_batch,
+    jaccard_from_counts,
+    languages_from_counts,
+    map_cells,
+    popcount,
+    sector_codes,
+    sector_score_batch,
+    set_overlap_counts,
+    to_float_array,
+)
+from src.aggregate import encode_scores
+from src.education import education_code
+from src.languages import masks_to_words
+from src.list_literal import parse_list_cell
+
 
 # ============================================================
 # ------------------ UTILITAIRES INTERNES --------------------
@@ -17,57 +33,9 @@ def _safe_list(x) -> List[str]:
     return [str(x)]
 
 
-def _parse_list_cell(x) -> List[str]:
-    """
-    Convertit:
-      - "['a','b']" -> ['a','b']
-      - ['a','b']   -> ['a','b']
-      - None/NaN    -> []
-      - "a"         -> ['a']
-    """
-    if x is None:
-        return []
-    if isinstance(x, float) and math.isnan(x):
-        return []
-    if isinstance(x, list):
-        return [str(i).strip() for i in x if i]
-
-    s = str(x).strip()
-    if not s:
-        return []
-
-    # Si c'est une liste stockée en string
-    if s.startswith("[") and s.endswith("]"):
-        try:
-            parsed = ast.literal_eval(s)
-            if isinstance(parsed, list):
-                return [str(i).strip() for i in parsed if i]
-        except Exception:
-            pass
-
-    return [s]
-
-
-def _edu_to_num(x) -> int:
-    """
-    Convertit "bac+5" -> 5 ; "Bac+3" -> 3 ; None -> 0
-    """
-    if x is None:
-        return 0
-    if isinstance(x, float) and math.isnan(x):
-        return 0
-
-    s = str(x).lower().replace(" ", "")
-    if "bac+" in s:
-        try:
-            return int(s.split("bac+")[1])
-        except Exception:
-            return 0
-
-    try:
-        return int(float(s))
-    except Exception:
-        return 0
+# anciens noms internes : src.list_literal.parse_list_cell / src.education.education_code
+_parse_list_cell = parse_list_cell
+_edu_to_num = education_code
 
 
 # ============================================================
@@ -149,10 +117,97 @@ def sector_score(candidate_sector, job_sector) -> float:
 # ----------------- FONCTION GLOBALE PARTIE 4 ----------------
 # ============================================================
 
-def compute_subscores(pairs_df: pd.DataFrame) -> pd.DataFrame:
+SUBSCORE_COLUMNS = ["score_skills", "score_experience", "score_education", "score_languages", "score_sector"]
+
+
+def _column(df: pd.DataFrame, *names: str) -> pd.Series:
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    # Sécurité si colonne absente
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _subscore_arrays(cand: pd.DataFrame, job: pd.DataFrame,
+                     cand_idx: np.ndarray | None = None,
+                     job_idx: np.ndarray | None = None,
+                     skills_kernel: str = "auto") -> dict:
+    """
+    Calcule les 5 subscores (moteur colonnaire : une passe NumPy par subscore,
+    chaque cellule distincte n'est parsée qu'une seule fois).
+
+    Sans index, cand et job sont la même table de paires ; sinon la paire i est
+    (cand.iloc[cand_idx[i]], job.iloc[job_idx[i]]).
+    """
+    def take(a: np.ndarray, idx: np.ndarray | None) -> np.ndarray:
+        return a if idx is None else a[idx]
+
+    scores = {}
+
+    inter, n_cand, n_job = set_overlap_counts(
+        _column(cand, "candidate_skills", "skills"), _column(job, "required_skills"),
+        parse_list_cell, kernel=skills_kernel, idx_a=cand_idx, idx_b=job_idx,
+    )
+    scores["score_skills"] = jaccard_from_counts(inter, n_cand, n_job)
+
+    scores["score_experience"] = experience_score_batch(
+        take(to_float_array(_column(cand, "years_experience")), cand_idx),
+        take(to_float_array(_column(job, "min_experience")), job_idx),
+    )
+
+    # Education → numérique (codes du prétraitement si présents)
+    if "education_level_code" in cand.columns and "required_education_code" in job.columns:
+        cand_edu = cand["education_level_code"].to_numpy()
+        job_edu = job["required_education_code"].to_numpy()
+    else:
+        cand_edu = map_cells(_column(cand, "education_level").to_numpy(dtype=object), education_code, dtype=np.int64)
+        job_edu = map_cells(_column(job, "required_education").to_numpy(dtype=object), education_code, dtype=np.int64)
+    scores["score_education"] = education_score_batch(take(cand_edu, cand_idx), take(job_edu, job_idx))
+
+    if "languages_mask" in cand.columns and "required_languages_mask" in job.columns:
+        # bitmasks du prétraitement : popcount(cand & job) / popcount(job)
+        cand_lang = masks_to_words(take(cand["languages_mask"].to_numpy(), cand_idx))
+        job_lang = masks_to_words(take(job["required_languages_mask"].to_numpy(), job_idx))
+        n_words = max(cand_lang.shape[1], job_lang.shape[1])
+        if cand_lang.shape[1] != job_lang.shape[1]:
+            cand_lang = masks_to_words(take(cand["languages_mask"].to_numpy(), cand_idx), n_words)
+            job_lang = masks_to_words(take(job["required_languages_mask"].to_numpy(), job_idx), n_words)
+        inter = popcount(cand_lang & job_lang).sum(axis=1, dtype=np.int64)
+        n_cand = popcount(cand_lang).sum(axis=1, dtype=np.int64)
+        n_job = popcount(job_lang).sum(axis=1, dtype=np.int64)
+    else:
+        inter, n_cand, n_job = set_overlap_counts(
+            _column(cand, "languages"), _column(job, "required_languages"),
+            parse_list_cell, idx_a=cand_idx, idx_b=job_idx,
+        )
+    scores["score_languages"] = languages_from_counts(inter, n_cand, n_job)
+
+    if "sector_code" in cand.columns and "required_sector_code" in job.columns:
+        # codes secteur du registre du run, partagés candidats / offres, 0 = secteur absent
+        cand_sector = take(cand["sector_code"].to_numpy(), cand_idx)
+        job_sector = take(job["required_sector_code"].to_numpy(), job_idx)
+        scores["score_sector"] = sector_score_batch(cand_sector, cand_sector != 0, job_sector, job_sector != 0)
+    else:
+        scores["score_sector"] = sector_score_batch(
+            *sector_codes(_column(cand, "sector"), _column(job, "required_sector"), idx_a=cand_idx, idx_b=job_idx)
+        )
+
+    # Clamp sécurité [0,1]
+    for c in SUBSCORE_COLUMNS:
+        scores[c] = np.clip(np.nan_to_num(scores[c], nan=0.0), 0.0, 1.0)
+    return scores
+
+
+def compute_subscores(pairs_df: pd.DataFrame, skills_kernel: str = "auto", cache=None,
+                      score_dtype: str = "float64") -> pd.DataFrame:
     """
     Calcule les 5 subscores sur le DataFrame des paires candidat-offre.
 
+    skills_kernel : "bitmap" | "sparse" | "auto" (voir columnar.resolve_set_kernel)
+    cache : SubscoreCache optionnel (cache.py) ; seules les paires absentes du
+            cache sont calculées, puis écrites dans le cache.
+    score_dtype : stockage des colonnes score_* (aggregate.SCORE_DTYPES)
+
     Colonnes attendues (compatibles avec tes CSV) :
       - candidate_skills / required_skills
       - years_experience / min_experience
@@ -163,74 +218,33 @@ def compute_subscores(pairs_df: pd.DataFrame) -> pd.DataFrame:
 
     df = pairs_df.copy()
 
-    # Mapping colonnes
-    cand_skills_col = "candidate_skills" if "candidate_skills" in df.columns else "skills"
-    job_skills_col = "required_skills"
-
-    cand_exp_col = "years_experience"
-    job_exp_col = "min_experience"
-
-    cand_edu_col = "education_level"
-    job_edu_col = "required_education"
-
-    cand_lang_col = "languages"
-    job_lang_col = "required_languages"
-
-    cand_sector_col = "sector"
-    job_sector_col = "required_sector"
-
     # Sécurité si colonnes absentes
+    cand_skills_col = "candidate_skills" if "candidate_skills" in df.columns else "skills"
     for col in [
-        cand_skills_col, job_skills_col,
-        cand_exp_col, job_exp_col,
-        cand_edu_col, job_edu_col,
-        cand_lang_col, job_lang_col,
-        cand_sector_col, job_sector_col
+        cand_skills_col, "required_skills",
+        "years_experience", "min_experience",
+        "education_level", "required_education",
+        "languages", "required_languages",
+        "sector", "required_sector",
     ]:
         if col not in df.columns:
             df[col] = None
 
-    # Parsing listes
-    df["_cand_skills_list"] = df[cand_skills_col].apply(_parse_list_cell)
-    df["_job_skills_list"] = df[job_skills_col].apply(_parse_list_cell)
-
-    df["_cand_lang_list"] = df[cand_lang_col].apply(_parse_list_cell)
-    df["_job_lang_list"] = df[job_lang_col].apply(_parse_list_cell)
-
-    # Education → numérique
-    df["_cand_edu_num"] = df[cand_edu_col].apply(_edu_to_num)
-    df["_job_edu_num"] = df[job_edu_col].apply(_edu_to_num)
-
-    # Calcul scores
-    df["score_skills"] = df.apply(
-        lambda r: skills_jaccard(r["_cand_skills_list"], r["_job_skills_list"]), axis=1
-    )
-
-    df["score_experience"] = df.apply(
-        lambda r: experience_score(r[cand_exp_col], r[job_exp_col]), axis=1
-    )
-
-    df["score_education"] = df.apply(
-        lambda r: education_score(r["_cand_edu_num"], r["_job_edu_num"]), axis=1
-    )
-
-    df["score_languages"] = df.apply(
-        lambda r: languages_score(r["_cand_lang_list"], r["_job_lang_list"]), axis=1
-    )
-
-    df["score_sector"] = df.apply(
-        lambda r: sector_score(r[cand_sector_col], r[job_sector_col]), axis=1
-    )
-
-    # Clamp sécurité [0,1]
-    for c in [
-        "score_skills",
-        "score_experience",
-        "score_education",
-        "score_languages",
-        "score_sector"
-    ]:
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0).clip(0.0, 1.0)
+    if cache is None:
+        scores = _subscore_arrays(df, df, skills_kernel=skills_kernel)
+    else:
+        from .cache import code_version
+
+        scores = cache.cached_scores(
+            df,
+            [cand_skills_col, "years_experience", "education_level", "languages", "sector"],
+            ["required_skills", "min_experience", "required_education", "required_languages", "required_sector"],
+            lambda sub: _subscore_arrays(sub, sub, skills_kernel=skills_kernel),
+            ns="compute_subscores",
+            version=code_version(compute_subscores),
+        )
+    for c, values in scores.items():
+        df[c] = encode_scores(values, score_dtype)
 
     # Nettoyage colonnes temporaires
     df.drop(columns=[c for c in df.columns if c.startswith("_")],
@@ -238,3 +252,27 @@ def compute_subscores(pairs_df: pd.DataFrame) -> pd.DataFrame:
             errors="ignore")
 
     return df
+
+
+def compute_subscores_grid(df_candidates: pd.DataFrame, df_jobs: pd.DataFrame,
+                           cand_idx: np.ndarray, job_idx: np.ndarray,
+                           skills_kernel: str = "auto", features=None, score_dtype: str = "float64") -> pd.DataFrame:
+    """
+    Mode factorisé : subscores des paires (df_candidates.iloc[cand_idx[i]],
+    df_jobs.iloc[job_idx[i]]) sans matérialiser la table des paires.
+
+    features : (EntityFeatures candidats, EntityFeatures offres) construits une
+    fois par run avec features.build_features ; sinon ils sont construits ici
+    pour les seules entités référencées. Retourne les 5 colonnes score_*.
+    """
+    from .features import build_features, score_features
+
+    cand_idx = np.asarray(cand_idx, dtype=np.int64)
+    job_idx = np.asarray(job_idx, dtype=np.int64)
+    if features is None:
+        used_c, cand_idx = np.unique(cand_idx, return_inverse=True)
+        used_j, job_idx = np.unique(job_idx, return_inverse=True)
+        features = build_features(df_candidates.iloc[used_c], df_jobs.iloc[used_j])
+        cand_idx, job_idx = cand_idx.reshape(-1), job_idx.reshape(-1)
+    scores = score_features(features[0], features[1], cand_idx, job_idx, skills_kernel)
+    return pd.DataFrame({c: encode_scores(v, score_dtype) for c, v in scores.items()})
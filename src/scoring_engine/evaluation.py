@@ -15,6 +15,7 @@ from .components.subscores import (
     languages_score,
     sector_score,
 )
+from .components.cache import code_version
 from .algorithms.algorithms import (
     WSMAlgorithm,
     WPMAlgorithm,
@@ -34,13 +35,32 @@ def split_by_candidate_id(df: pd.DataFrame, test_size=0.3, seed=42) -> Tuple[pd.
     return train, test
 
 
-def compute_subscores_df(df: pd.DataFrame) -> pd.DataFrame:
+def _subscores_apply(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    return {
+        "score_skills": df.apply(lambda r: skills_jaccard(r.get("candidate_skills"), r.get("required_skills")), axis=1),
+        "score_experience": df.apply(lambda r: experience_score(r.get("years_experience"), r.get("min_experience")), axis=1),
+        "score_education": df.apply(lambda r: education_score(r.get("education_level_num"), r.get("required_education_num")), axis=1),
+        "score_languages": df.apply(lambda r: languages_score(r.get("languages"), r.get("required_languages")), axis=1),
+        "score_sector": df.apply(lambda r: sector_score(r.get("sector"), r.get("required_sector")), axis=1),
+    }
+
+
+def compute_subscores_df(df: pd.DataFrame, cache=None) -> pd.DataFrame:
+    """cache : SubscoreCache optionnel, seules les paires absentes sont recalculées."""
     out = df.copy()
-    out["score_skills"] = out.apply(lambda r: skills_jaccard(r.get("candidate_skills"), r.get("required_skills")), axis=1)
-    out["score_experience"] = out.apply(lambda r: experience_score(r.get("years_experience"), r.get("min_experience")), axis=1)
-    out["score_education"] = out.apply(lambda r: education_score(r.get("education_level_num"), r.get("required_education_num")), axis=1)
-    out["score_languages"] = out.apply(lambda r: languages_score(r.get("languages"), r.get("required_languages")), axis=1)
-    out["score_sector"] = out.apply(lambda r: sector_score(r.get("sector"), r.get("required_sector")), axis=1)
+    if cache is None:
+        scores = _subscores_apply(out)
+    else:
+        scores = cache.cached_scores(
+            out,
+            ["candidate_skills", "years_experience", "education_level_num", "languages", "sector"],
+            ["required_skills", "min_experience", "required_education_num", "required_languages", "required_sector"],
+            lambda sub: {c: v.fillna(0.0).astype(float).clip(0.0, 1.0) for c, v in _subscores_apply(sub).items()},
+            ns="evaluation.compute_subscores_df",
+            version=code_version(compute_subscores_df),
+        )
+    for c, values in scores.items():
+        out[c] = values
     for c in ["score_skills", "score_experience", "score_education", "score_languages", "score_sector"]:
         out[c] = out[c].fillna(0.0).astype(float).clip(0.0, 1.0)
     return out
@@ -86,9 +106,9 @@ def run_algorithm_and_eval(alg, train_df, test_df, label_col="label") -> Dict[st
     return result
 
 
-def run_experiments(df_pairs: pd.DataFrame, output_dir: str = "results") -> None:
+def run_experiments(df_pairs: pd.DataFrame, output_dir: str = "results", cache=None) -> None:
     os.makedirs(output_dir, exist_ok=True)
-    df = compute_subscores_df(df_pairs)
+    df = compute_subscores_df(df_pairs, cache=cache)
 
     algos = {
         "WSM": WSMAlgorithm(),
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Union
+from typing import List, Union
 import re
+import numpy as np
 import pandas as pd
 
 # canonical mapping for common sectors
@@ -53,3 +54,52 @@ def normalize_sector(sector: Union[str, float, None]) -> str:
 
 def is_same_sector(a: Union[str, None], b: Union[str, None]) -> bool:
     return normalize_sector(a) == normalize_sector(b)
+
+
+# ============================================================
+# Codes entiers des secteurs
+#
+# Dictionnaire partagé secteur normalisé -> code, commun aux candidats et aux
+# offres : la comparaison de secteurs devient une comparaison d'entiers.
+# Code 0 = secteur absent (valeur "falsy", score 0 comme dans sector_score).
+# ============================================================
+
+_COMMON_SECTORS = sorted(set(_SECTOR_CANONICAL.values()) | {"unknown"})
+
+
+class SectorRegistry:
+    def __init__(self, sectors: List[str] | None = None):
+        self._codes: dict = {"": 0}
+        for sector in (sectors if sectors is not None else _COMMON_SECTORS):
+            self.code(sector)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def code(self, sector) -> int:
+        """Code du secteur (ajouté au registre s'il est nouveau) ; même clé str(x) que sector_score."""
+        key = "" if sector is None else str(sector)
+        if key not in self._codes:
+            self._codes[key] = len(self._codes)
+        return self._codes[key]
+
+    def decode(self, code: int) -> str:
+        for sector, c in self._codes.items():
+            if c == code:
+                return sector
+        raise KeyError(code)
+
+
+# registre par défaut des appels directs à preprocess_candidates / preprocess_jobs ;
+# les runs du pipeline (prepare_entities, load_entities_csv) ont leur propre registre
+SECTOR_REGISTRY = SectorRegistry()
+
+
+def encode_sector_column(values: pd.Series, registry: SectorRegistry | None = None) -> pd.Series:
+    """Secteurs -> codes entiers (int16 tant que le registre le permet)."""
+    registry = registry if registry is not None else SECTOR_REGISTRY
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    table = np.array([registry.code(u) for u in uniques], dtype=np.int64)
+    dtype = np.int16 if len(registry) <= np.iinfo(np.int16).max else np.int32
+    out = table[codes] if len(table) else np.zeros(len(values), dtype=np.int64)
+    return pd.Series(out.astype(dtype), index=values.index)
@@ -0,0 +1,49 @@
+# src/shortlist.py
+from __future__ import annotations
+from typing import Tuple
+import numpy as np
+
+
+class TopKPerJob:
+    """
+    Shortlist bornée : garde au plus k candidats par offre pendant un scoring
+    par blocs. Mémoire O(n_jobs × k), quel que soit le nombre de candidats.
+
+    Ordre = score décroissant puis candidate_id croissant, donc le résultat est
+    identique à un tri complet suivi de head(k) par offre.
+    """
+
+    def __init__(self, k: int, cand_rank: np.ndarray):
+        if k <= 0:
+            raise ValueError("top_k_per_job must be > 0")
+        self.k = int(k)
+        # rang de chaque candidat dans l'ordre des candidate_id (départage des ex-aequo)
+        self.cand_rank = np.asarray(cand_rank, dtype=np.int64)
+        self._job = np.zeros(0, dtype=np.int64)
+        self._cand = np.zeros(0, dtype=np.int64)
+        self._score = np.zeros(0, dtype=np.float64)
+
+    @staticmethod
+    def rank_ids(ids) -> np.ndarray:
+        ids = np.asarray(ids, dtype=object).astype(str)
+        rank = np.empty(len(ids), dtype=np.int64)
+        rank[np.argsort(ids, kind="stable")] = np.arange(len(ids))
+        return rank
+
+    def update(self, cand_idx: np.ndarray, job_idx: np.ndarray, scores: np.ndarray) -> None:
+        job = np.concatenate([self._job, np.asarray(job_idx, dtype=np.int64)])
+        cand = np.concatenate([self._cand, np.asarray(cand_idx, dtype=np.int64)])
+        score = np.concatenate([self._score, np.asarray(scores, dtype=np.float64)])
+
+        # tri par (offre, -score, rang candidat) puis on garde les k premiers par offre
+        order = np.lexsort((self.cand_rank[cand], -score, job))
+        job, cand, score = job[order], cand[order], score[order]
+        starts = np.flatnonzero(np.r_[True, job[1:] != job[:-1]])
+        group_start = np.repeat(starts, np.diff(np.r_[starts, len(job)]))
+        keep = (np.arange(len(job)) - group_start) < self.k
+
+        self._job, self._cand, self._score = job[keep], cand[keep], score[keep]
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(cand_idx, job_idx) de la shortlist, par offre puis par rang."""
+        return self._cand.copy(), self._job.copy()
@@ -6,7 +6,8 @@ import random
 import pandas as pd
 import numpy as np
 import pytest
-from typing import Tuple, List
+import yaml
+from typing import List, Optional, Tuple
 
 
 class RealisticDataGenerator:
@@ -215,3 +216,33 @@ def small_dataset():
 def large_dataset():
     """Fixture : grand dataset pour benchmarks"""
     return RealisticDataGenerator.generate_realistic_dataset(10000, 100, seed=42)
+
+
+@pytest.fixture
+def dev_sample():
+    """Fixture : dev_sample(n_cands, n_jobs) -> premières lignes des CSV data/dev"""
+    def sample(n_cands: int = 12, n_jobs: int = 5) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=n_cands)
+        df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=n_jobs)
+        return df_cv, df_jobs
+    return sample
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    """Fixture : write_config(name, scoring=None, **pipeline) -> config.yaml de test (sans export) dans tmp_path"""
+    def write(name: str = "config.yaml", scoring: Optional[dict] = None, **pipeline):
+        cfg = {
+            "pipeline": {
+                "pairing_mode": "cartesian",
+                "batch_size": 7,
+                "export_format": [],
+                "keep_columns": ["candidate_id", "job_id", "sector", "required_sector"],
+                **pipeline,
+            },
+            "scoring": {"mode": "weighted_subscores", **(scoring or {})},
+        }
+        path = tmp_path / name
+        path.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+        return path
+    return write
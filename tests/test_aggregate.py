@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src.pipeline import run
+
+
+def test_score_dtype_quantizes_storage(dev_sample, write_config):
+    import numpy as np
+    import pytest
+    from src.aggregate import decode_scores, dequantize_scores
+    from src.export import _text_frame
+
+    df_cv, df_jobs = dev_sample(30, 5)
+    ref, _ = run(df_cv, df_jobs, write_config("ref.yaml"), export=False)
+    score_cols = [c for c in ref.columns if c.startswith("score_")] + ["global_score"]
+    for score_dtype, step in [("float32", 1e-6), ("uint16", 1 / 1000), ("uint8", 1 / 255)]:
+        for execution_mode in ["pairs", "factorized"]:
+            out, _ = run(df_cv, df_jobs, write_config(
+                "q.yaml", score_dtype=score_dtype, execution_mode=execution_mode,
+            ), export=False)
+            for c in score_cols:
+                assert out[c].dtype == np.dtype(score_dtype), (score_dtype, c)
+                # global_score est calculé sur les subscores déjà quantifiés : jusqu'à un pas d'écart
+                tol = step if c == "global_score" else step / 2
+                assert np.abs(decode_scores(out[c]) - ref[c].to_numpy()).max() <= tol + 1e-9
+
+        # top-k : même shortlist qu'un tri complet des scores stockés (égalités -> candidate_id)
+        k = 4
+        full, _ = run(df_cv, df_jobs, write_config("f.yaml", score_dtype=score_dtype), export=False)
+        expected = (
+            full.sort_values(["job_id", "global_score", "candidate_id"], ascending=[True, False, True])
+            .groupby("job_id").head(k).reset_index(drop=True)
+        )
+        got, _ = run(df_cv, df_jobs, write_config(
+            "k.yaml", score_dtype=score_dtype, top_k_per_job=k, execution_mode="factorized",
+        ), export=False)
+        got = got.sort_values(["job_id", "global_score", "candidate_id"], ascending=[True, False, True]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, expected)
+
+    # export texte : scores décodés en float, arrondis au pas de quantification
+    text = _text_frame(out)
+    assert text["global_score"].dtype == np.float64
+    assert (text["global_score"] == text["global_score"].round(4)).all()
+    assert dequantize_scores(out)["global_score"].dtype == np.float64
+
+    with pytest.raises(ValueError):
+        run(df_cv, df_jobs, write_config("bad.yaml", score_dtype="int8"), export=False)
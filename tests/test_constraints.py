@@ -0,0 +1,45 @@
+import pandas as pd
+
+from src.pipeline import run
+
+
+def test_hard_constraints_prune_pairs_before_scoring(dev_sample, write_config):
+    import numpy as np
+    from src.data_layer import prepare_entities
+
+    df_cv, df_jobs = dev_sample(50, 8)
+    # offre 0 : écart d'expérience surchargé ; offre 1 : langues non obligatoires ;
+    # offre 2 : niveau d'études non reconnu (code 0) -> pas d'exigence de diplôme
+    df_jobs = df_jobs.assign(hard_max_experience_gap=[0.0] + [None] * 7,
+                             hard_mandatory_languages=[None, "false"] + [None] * 6)
+    df_jobs.loc[2, "required_education"] = "master"
+    df_cv.loc[0, "education_level"] = "-1"  # code négatif : éliminé seulement par une vraie exigence
+    cands, jobs, _, _ = prepare_entities(df_cv, df_jobs)
+    constraints = {"min_education": True, "mandatory_languages": True, "max_experience_gap": 3}
+    keep_cols = ["candidate_id", "job_id", "sector", "required_sector"]
+
+    full, _ = run(df_cv, df_jobs, write_config("full.yaml", keep_columns=keep_cols), export=False)
+    ci = cands.set_index("candidate_id").loc[full["candidate_id"]]
+    ji = jobs.set_index("job_id").loc[full["job_id"]]
+    required_edu = ji["required_education_code"].to_numpy()
+    edu_ok = (ci["education_level_code"].to_numpy() >= required_edu) | (required_edu == 0)
+    assert (required_edu == 0).any()
+    lang_ok = np.array([set(r) <= set(c) for c, r in zip(ci["languages"], ji["required_languages"])])
+    lang_ok |= (full["job_id"] == jobs["job_id"][1]).to_numpy()
+    gap = np.where(full["job_id"] == jobs["job_id"][0], 0.0, 3.0)
+    exp_ok = ci["years_experience"].to_numpy() >= ji["min_experience"].to_numpy() - gap
+    expected = full[edu_ok & lang_ok & exp_ok].reset_index(drop=True)
+    assert 0 < len(expected) < len(full)
+
+    pruned = {
+        "min_education": int((~edu_ok).sum()),
+        "mandatory_languages": int((edu_ok & ~lang_ok).sum()),
+        "max_experience_gap": int((edu_ok & lang_ok & ~exp_ok).sum()),
+    }
+    for execution_mode in ["pairs", "factorized"]:
+        out, meta = run(df_cv, df_jobs, write_config(
+            "c.yaml", hard_constraints=constraints, execution_mode=execution_mode, keep_columns=keep_cols,
+        ), export=False)
+        pd.testing.assert_frame_equal(out, expected)
+        assert meta["pairing"]["hard_constraints"] == pruned
+        assert meta["pairing"]["pruned_pairs"] == len(full) - len(expected)
@@ -86,3 +86,37 @@ def test_to_list_parses_python_list_string():
     assert to_list("['Audit', 'Excel']") == ["audit", "excel"]
 
 
+
+
+def test_chunked_csv_loader_matches_prepare_entities(tmp_path):
+    import pytest
+    from src.data_layer import load_entities_csv, prepare_entities
+    from src.schema import SchemaError
+
+    c_path, j_path = "data/dev/candidates_dev.csv", "data/dev/jobs_dev.csv"
+    df_c, df_j, qc, qj = load_entities_csv(c_path, j_path, chunksize=700)
+    ref_c, ref_j, ref_qc, ref_qj = prepare_entities(pd.read_csv(c_path), pd.read_csv(j_path))
+    pd.testing.assert_frame_equal(df_c, ref_c)
+    pd.testing.assert_frame_equal(df_j, ref_j)
+    assert (qc, qj) == (ref_qc, ref_qj)
+
+    # ids numériques ("01" -> "1") et expérience invalide : comme pd.read_csv
+    raw = pd.read_csv(c_path, nrows=6, dtype={"years_experience": str})
+    raw["candidate_id"] = [f"0{i}" for i in range(1, 7)]
+    raw.loc[2, "years_experience"] = "n/a"
+    raw.to_csv(tmp_path / "ids.csv", index=False)
+    df_c, _, _, _ = load_entities_csv(tmp_path / "ids.csv", j_path, chunksize=4)
+    ref_c, _, _, _ = prepare_entities(pd.read_csv(tmp_path / "ids.csv"), pd.read_csv(j_path))
+    pd.testing.assert_frame_equal(df_c, ref_c)
+    assert df_c["candidate_id"].tolist() == ["1", "2", "3", "4", "5", "6"]
+
+    # doublon d'id réparti sur deux chunks
+    dup = pd.read_csv(c_path, nrows=5)
+    dup.loc[4, "candidate_id"] = dup.loc[0, "candidate_id"]
+    dup.to_csv(tmp_path / "dup.csv", index=False)
+    with pytest.raises(SchemaError, match="duplicates"):
+        load_entities_csv(tmp_path / "dup.csv", j_path, chunksize=2)
+
+    dup.drop(columns=["sector"]).to_csv(tmp_path / "missing.csv", index=False)
+    with pytest.raises(SchemaError, match="missing required columns"):
+        load_entities_csv(tmp_path / "missing.csv", j_path)
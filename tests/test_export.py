@@ -0,0 +1,84 @@
+import pandas as pd
+
+from src.pipeline import run
+
+
+def test_columnar_exports_roundtrip_without_parsing(tmp_path, dev_sample, write_config):
+    import numpy as np
+    import pytest
+
+    pytest.importorskip("pyarrow")
+    from src.export import read_scored
+    from src.pipeline import run_streaming
+
+    df_cv, df_jobs = dev_sample()
+    formats = ["parquet", "feather"]
+    out, meta = run(df_cv, df_jobs, write_config(
+        "a.yaml", export_dir=str(tmp_path / "full"), export_format=formats, export_row_group_size=10,
+    ))
+    stream_meta = {}
+    for _ in run_streaming(df_cv, df_jobs, write_config(
+        "b.yaml", export_dir=str(tmp_path / "stream"), export_format=formats,
+    ), meta=stream_meta):
+        pass
+
+    for exports in (meta["exports"], stream_meta["exports"]):
+        for fmt in formats:
+            back = read_scored(exports[fmt])
+            assert list(back.columns) == list(out.columns)
+            pd.testing.assert_frame_equal(back.drop(columns=["vector_score"]), out.drop(columns=["vector_score"]))
+            np.testing.assert_array_equal(np.stack(back["vector_score"].to_numpy()), np.array(out["vector_score"].tolist()))
+
+    projected = read_scored(meta["exports"]["parquet"], columns=["job_id", "global_score"])
+    assert list(projected.columns) == ["job_id", "global_score"]
+
+
+def test_json_exports_are_streamed_and_equivalent(tmp_path, dev_sample, write_config):
+    import json
+
+    from src import export
+    from src.pipeline import run_streaming
+
+    df_cv, df_jobs = dev_sample()
+    formats = ["json", "json_compact", "ndjson"]
+    out, meta = run(df_cv, df_jobs, write_config("a.yaml", export_dir=str(tmp_path / "full"), export_format=formats))
+    records = export.with_vector_lists(out).to_dict(orient="records")
+
+    # rendu "json" inchangé par rapport à json.dump(to_dict(records), indent=2)
+    with open(meta["exports"]["json"], encoding="utf-8") as f:
+        assert f.read() == json.dumps(records, ensure_ascii=False, indent=2)
+    with open(meta["exports"]["json_compact"], encoding="utf-8") as f:
+        text = f.read()
+    assert "\n" not in text and json.loads(text) == records
+    with open(meta["exports"]["ndjson"], encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == records
+
+    stream_meta = {}
+    for _ in run_streaming(df_cv, df_jobs, write_config(
+        "b.yaml", export_dir=str(tmp_path / "stream"), export_format=formats,
+    ), meta=stream_meta):
+        pass
+    for fmt in formats:
+        with open(meta["exports"][fmt], encoding="utf-8") as a, open(stream_meta["exports"][fmt], encoding="utf-8") as b:
+            assert a.read() == b.read(), fmt
+
+    # tranches plus petites que la table : même fichier
+    small = tmp_path / "small.json"
+    export.JSON_CHUNK_ROWS, old = 4, export.JSON_CHUNK_ROWS
+    try:
+        export.export_json(out, small)
+    finally:
+        export.JSON_CHUNK_ROWS = old
+    assert small.read_text(encoding="utf-8") == open(meta["exports"]["json"], encoding="utf-8").read()
+
+
+def test_chunk_writer_requires_write(tmp_path):
+    import pytest
+
+    from src.export import ChunkWriter
+
+    class NoWrite(ChunkWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWrite(tmp_path / "x.csv")
@@ -0,0 +1,113 @@
+import pandas as pd
+
+from src.incremental import run_incremental
+from src.pipeline import run
+
+
+def test_incremental_rerun_equals_full_run(tmp_path, dev_sample, write_config):
+    df_cv, df_jobs = dev_sample(30, 8)
+    for pairing_mode in ["cartesian", "same_sector", "lsh"]:
+        config = write_config(f"{pairing_mode}.yaml", pairing_mode=pairing_mode)
+        store = tmp_path / f"store_{pairing_mode}"
+
+        out, meta = run_incremental(df_cv, df_jobs, store, config, export=False)
+        assert meta["incremental"]["mode"] == "full"
+        pd.testing.assert_frame_equal(out, run(df_cv, df_jobs, config, export=False)[0])
+
+        # jour suivant : 1 candidat modifié, 1 supprimé, 1 nouveau ; 1 offre modifiée, 1 supprimée
+        cv2 = df_cv.drop(index=[3]).copy()
+        cv2.loc[0, "years_experience"] = 42
+        cv2 = pd.concat([cv2, pd.read_csv("data/dev/candidates_dev.csv", skiprows=range(1, 41), nrows=1)],
+                        ignore_index=True)
+        jobs2 = df_jobs.drop(index=[5]).copy()
+        jobs2.loc[1, "required_skills"] = "['python', 'sql']"
+
+        out2, meta2 = run_incremental(cv2, jobs2, store, config, export=False)
+        stats = meta2["incremental"]
+        assert stats["mode"] == "incremental"
+        assert stats["new_or_changed_candidates"] == 2 and stats["removed_candidates"] == 1
+        assert stats["new_or_changed_jobs"] == 1 and stats["removed_jobs"] == 1
+        assert 0 < stats["rescored_pairs"] < len(out2)
+        pd.testing.assert_frame_equal(out2, run(cv2, jobs2, config, export=False)[0])
+
+        # aucun changement : tout est réutilisé
+        out3, meta3 = run_incremental(cv2, jobs2, store, config, export=False)
+        assert meta3["incremental"]["rescored_pairs"] == 0
+        pd.testing.assert_frame_equal(out3, out2)
+
+
+def test_incremental_rejects_lsh_top_k(tmp_path, dev_sample, write_config):
+    import pytest
+
+    df_cv, df_jobs = dev_sample(30, 8)
+    config = write_config(pairing_mode="lsh", lsh={"bands": 16, "rows": 2, "top_k": 3})
+    # le top K LSH d'une offre dépend de tout le vivier : pas de réutilisation possible
+    with pytest.raises(ValueError, match="lsh.top_k"):
+        run_incremental(df_cv, df_jobs, tmp_path / "store", config, export=False)
+
+
+def test_incremental_tombstones_removed_ids(tmp_path, dev_sample, write_config):
+    import json
+
+    df_cv, df_jobs = dev_sample(30, 8)
+    config = write_config()
+    store = tmp_path / "store"
+    run_incremental(df_cv, df_jobs, store, config, export=False)
+    removed = str(df_cv.loc[2, "candidate_id"])
+    run_incremental(df_cv.drop(index=[2]), df_jobs, store, config, export=False)
+
+    manifest = json.loads((store / "manifest.json").read_text(encoding="utf-8"))
+    assert removed in manifest["tombstones"]["candidates"]
+    assert removed not in manifest["candidates"]
+
+    # l'id revient : rescoré comme nouveau, tombstone levé
+    out, meta = run_incremental(df_cv, df_jobs, store, config, export=False)
+    manifest = json.loads((store / "manifest.json").read_text(encoding="utf-8"))
+    assert removed not in manifest["tombstones"]["candidates"]
+    assert meta["incremental"]["new_or_changed_candidates"] == 1
+    pd.testing.assert_frame_equal(out, run(df_cv, df_jobs, config, export=False)[0])
+
+
+def test_unrelated_run_does_not_trigger_rescoring(tmp_path, dev_sample, write_config):
+    from src.data_layer import prepare_entities
+
+    df_cv, df_jobs = dev_sample(30, 8)
+    config = write_config()
+    store = tmp_path / "store"
+    out, _ = run_incremental(df_cv, df_jobs, store, config, export=False)
+    # run sans rapport dans le même processus : langues / secteurs inédits
+    prepare_entities(df_cv.head(2).assign(languages=["qq, zz", "xx"], sector=["s_a", "s_b"]), df_jobs)
+    out2, meta = run_incremental(df_cv, df_jobs, store, config, export=False)
+    assert meta["incremental"]["rescored_pairs"] == 0
+    pd.testing.assert_frame_equal(out2, out)
+
+
+def test_incremental_follows_execution_mode_and_records_timings(tmp_path, dev_sample, write_config):
+    df_cv, df_jobs = dev_sample(30, 8)
+    for execution_mode in ["pairs", "factorized"]:
+        scoring = {"subscore_cache": str(tmp_path / "cache.sqlite")} if execution_mode == "pairs" else {}
+        config = write_config(f"{execution_mode}.yaml", execution_mode=execution_mode, scoring=scoring)
+        out, meta = run_incremental(df_cv, df_jobs, tmp_path / f"store_{execution_mode}", config, export=False)
+        expected, full_meta = run(df_cv, df_jobs, config, export=False)
+        pd.testing.assert_frame_equal(out, expected)
+        assert {"preprocessing", "pairing", "subscoring", "aggregation"} <= set(meta["timings"])
+        if scoring:  # run complet après l'incrémental : tout vient du cache
+            assert full_meta["subscore_cache"] == {"hits": len(expected), "misses": 0}
+
+
+def test_config_hash_ignores_non_scoring_settings():
+    import dataclasses
+    from src.incremental import config_hash
+    from src.pipeline import PipelineConfig
+    from src.profiling import ProfileConfig
+
+    base = PipelineConfig()
+    same = dataclasses.replace(
+        base, execution_mode="factorized", skills_kernel="sparse", subscore_cache="x.sqlite",
+        subscore_cache_max_entries=10, metrics_file="m.jsonl", trace_memory=True,
+        profile=ProfileConfig(enabled=True), workers=4, batch_size=10,
+    )
+    assert config_hash(same) == config_hash(base)
+    for changed in [dict(pairing_mode="same_sector"), dict(score_dtype="uint8"), dict(keep_columns=["job_id"]),
+                    dict(scoring_mode="algo")]:
+        assert config_hash(dataclasses.replace(base, **changed)) != config_hash(base)
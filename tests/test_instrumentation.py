@@ -0,0 +1,98 @@
+import time
+from functools import partial
+
+import pandas as pd
+import pytest
+
+from src.instrumentation import StageTimer
+from src.kpi_metrics import KPICalculator
+from src.pipeline import run, run_streaming
+
+STAGES = ["validation", "preprocessing", "quality_report", "pairing", "subscoring", "aggregation", "export"]
+
+
+@pytest.fixture
+def exported_config(tmp_path, write_config):
+    """write_config avec export CSV et fichier de métriques dans tmp_path"""
+    return partial(write_config, export_dir=str(tmp_path / "out"), export_format=["csv"],
+                   keep_columns=["candidate_id", "job_id"], metrics_file=str(tmp_path / "metrics.jsonl"))
+
+
+def test_stage_timer_nested_stages_are_exclusive():
+    timer = StageTimer(trace_memory=True).start()
+    try:
+        with timer.stage("outer", rows_in=10) as st:
+            time.sleep(0.02)
+            for _ in timer.timed_iter("inner", iter([1, 2]), count=lambda x: x):
+                time.sleep(0.01)  # temps du consommateur : compté dans outer
+            with timer.stage("inner"):
+                time.sleep(0.2)
+                data = bytearray(4 * 2**20)
+            del data
+            st.rows_out = 5
+    finally:
+        timer.stop()
+
+    t = timer.as_dict()
+    assert t["outer"]["rows_in"] == 10 and t["outer"]["rows_out"] == 5
+    assert t["inner"]["calls"] == 4 and t["inner"]["rows_out"] == 3
+    # outer : 0.02 + 2 × 0.01 hors étapes internes, sans les 0.2 s de inner
+    assert t["inner"]["wall_s"] >= 0.2 and 0.04 <= t["outer"]["wall_s"] < 0.2
+    assert t["inner"]["peak_memory_mb"] >= 4 and t["outer"]["peak_memory_mb"] >= 4
+    assert t["outer"]["wall_s"] + t["inner"]["wall_s"] <= t["total"]["wall_s"]
+
+
+def test_run_records_stage_timings_and_kpi_metrics_file(tmp_path, dev_sample, exported_config):
+    df_cv, df_jobs = dev_sample(30, 6)
+    n_pairs = 30 * 6
+
+    for execution_mode in ["pairs", "factorized"]:
+        out, meta = run(df_cv, df_jobs, exported_config(execution_mode=execution_mode))
+        timings = meta["timings"]
+        assert set(STAGES) <= set(timings)
+        assert timings["pairing"]["rows_out"] == timings["subscoring"]["rows_out"] == n_pairs
+        assert timings["aggregation"]["rows_out"] == timings["export"]["rows_out"] == len(out)
+        assert timings["validation"]["rows_in"] == 36
+        stage_total = sum(v["wall_s"] for k, v in timings.items() if k != "total")
+        assert stage_total <= timings["total"]["wall_s"]
+        assert timings["subscoring"]["peak_memory_mb"] is None  # trace_memory désactivé par défaut
+
+    blocks = list(run_streaming(df_cv, df_jobs, exported_config(batch_size=50)))
+    assert sum(len(b) for b in blocks) == n_pairs
+
+    with pytest.raises(ValueError):
+        run(df_cv, df_jobs, exported_config(pairing_mode="nope"))
+
+    records, performance = KPICalculator.load_metrics_jsonl(tmp_path / "metrics.jsonl")
+    assert [r["status"] for r in records] == ["success"] * 3 + ["error"]
+    assert records[0]["pairs"] == n_pairs and set(STAGES) <= set(records[0]["stages"])
+    assert "nope" in records[-1]["error"]
+    assert performance["avg_latency_ms"] > 0 and performance["throughput_per_second"] > 0
+
+    # directement consommable par KPICalculator
+    kpis = KPICalculator.calculate_all(records, out, performance)
+    assert kpis.avg_latency_ms == performance["avg_latency_ms"]
+    assert 0 < kpis.robustness_score < 1
+
+
+def test_profile_hooks_dump_pstats_folded_stacks_and_allocations(tmp_path, dev_sample, exported_config):
+    import pstats
+
+    df_cv, df_jobs = dev_sample(30, 6)
+
+    # désactivé : pas de profiler, aucun fichier
+    _, meta = run(df_cv, df_jobs, exported_config(export_format=[]), export=False)
+    assert "profile" not in meta and not (tmp_path / "out" / "profile").exists()
+
+    profile = {"enabled": True, "stages": ["subscoring_batch", "aggregation"], "top_n": 5}
+    out, meta = run(df_cv, df_jobs, exported_config(batch_size=100, profile=profile))
+    assert sorted(meta["profile"]) == ["aggregation", "subscoring_batch_0000", "subscoring_batch_0001"]
+    for paths in meta["profile"].values():
+        assert str(tmp_path / "out" / "profile") in paths["pstats"]
+        assert pstats.Stats(paths["pstats"]).total_calls > 0
+        folded = open(paths["folded"], encoding="utf-8").read().splitlines()
+        assert folded and all(int(line.rsplit(" ", 1)[1]) > 0 for line in folded)
+        summary = open(paths["summary"], encoding="utf-8").read()
+        assert "sites d'allocation" in summary
+    assert any("aggregate.py" in line for line in open(meta["profile"]["aggregation"]["folded"]))
+    assert "aggregate.py" in open(meta["profile"]["aggregation"]["summary"]).read()
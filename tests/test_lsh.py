@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from src.lsh import LSHConfig, LSHIndex, MinHasher, estimated_jaccard, lsh_index_pairs
+from src.pipeline import run
+
+
+def test_minhash_estimates_jaccard():
+    rng = np.random.default_rng(0)
+    vocab = [f"s{i}" for i in range(60)]
+    a = set(rng.choice(vocab, 30, replace=False))
+    sets = [set(rng.choice(vocab, 30, replace=False)) for _ in range(50)]
+    hasher = MinHasher(num_perm=512, seed=1)
+    sig = hasher.signatures(sets)
+    est = estimated_jaccard(sig, hasher.signatures([a])[0])
+    exact = np.array([len(a & s) / len(a | s) for s in sets])
+    assert np.abs(est - exact).max() < 0.1
+
+
+def test_minhash_signatures_by_chunks_match_reference():
+    sets = [["python", "sql"], [], ["excel"], [], ["audit", "excel", "sql", "python"], []]
+    hasher = MinHasher(num_perm=64, seed=3)
+    expected = np.full((len(sets), 64), hasher.signatures([[]])[0, 0], dtype=np.uint64)
+    for i, s in enumerate(sets):
+        for h in hasher._hashes(s):
+            expected[i] = np.minimum(expected[i], (np.uint64(h) * hasher.a + hasher.b) % np.uint64(2**31 - 1))
+    for chunk_tokens in [1, 3, 1000]:
+        np.testing.assert_array_equal(hasher.signatures(sets, chunk_tokens=chunk_tokens), expected)
+
+
+def test_lsh_query_finds_identical_sets_and_skips_empty():
+    sets = [["python", "sql"], ["excel"], [], ["python", "sql"], ["audit", "excel"]]
+    index = LSHIndex.build(sets, LSHConfig(bands=16, rows=2))
+    cands, est = index.query(["sql", "python"])
+    assert cands[:2].tolist() == [0, 3] and est[:2].tolist() == [1.0, 1.0]
+    assert 2 not in cands.tolist()
+    assert len(index.query([])[0]) == 0
+
+
+def test_lsh_pairing_rescores_retrieved_pairs_exactly(dev_sample, write_config):
+    df_cv, df_jobs = dev_sample(80, 6)
+    full, _ = run(df_cv, df_jobs, write_config("full.yaml"), export=False)
+
+    for execution_mode in ["pairs", "factorized"]:
+        out, meta = run(df_cv, df_jobs, write_config(
+            f"{execution_mode}.yaml", pairing_mode="lsh", execution_mode=execution_mode,
+            lsh={"bands": 32, "rows": 4, "top_k": 5},
+        ), export=False)
+        assert (out.groupby("job_id").size() <= 5).all()
+        assert meta["pairing"]["pairs"] == len(out) < len(full)
+        # subscores exacts sur les paires retrouvées
+        expected = full.merge(out[["candidate_id", "job_id"]], on=["candidate_id", "job_id"])
+        pd.testing.assert_frame_equal(out, expected)
+
+
+def test_lsh_index_pairs_with_all_bands_recall_everything():
+    from src.data_layer import prepare_entities
+    from src.pairing import skill_blocking_index_pairs
+
+    cands, jobs, _, _ = prepare_entities(
+        pd.read_csv("data/dev/candidates_dev.csv", nrows=50), pd.read_csv("data/dev/jobs_dev.csv", nrows=5)
+    )
+    # rows=1 : toute paire partageant une compétence a une forte chance de collision
+    ci, ji = lsh_index_pairs(cands, jobs, LSHConfig(bands=256, rows=1))
+    bi, bj = skill_blocking_index_pairs(cands, jobs)
+    got, exact = set(zip(ci.tolist(), ji.tolist())), set(zip(bi.tolist(), bj.tolist()))
+    assert got <= exact
+    assert len(got) >= 0.95 * len(exact)
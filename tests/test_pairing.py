@@ -0,0 +1,91 @@
+import pandas as pd
+
+from src.pipeline import run
+from src.pairing import build_pairs_cartesian, cartesian_index_pairs, take_pairs
+
+
+def test_cartesian_index_pairs_follow_merge_order():
+    cands = pd.DataFrame({"candidate_id": ["a", "b", "c"]})
+    jobs = pd.DataFrame({"job_id": ["x", "y"]})
+    ci, ji = cartesian_index_pairs(len(cands), len(jobs))
+    expected = build_pairs_cartesian(cands, jobs)
+    got = take_pairs(cands, jobs, ci, ji)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_skill_blocking_keeps_only_pairs_sharing_skills(dev_sample, write_config):
+    from src.data_layer import prepare_entities
+    from src.pairing import skill_blocking_index_pairs
+
+    df_cv, df_jobs = dev_sample(60, 10)
+    cands, jobs, _, _ = prepare_entities(df_cv, df_jobs)
+    for min_shared in [1, 2]:
+        ci, ji = skill_blocking_index_pairs(cands, jobs, min_shared)
+        # référence brute force sur le cartésien, même ordre
+        all_ci, all_ji = cartesian_index_pairs(len(cands), len(jobs))
+        shared = [
+            len(set(cands["candidate_skills"][c]) & set(jobs["required_skills"][j]))
+            for c, j in zip(all_ci, all_ji)
+        ]
+        keep = [s >= min_shared for s in shared]
+        assert ci.tolist() == all_ci[keep].tolist() and ji.tolist() == all_ji[keep].tolist()
+
+    full, _ = run(df_cv, df_jobs, write_config("full.yaml"), export=False)
+    for execution_mode in ["pairs", "factorized"]:
+        out, meta = run(df_cv, df_jobs, write_config(
+            f"{execution_mode}.yaml", pairing_mode="skill_blocking", execution_mode=execution_mode,
+        ), export=False)
+        assert (out["score_skills"] > 0).all()
+        expected = full[full["score_skills"] > 0].reset_index(drop=True)
+        pd.testing.assert_frame_equal(out, expected)
+        stats = meta["pairing"]
+        assert stats["mode"] == "skill_blocking" and stats["cartesian_pairs"] == len(full)
+        assert stats["pairs"] == len(out) and stats["pruned_pairs"] == len(full) - len(out)
+
+
+def test_pairing_strategy_registry(dev_sample, write_config):
+    import numpy as np
+    import pytest
+    from src.data_layer import prepare_entities
+    from src.pairing import (
+        PAIRING_STRATEGIES, estimate_pairs, get_pairing_strategy, index_pairs, register_pairing_strategy,
+    )
+
+    df_cv, df_jobs = dev_sample(60, 10)
+    cands, jobs, _, _ = prepare_entities(df_cv, df_jobs)
+
+    # same_sector / blocking : même paires et même ordre qu'un merge inner
+    keys = {"sector": "required_sector", "education_level": "required_education"}
+    for mode, left, right in [("same_sector", ["sector"], ["required_sector"]),
+                              ("blocking", list(keys), list(keys.values()))]:
+        m = cands.reset_index().merge(jobs.reset_index(), left_on=left, right_on=right)
+        ci, ji = index_pairs(cands, jobs, mode, block_size=7, blocking_keys=keys)
+        assert ci.tolist() == m["index_x"].tolist() and ji.tolist() == m["index_y"].tolist()
+        assert estimate_pairs(cands, jobs, mode, blocking_keys=keys) == len(m)
+    assert get_pairing_strategy("filtered_same_sector") is get_pairing_strategy("same_sector")
+    for mode in ["skill_blocking", "lsh"]:
+        assert estimate_pairs(cands, jobs, mode) >= len(index_pairs(cands, jobs, mode)[0])
+
+    # pairing_mode de la config : alias et stratégie utilisateur, dans les deux modes d'exécution
+    full, _ = run(df_cv, df_jobs, write_config("full.yaml"), export=False)
+    same = full[full["sector"].astype(str) == full["required_sector"].astype(str)].reset_index(drop=True)
+    register_pairing_strategy(
+        "first_three", lambda c, j, **_: (np.repeat(np.arange(3), len(j)), np.tile(np.arange(len(j)), 3)),
+    )
+    try:
+        for execution_mode in ["pairs", "factorized"]:
+            out, meta = run(df_cv, df_jobs, write_config(
+                "s.yaml", pairing_mode="filtered_same_sector", execution_mode=execution_mode,
+            ), export=False)
+            pd.testing.assert_frame_equal(out, same)
+            assert meta["pairing"]["pairs"] == len(same)
+
+            out, _ = run(df_cv, df_jobs, write_config(
+                "u.yaml", pairing_mode="first_three", execution_mode=execution_mode,
+            ), export=False)
+            pd.testing.assert_frame_equal(out, full.iloc[:3 * len(df_jobs)].reset_index(drop=True))
+    finally:
+        PAIRING_STRATEGIES.pop("first_three")
+
+    with pytest.raises(ValueError):
+        run(df_cv, df_jobs, write_config("bad.yaml", pairing_mode="same_sectr"), export=False)
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src.pipeline import run
+
+
+def test_parallel_workers_give_same_result_and_reuse_pool(dev_sample, write_config):
+    from src import parallel
+
+    df_cv, df_jobs = dev_sample(20, 4)
+    for execution_mode in ["pairs", "factorized"]:
+        serial, _ = run(df_cv, df_jobs, write_config("s.yaml", execution_mode=execution_mode), export=False)
+        par, _ = run(
+            df_cv, df_jobs,
+            write_config("p.yaml", execution_mode=execution_mode, workers=2),
+            export=False,
+        )
+        pd.testing.assert_frame_equal(par, serial)
+
+    pool = parallel.get_pool(2)
+    run(df_cv, df_jobs, write_config("p.yaml", workers=2), export=False)
+    assert parallel.get_pool(2) is pool
+    parallel.shutdown_pool()
+
+
+def _shared_task(shared, item):
+    import os
+    return os.getpid(), id(shared), shared["offset"] + item
+
+
+def test_map_ordered_loads_shared_state_once_per_worker():
+    import glob
+    import tempfile
+    from src import parallel
+
+    shared = {"offset": 100, "payload": list(range(10_000))}
+    out = list(parallel.map_ordered(_shared_task, range(40), workers=2, shared=shared))
+    assert [v for _, _, v in out] == list(range(100, 140))
+    # un seul objet état par worker pour toutes ses tâches
+    by_worker = {}
+    for pid, state_id, _ in out:
+        by_worker.setdefault(pid, set()).add(state_id)
+    assert all(len(ids) == 1 for ids in by_worker.values())
+    assert not glob.glob(f"{tempfile.gettempdir()}/matching_shared_*.pkl")
+    # en série : fn(shared, item) sans copie
+    assert {sid for _, sid, _ in parallel.map_ordered(_shared_task, range(3), shared=shared)} == {id(shared)}
+    parallel.shutdown_pool()
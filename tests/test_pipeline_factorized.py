@@ -0,0 +1,41 @@
+import pandas as pd
+
+from src.pipeline import run
+
+
+def test_factorized_mode_matches_pairs_mode(dev_sample, write_config):
+    df_cv, df_jobs = dev_sample()
+    for pairing_mode in ["cartesian", "same_sector"]:
+        out_pairs, _ = run(df_cv, df_jobs, write_config("a.yaml", pairing_mode=pairing_mode), export=False)
+        out_fact, meta = run(
+            df_cv, df_jobs,
+            write_config("b.yaml", pairing_mode=pairing_mode, execution_mode="factorized"),
+            export=False,
+        )
+        assert len(out_fact) == len(out_pairs)
+        pd.testing.assert_frame_equal(out_fact, out_pairs)
+        assert "quality_report" in meta
+
+
+def test_run_streaming_matches_run_and_exports(tmp_path, dev_sample, write_config):
+    from src.pipeline import run_streaming
+
+    df_cv, df_jobs = dev_sample()
+    full_dir, stream_dir = tmp_path / "full", tmp_path / "stream"
+    expected, meta_full = run(
+        df_cv, df_jobs,
+        write_config("full.yaml", export_dir=str(full_dir), export_format=["csv", "json"]),
+    )
+    meta = {}
+    chunks = list(run_streaming(
+        df_cv, df_jobs,
+        write_config("stream.yaml", export_dir=str(stream_dir), export_format=["csv", "json"]),
+        meta=meta,
+    ))
+    assert len(chunks) == -(-len(expected) // 7)
+    assert all(len(c) <= 7 for c in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    assert meta["quality_report"] == meta_full["quality_report"]
+    for fmt in ["csv", "json"]:
+        with open(meta["exports"][fmt], encoding="utf-8") as a, open(meta_full["exports"][fmt], encoding="utf-8") as b:
+            assert a.read() == b.read(), fmt
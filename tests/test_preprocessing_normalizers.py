@@ -44,3 +44,135 @@ def test_candidate_and_job_normalizers():
     assert "excel" in jskills
     assert "machine_learning" in jskills
     assert pj.loc[0, "required_sector"] == "it_data"
+
+
+def test_language_registry_bitmask_roundtrip():
+    from src.languages import LanguageRegistry
+
+    reg = LanguageRegistry()
+    mask = reg.encode(["en", "fr"])
+    assert mask == (1 << reg.bit("fr")) | (1 << reg.bit("en"))
+    assert reg.decode(mask) == ["en", "fr"]
+
+
+def test_language_masks_fall_back_to_multi_word():
+    import numpy as np
+    import pandas as pd
+    from src.languages import LanguageRegistry, encode_languages_column, masks_to_words
+
+    reg = LanguageRegistry(codes=[f"l{i:02d}" for i in range(70)])
+    col = encode_languages_column(pd.Series([["l00", "l69"], [], ["l65"]]), reg)
+    assert col.dtype == object
+    words = masks_to_words(col.to_numpy())
+    assert words.shape == (3, 2) and words.dtype == np.uint64
+    assert words[0].tolist() == [1, 1 << 5]
+    assert words[2].tolist() == [0, 1 << 1]
+
+
+def test_language_registry_is_per_run():
+    import numpy as np
+    import pandas as pd
+    from src.data_layer import prepare_entities
+    from src.languages import LANGUAGE_REGISTRY, LanguageRegistry
+
+    # registre vide passé explicitement : utilisé tel quel, pas remplacé par le registre global
+    reg, before = LanguageRegistry([]), len(LANGUAGE_REGISTRY)
+    pc = preprocess_candidates(pd.DataFrame({
+        "candidate_id": ["c1"], "candidate_skills": ["python"], "languages": ["qq"],
+        "education_level": ["bac+3"], "sector": ["IT"], "years_experience": [1],
+    }), reg)
+    assert reg.decode(int(pc.loc[0, "languages_mask"])) == ["qq"] and len(LANGUAGE_REGISTRY) == before
+
+    df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=20)
+    df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=5)
+    first, _, _, _ = prepare_entities(df_cv, df_jobs)
+    # run sans rapport avec 70 codes de langue : ne change ni les bits ni le dtype des runs suivants
+    other = df_cv.head(1).assign(languages=[[f"l{i:02d}" for i in range(70)]])
+    prepare_entities(other, df_jobs)
+    again, _, _, _ = prepare_entities(df_cv, df_jobs)
+    assert again["languages_mask"].dtype == np.uint64
+    pd.testing.assert_series_equal(again["languages_mask"], first["languages_mask"])
+    assert len(LANGUAGE_REGISTRY) == before
+
+
+def test_sector_registry_is_per_run():
+    import pandas as pd
+    from src.data_layer import prepare_entities
+    from src.sector import SECTOR_REGISTRY, SectorRegistry, encode_sector_column
+
+    reg, before = SectorRegistry([]), len(SECTOR_REGISTRY)
+    assert encode_sector_column(pd.Series(["zz_new"]), reg).tolist() == [1] and len(SECTOR_REGISTRY) == before
+
+    df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=20)
+    df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=5)
+    first, jobs, _, _ = prepare_entities(df_cv, df_jobs)
+    prepare_entities(df_cv.head(3).assign(sector=["s_a", "s_b", "s_c"]), df_jobs)
+    again, jobs_again, _, _ = prepare_entities(df_cv, df_jobs)
+    pd.testing.assert_series_equal(again["sector_code"], first["sector_code"])
+    pd.testing.assert_series_equal(jobs_again["required_sector_code"], jobs["required_sector_code"])
+    assert len(SECTOR_REGISTRY) == before
+
+
+def test_preprocessing_normalizes_unique_values_once():
+    from src.education import normalize_education
+    from src.languages import normalize_languages
+    from src.preprocessing import normalize_text, to_list
+    from src.sector import normalize_sector
+    from src.skills import normalize_skills
+
+    df_c = pd.DataFrame({
+        "candidate_id": ["c1", "c2", "c3", "c4"],
+        "candidate_skills": ["['Python','SQL']", ["python", "sql"], "['Python','SQL']", None],
+        "languages": ["FR, EN", ["en"], "FR, EN", None],
+        "education_level": ["Bac+5", "master", "Bac+5", None],
+        "sector": ["IT/Data", "Audit", "IT/Data", None],
+        "years_experience": [1, 2, 3, None],
+    })
+    pc = preprocess_candidates(df_c)
+
+    # mêmes valeurs que la normalisation ligne à ligne
+    assert pc["candidate_skills"].tolist() == [normalize_skills(to_list(x)) for x in df_c["candidate_skills"]]
+    assert pc["languages"].tolist() == [normalize_languages(to_list(x)) for x in df_c["languages"]]
+    assert pc["sector"].tolist() == [normalize_sector(x) for x in df_c["sector"]]
+    assert pc["education_level_num"].tolist() == [normalize_education(normalize_text(x)) for x in df_c["education_level"]]
+
+    # cellules identiques : un seul objet liste ; secteur / diplôme restent du texte
+    assert pc.loc[0, "candidate_skills"] is pc.loc[2, "candidate_skills"]
+    assert not isinstance(pc["sector"].dtype, pd.CategoricalDtype)
+    assert not isinstance(pc["education_level"].dtype, pd.CategoricalDtype)
+    assert not pc["sector"].isna().any()
+
+
+def test_run_output_sector_columns_are_comparable():
+    from src.pipeline import run
+    from src.sector import normalize_sector
+
+    df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=200)
+    df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=20)
+    out, _ = run(df_cv, df_jobs, export=False)
+
+    same = out["sector"] == out["required_sector"]
+    expected = [normalize_sector(c) == normalize_sector(j)
+                for c in df_cv["sector"] for j in df_jobs["required_sector"]]
+    assert same.tolist() == expected and same.any()
+
+
+def test_parse_list_literal_matches_literal_eval():
+    import ast
+    import pytest
+    from src.list_literal import parse_list_literal
+
+    cases = [
+        "['python', 'sql']", '["a", "b"]', "[]", "[ ]", "['a',]", "['say \"hi\"', \"it's\"]",
+        "['a\\'b']", "[0.5, 1, -2, 1e-3, .25, 3.]", "[0.1, 'x']", "('a', 'b')", "('a',)", "('a')", "()",
+        "[['a']]", "[True, None]",
+    ]
+    for s in cases:
+        parsed = parse_list_literal(s)
+        assert parsed == ast.literal_eval(s) and type(parsed) is type(ast.literal_eval(s)), s
+    assert [type(v) for v in parse_list_literal("[1, 1.0]")] == [int, float]
+
+    # entrée invalide : mêmes exceptions que literal_eval
+    for bad in ["['a' 'b'", "[nan, 1]", "['a', b]"]:
+        with pytest.raises((ValueError, SyntaxError)):
+            parse_list_literal(bad)
@@ -19,3 +19,54 @@ def test_subscores_basic():
     assert languages_score(["en", "fr"], ["en"]) == 1.0
     assert sector_score("it_data", "it_data") == 1.0
     assert sector_score(None, "it_data") == 0.0
+
+
+def test_vector_score_is_array_backed_and_exported_as_lists(tmp_path):
+    from src.aggregate import SUBSCORE_COLS, make_vector_score, vector_matrix
+    from src.export import export_csv
+
+    scores = np.array([[0.5, 1.0, 0.36, 0.0, 1.0], [0.25, 0.0, 1.0, 0.5, 0.0]])
+    df = pd.DataFrame(scores, columns=SUBSCORE_COLS).assign(job_id=["J1", "J2"])
+    out = make_vector_score(df)
+
+    # vues sur une seule matrice, que pyarrow soit installé ou non
+    vec = out["vector_score"]
+    assert vec.dtype == object and all(isinstance(v, np.ndarray) for v in vec)
+    assert vec.iloc[0].base is not None and vec.iloc[0].base is vec.iloc[1].base
+    np.testing.assert_array_equal(vector_matrix(out["vector_score"]), scores)
+    np.testing.assert_array_equal(out.scores.matrix, scores)
+    assert out.scores.vectors() == scores.tolist()
+
+    # CSV : même rendu qu'avant (listes Python)
+    path = export_csv(out, tmp_path / "out.csv")
+    assert pd.read_csv(path)["vector_score"].tolist() == [str(v) for v in scores.tolist()]
+
+
+def test_multi_profile_scores_match_single_profile():
+    from src.aggregate import SUBSCORE_COLS, WeightConfig, global_score_array, weighted_global_score
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((200, 5)), columns=SUBSCORE_COLS)
+    profiles = [
+        WeightConfig(name="default"),
+        WeightConfig(skills=3, experience=1, education=0, languages=0, sector=1, name="tech"),
+        WeightConfig(skills=0.1, experience=0.6, education=0.1, languages=0.1, sector=0.1, name="senior"),
+    ]
+    out = weighted_global_score(df, profiles)
+    assert list(out.columns) == SUBSCORE_COLS + ["global_score_default", "global_score_tech", "global_score_senior"]
+    for w in profiles:
+        np.testing.assert_allclose(out[f"global_score_{w.name}"], global_score_array(df, w), rtol=0, atol=1e-12)
+
+    by_name = weighted_global_score(df, {p.name: p for p in profiles})
+    pd.testing.assert_frame_equal(by_name, out)
+
+
+def test_pipeline_config_reads_weight_profiles(tmp_path):
+    import yaml
+    from src.pipeline import PipelineConfig
+
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"scoring": {"profiles": {"tech": {"skills": 0.7, "experience": 0.3}}}}))
+    cfg = PipelineConfig.from_yaml(path)
+    assert [p.name for p in cfg.profiles] == ["tech"]
+    assert cfg.profiles[0].skills == 0.7 and cfg.profiles[0].sector == 0.15
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from src.pipeline import run
+
+
+def test_top_k_buffer_breaks_ties_on_candidate_id():
+    from src.shortlist import TopKPerJob
+
+    rank = TopKPerJob.rank_ids(["c3", "c1", "c2", "c0"])
+    buf = TopKPerJob(2, rank)
+    # bloc 1 : offre 0 -> c3=0.5, c1=0.5 ; bloc 2 : c2=0.5, c0=0.2
+    buf.update([0, 1], [0, 0], [0.5, 0.5])
+    buf.update([2, 3], [0, 0], [0.5, 0.2])
+    cand_idx, job_idx = buf.result()
+    assert cand_idx.tolist() == [1, 2]
+    assert job_idx.tolist() == [0, 0]
+
+
+def test_top_k_per_job_matches_full_sort(dev_sample, write_config):
+    df_cv, df_jobs = dev_sample(40, 6)
+    k = 5
+    full, _ = run(df_cv, df_jobs, write_config("full.yaml"), export=False)
+    expected = (
+        full.sort_values(["job_id", "global_score", "candidate_id"], ascending=[True, False, True])
+        .groupby("job_id").head(k)
+        .reset_index(drop=True)
+    )
+    got, _ = run(df_cv, df_jobs, write_config("topk.yaml", top_k_per_job=k), export=False)
+    got = got.sort_values(["job_id", "global_score", "candidate_id"], ascending=[True, False, True]).reset_index(drop=True)
+    assert len(got) == k * len(df_jobs)
+    pd.testing.assert_frame_equal(got, expected)
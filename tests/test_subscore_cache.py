@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.scoring_engine.components.cache import SubscoreCache, row_hashes
+from src.scoring_engine.components.subscores import compute_subscores
+
+SUBSCORE_COLS = ["score_skills", "score_experience", "score_education", "score_languages", "score_sector"]
+
+
+def _pairs(n_cands=12, n_jobs=5):
+    from src.data_layer import prepare_data_layer
+
+    df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=n_cands)
+    df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=n_jobs)
+    pairs, _, _ = prepare_data_layer(df_cv, df_jobs)
+    return pairs
+
+
+def test_cached_subscores_equal_uncached_and_only_misses_are_computed(tmp_path):
+    pairs = _pairs()
+    expected = compute_subscores(pairs)
+    with SubscoreCache(tmp_path / "c.sqlite") as cache:
+        first = compute_subscores(pairs, cache=cache)
+        assert (cache.hits, cache.misses) == (0, len(pairs))
+        pd.testing.assert_frame_equal(first, expected)
+
+    # nouveau process / nouvelle connexion : tout vient du disque
+    with SubscoreCache(tmp_path / "c.sqlite") as cache:
+        more = pd.concat([pairs, _pairs(14, 5).iloc[len(pairs):]], ignore_index=True)
+        second = compute_subscores(more, cache=cache)
+        assert cache.hits == len(pairs) and cache.misses == len(more) - len(pairs)
+        pd.testing.assert_frame_equal(second, compute_subscores(more))
+
+
+def test_cache_lru_eviction_and_version_invalidation(tmp_path):
+    path = tmp_path / "c.sqlite"
+    keys = np.array([f"c{i}" for i in range(6)], dtype=object)
+    jobs = np.array(["j"] * 6, dtype=object)
+    values = np.tile(np.arange(5, dtype=np.float64), (6, 1))
+    with SubscoreCache(path, max_entries=4) as cache:
+        cache.ensure_version("ns", "v1")
+        cache.put_many("ns", keys[:4], jobs[:4], values[:4])
+        cache.get_many("ns", keys[:1], jobs[:1])            # c0 redevient le plus récent
+        cache.put_many("ns", keys[4:], jobs[4:], values[4:])  # évince c1, c2
+        found, _ = cache.get_many("ns", keys, jobs)
+        assert found.tolist() == [True, False, False, True, True, True]
+
+        cache.ensure_version("ns", "v2")  # code de scoring modifié
+        assert len(cache) == 0
+
+
+def test_cache_counts_rows_only_when_over_capacity(tmp_path):
+    keys = np.array([f"c{i}" for i in range(10)], dtype=object)
+    jobs = np.array(["j"] * 10, dtype=object)
+    values = np.zeros((10, 5))
+    with SubscoreCache(tmp_path / "c.sqlite", max_entries=8) as cache:
+        cache.ensure_version("ns", "v1")
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        for i in range(0, 8, 2):
+            cache.put_many("ns", keys[i:i + 2], jobs[i:i + 2], values[i:i + 2])
+        assert sum("COUNT(*)" in q for q in statements) == 1  # comptage initial seulement
+        cache.put_many("ns", keys[8:], jobs[8:], values[8:])
+        cache._conn.set_trace_callback(None)
+        assert len(cache) == 8
+
+
+def test_code_version_covers_normalization_modules():
+    from pathlib import Path
+    from src.scoring_engine.components.cache import _SCORING_FILES
+
+    names = {Path(p).name for p in _SCORING_FILES}
+    assert {"languages.py", "sector.py", "features.py", "list_literal.py", "education.py"} <= names
+    assert all(Path(p).exists() for p in _SCORING_FILES)
+
+
+def test_row_hashes_depend_on_content_only():
+    a = pd.DataFrame({"s": [["x", "y"], ["x", "y"], ["z"]], "e": [1.0, 1.0, 1.0]})
+    h = row_hashes(a, ["s", "e"])
+    assert h[0] == h[1] != h[2]
+
+
+def test_pipeline_uses_subscore_cache(tmp_path):
+    from src.pipeline import run
+
+    cfg = {
+        "pipeline": {"batch_size": 20, "export_format": [], "keep_columns": ["candidate_id", "job_id"]},
+        "scoring": {"subscore_cache": str(tmp_path / "cache.sqlite")},
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+    df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=10)
+    df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=4)
+
+    out1, meta1 = run(df_cv, df_jobs, path, export=False)
+    out2, meta2 = run(df_cv, df_jobs, path, export=False)
+    assert meta1["subscore_cache"] == {"hits": 0, "misses": 40}
+    assert meta2["subscore_cache"] == {"hits": 40, "misses": 0}
+    pd.testing.assert_frame_equal(out1, out2)
+
+    # workers > 1 : cache ouvert dans chaque worker, stats cumulées dans meta
+    cfg["pipeline"]["workers"] = 2
+    path.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+    out3, meta3 = run(pd.read_csv("data/dev/candidates_dev.csv", nrows=12), df_jobs, path, export=False)
+    assert meta3["subscore_cache"] == {"hits": 40, "misses": 8}
+    pd.testing.assert_frame_equal(out3.head(40), out1)
+    from src import parallel
+    parallel.shutdown_pool()
+
+
+def test_subscore_cache_rejected_where_it_would_be_ignored(tmp_path):
+    import pytest
+    from src.pipeline import run, run_streaming
+
+    df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=5)
+    df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=2)
+    for pipeline in [{"execution_mode": "factorized"}, {"top_k_per_job": 2}]:
+        cfg = {"pipeline": {"export_format": [], **pipeline}, "scoring": {"subscore_cache": str(tmp_path / "c.sqlite")}}
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+        with pytest.raises(ValueError, match="subscore_cache"):
+            run(df_cv, df_jobs, path, export=False)
+        with pytest.raises(ValueError, match="subscore_cache"):
+            list(run_streaming(df_cv, df_jobs, path, export=False))
@@ -0,0 +1,219 @@
+"""
+Le moteur colonnaire de compute_subscores doit reproduire exactement les
+fonctions scalaires (skills_jaccard, experience_score, ...), qui restent la
+référence.
+"""
+import numpy as np
+import pandas as pd
+
+from src.scoring_engine.components.subscores import (
+    _edu_to_num,
+    _parse_list_cell,
+    compute_subscores,
+    education_score,
+    experience_score,
+    languages_score,
+    sector_score,
+    skills_jaccard,
+)
+
+SUBSCORE_COLS = ["score_skills", "score_experience", "score_education", "score_languages", "score_sector"]
+
+
+def _reference_subscores(df: pd.DataFrame) -> pd.DataFrame:
+    """Ancienne implémentation ligne à ligne (df.apply)."""
+    out = pd.DataFrame(index=df.index)
+    out["score_skills"] = df.apply(
+        lambda r: skills_jaccard(_parse_list_cell(r["candidate_skills"]), _parse_list_cell(r["required_skills"])), axis=1
+    )
+    out["score_experience"] = df.apply(lambda r: experience_score(r["years_experience"], r["min_experience"]), axis=1)
+    out["score_education"] = df.apply(
+        lambda r: education_score(_edu_to_num(r["education_level"]), _edu_to_num(r["required_education"])), axis=1
+    )
+    out["score_languages"] = df.apply(
+        lambda r: languages_score(_parse_list_cell(r["languages"]), _parse_list_cell(r["required_languages"])), axis=1
+    )
+    out["score_sector"] = df.apply(lambda r: sector_score(r["sector"], r["required_sector"]), axis=1)
+    for c in SUBSCORE_COLS:
+        out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0.0).clip(0.0, 1.0)
+    return out
+
+
+def _random_pairs(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    skills = ["python", "sql", "excel", "audit", "ml", "r", "docker", "aws"]
+    langs = ["fr", "en", "es", "de"]
+    edus = ["bac+2", "bac+3", "Bac+5", "bac+4", "", None, 4, "doctorat"]
+    sectors = ["audit", "it_data", "finance", "", None, "consulting"]
+
+    def pick_list(pool, k_max):
+        k = int(rng.integers(0, k_max + 1))
+        return list(rng.choice(pool, size=k, replace=True))
+
+    rows = []
+    for _ in range(n):
+        rows.append({
+            "candidate_skills": pick_list(skills, 5) if rng.random() > 0.2 else str(pick_list(skills, 4)),
+            "required_skills": pick_list(skills, 4),
+            "years_experience": float(rng.integers(0, 15)) if rng.random() > 0.1 else None,
+            "min_experience": float(rng.integers(0, 8)),
+            "education_level": edus[int(rng.integers(0, len(edus)))],
+            "required_education": edus[int(rng.integers(0, len(edus)))],
+            "languages": pick_list(langs, 3),
+            "required_languages": pick_list(langs, 2),
+            "sector": sectors[int(rng.integers(0, len(sectors)))],
+            "required_sector": sectors[int(rng.integers(0, len(sectors)))],
+        })
+    return pd.DataFrame(rows)
+
+
+def test_columnar_matches_scalar_reference():
+    df = _random_pairs(500)
+    got = compute_subscores(df)
+    expected = _reference_subscores(df)
+    for c in SUBSCORE_COLS:
+        np.testing.assert_array_equal(got[c].to_numpy(), expected[c].to_numpy(), err_msg=c)
+
+
+def test_columnar_matches_scalar_on_odd_values():
+    df = pd.DataFrame({
+        "candidate_skills": ["['a', 'b']", None, float("nan"), ["a", "", "a"], "a"],
+        "required_skills": [["b", "c"], ["a"], ["a"], ["a"], "['a']"],
+        "years_experience": [np.nan, 3.0, 2.5, 10.0, 0.0],
+        "min_experience": [2.0, np.nan, 0.0, 5.0, -1.0],
+        "education_level": ["bac+5", "bac+x", 3.0, None, "2"],
+        "required_education": ["bac+3", "bac+5", 0, "bac+5", None],
+        "languages": [[], ["en"], None, ["fr", "en"], "fr"],
+        "required_languages": [[], [], ["fr"], ["fr"], "['fr', 'en']"],
+        "sector": ["audit", float("nan"), "", None, "it"],
+        "required_sector": ["audit", "audit", "audit", "it", float("nan")],
+    })
+    got = compute_subscores(df)
+    expected = _reference_subscores(df)
+    for c in SUBSCORE_COLS:
+        np.testing.assert_array_equal(got[c].to_numpy(), expected[c].to_numpy(), err_msg=c)
+
+
+def test_columnar_handles_cartesian_shared_lists():
+    cands = pd.DataFrame({
+        "candidate_id": ["1", "2"],
+        "candidate_skills": [["python", "sql"], ["excel"]],
+        "years_experience": [3.0, 1.0],
+        "education_level": ["bac+5", "bac+3"],
+        "languages": [["fr"], ["en", "fr"]],
+        "sector": ["it_data", "audit"],
+    })
+    jobs = pd.DataFrame({
+        "job_id": ["A", "B", "C"],
+        "required_skills": [["python"], ["excel", "sql"], []],
+        "min_experience": [2.0, 0.0, 5.0],
+        "required_education": ["bac+5", "bac+4", ""],
+        "required_languages": [["fr"], ["en"], []],
+        "required_sector": ["it_data", "finance", ""],
+    })
+    pairs = cands.assign(_key=1).merge(jobs.assign(_key=1), on="_key").drop(columns=["_key"])
+    got = compute_subscores(pairs)
+    expected = _reference_subscores(pairs)
+    for c in SUBSCORE_COLS:
+        np.testing.assert_array_equal(got[c].to_numpy(), expected[c].to_numpy(), err_msg=c)
+
+
+def test_skills_kernels_agree():
+    df = _random_pairs(300, seed=3)
+    expected = _reference_subscores(df)["score_skills"].to_numpy()
+    for kernel in ["bitmap", "sparse", "auto"]:
+        got = compute_subscores(df, skills_kernel=kernel)["score_skills"].to_numpy()
+        np.testing.assert_array_equal(got, expected, err_msg=kernel)
+
+
+def test_sparse_intersections_by_blocks():
+    from src.scoring_engine.components.columnar import incidence_csr, sparse_intersections
+
+    ids_a = [np.array([0, 1, 2]), np.array([], dtype=np.int64), np.array([2, 3])]
+    ids_b = [np.array([1, 2]), np.array([3])]
+    mat_a, mat_b = incidence_csr(ids_a, 4), incidence_csr(ids_b, 4)
+    codes_a = np.array([2, 0, 1, 0, 2])
+    codes_b = np.array([0, 0, 1, 1, 1])
+    inter = sparse_intersections(mat_a, codes_a, mat_b, codes_b, block_cells=2)
+    assert inter.tolist() == [1, 2, 0, 0, 1]
+
+
+def test_auto_kernel_switches_on_vocabulary_size():
+    from src.scoring_engine.components.columnar import BITMAP_MAX_VOCAB, resolve_set_kernel
+
+    assert resolve_set_kernel("auto", 50) == "bitmap"
+    assert resolve_set_kernel("auto", BITMAP_MAX_VOCAB + 1) == "sparse"
+    assert resolve_set_kernel("bitmap", 10_000) == "bitmap"
+
+
+def test_entity_features_fast_path_matches_pairs_scoring():
+    from src.data_layer import prepare_entities
+    from src.pairing import build_pairs_cartesian, cartesian_index_pairs
+    from src.scoring_engine.components.features import build_features, score_features
+
+    df_cv = pd.read_csv("data/dev/candidates_dev.csv", nrows=30)
+    df_jobs = pd.read_csv("data/dev/jobs_dev.csv", nrows=8)
+    cands, jobs, _, _ = prepare_entities(df_cv, df_jobs)
+    expected = compute_subscores(build_pairs_cartesian(cands, jobs))
+    ci, ji = cartesian_index_pairs(len(cands), len(jobs))
+
+    for normalized in [True, False, None]:
+        cand_f, job_f = build_features(cands, jobs, normalized=normalized)
+        for kernel in ["bitmap", "sparse"]:
+            got = score_features(cand_f, job_f, ci, ji, skills_kernel=kernel)
+            for c in SUBSCORE_COLS:
+                np.testing.assert_array_equal(got[c], expected[c].to_numpy(), err_msg=f"{c} {normalized} {kernel}")
+
+
+def test_entity_features_detects_raw_lists():
+    from src.scoring_engine.components.features import build_features
+
+    cands = pd.DataFrame({"candidate_skills": [[" python", "sql"]], "languages": [["fr"]]})
+    jobs = pd.DataFrame({"required_skills": [["python"]], "required_languages": [["fr"]]})
+    cand_f, _ = build_features(cands, jobs)
+    assert sorted(cand_f.vocab.skills) == ["python", "sql"]
+
+
+def test_language_scores_from_bitmasks_match_lists():
+    from src.languages import LanguageRegistry
+    from src.preprocessing import preprocess_candidates, preprocess_jobs
+
+    df = _random_pairs(200, seed=5)
+    cands = df[["candidate_skills", "years_experience", "education_level", "languages", "sector"]].assign(candidate_id=range(len(df)))
+    jobs = df[["required_skills", "min_experience", "required_education", "required_languages", "required_sector"]].assign(job_id=range(len(df)))
+    # registre > 64 codes : masques multi-mots
+    reg = LanguageRegistry(codes=[f"x{i:02d}" for i in range(64)])
+    cands = preprocess_candidates(cands, language_registry=reg)
+    jobs = preprocess_jobs(jobs, language_registry=reg)
+    pairs = pd.concat([cands, jobs], axis=1)
+    got = compute_subscores(pairs)["score_languages"].to_numpy()
+    expected = compute_subscores(pairs.drop(columns=["languages_mask", "required_languages_mask"]))["score_languages"].to_numpy()
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_sector_and_education_codes_match_strings():
+    from src.pairing import cartesian_index_pairs
+    from src.preprocessing import preprocess_candidates, preprocess_jobs
+    from src.scoring_engine.components.features import build_features, score_features
+    from src.sector import SectorRegistry
+
+    df = _random_pairs(200, seed=7)
+    cands = df[["candidate_skills", "years_experience", "education_level", "languages", "sector"]].assign(candidate_id=range(len(df)))
+    jobs = df[["required_skills", "min_experience", "required_education", "required_languages", "required_sector"]].assign(job_id=range(len(df)))
+    reg = SectorRegistry(sectors=[])
+    cands = preprocess_candidates(cands, sector_registry=reg)
+    jobs = preprocess_jobs(jobs, sector_registry=reg)
+    assert cands["sector_code"].dtype == np.int16 and jobs["required_education_code"].dtype == np.int16
+    # dictionnaire partagé : même secteur -> même code des deux côtés
+    assert reg.decode(int(cands["sector_code"].iloc[0])) == cands["sector"].iloc[0]
+
+    codes = ["sector_code", "required_sector_code", "education_level_code", "required_education_code"]
+    pairs = pd.concat([cands, jobs], axis=1)
+    got = compute_subscores(pairs)
+    expected = compute_subscores(pairs.drop(columns=codes))
+    ci, ji = cartesian_index_pairs(len(cands), len(jobs))
+    with_codes = score_features(*build_features(cands, jobs), ci, ji)
+    without = score_features(*build_features(cands.drop(columns=codes[::2]), jobs.drop(columns=codes[1::2])), ci, ji)
+    for c in ["score_education", "score_sector"]:
+        np.testing.assert_array_equal(got[c].to_numpy(), expected[c].to_numpy(), err_msg=c)
+        np.testing.assert_array_equal(with_codes[c], without[c], err_msg=c)